@@ -7,11 +7,11 @@ from pathlib import Path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
 
-from src.data_loader import ForkliftData
-from src.matcher import ForkliftMatcher
-from src.conversation import ConversationManager
-from src.quote import QuoteGenerator
+from src.inquiries import InquiryBook
+from src.revisions import QuoteReviser
+from src.startup import shared_state
 from src.ui_components import UIComponents
+from src.metrics import metrics, start_metrics_server
 
 def main():
     """Main application entry point"""
@@ -28,71 +28,89 @@ def main():
     # Display header
     UIComponents.display_header()
     
-    # Initialize session state
-    if 'conversation_manager' not in st.session_state:
-        st.session_state.conversation_manager = ConversationManager()
-    
+    # The catalog, indexes and pipeline objects are built once per process
+    # (before the server starts when launched through src.startup serve)
+    shared = shared_state()
     if 'forklift_data' not in st.session_state:
-        st.session_state.forklift_data = ForkliftData()
+        st.session_state.forklift_data = shared['forklift_data']
     
     if 'matcher' not in st.session_state:
-        st.session_state.matcher = ForkliftMatcher(st.session_state.forklift_data)
+        st.session_state.matcher = shared['matcher']
     
     if 'quote_generator' not in st.session_state:
-        st.session_state.quote_generator = QuoteGenerator(st.session_state.forklift_data)
+        st.session_state.quote_generator = shared['quote_generator']
     
-    if 'quote_displayed' not in st.session_state:
-        st.session_state.quote_displayed = False
+    if 'quote_reviser' not in st.session_state:
+        st.session_state.quote_reviser = QuoteReviser(
+            st.session_state.forklift_data, st.session_state.matcher, st.session_state.quote_generator
+        )
     
-    # Handle restart button
-    if UIComponents.display_restart_button():
-        # Reset the conversation
-        st.session_state.conversation_manager.reset()
-        st.session_state.quote_displayed = False
-        
-        # Clear messages to force reinitialization
-        if 'messages' in st.session_state:
-            del st.session_state.messages
-            
-        # Clear quote data
-        if 'current_quote' in st.session_state:
-            del st.session_state.current_quote
-        if 'current_formatted_quote' in st.session_state:
-            del st.session_state.current_formatted_quote
-            
-        # Rerun the app to refresh the UI
+    # Spreadsheets of equipment needs are quoted in the background
+    with st.sidebar:
+        UIComponents.display_bulk_upload(st.session_state.matcher, st.session_state.quote_generator,
+                                         shared.get('render_pool'))
+    
+    # Every inquiry of the session shares the reviser and its rendered fragments
+    if 'inquiries' not in st.session_state:
+        st.session_state.inquiries = InquiryBook(st.session_state.quote_reviser)
+    inquiries = st.session_state.inquiries
+    
+    # Starting another inquiry keeps the open ones; switching only changes what is shown
+    selected = UIComponents.display_inquiry_switcher(inquiries)
+    if selected is None:
+        inquiries.new()
         st.rerun()
+    inquiry = inquiries.switch(selected) or inquiries.active
+    conversation_manager = inquiry['conversation']
     
     # Display the conversation interface
-    UIComponents.display_conversation(st.session_state.conversation_manager)
+    UIComponents.display_conversation(conversation_manager, inquiry['messages'])
     
     # If conversation is complete, handle quote generation and display
-    if st.session_state.conversation_manager.is_complete():
-        # Generate the quote only once if not already generated
-        if not st.session_state.quote_displayed:
+    if conversation_manager.is_complete():
+        # Generate the quote only once per inquiry
+        if inquiry['quote_info'] is None:
             with st.spinner("Generating your forklift rental quote..."):
                 # Get the gathered requirements
-                requirements = st.session_state.conversation_manager.get_requirements()
-                
-                # Match requirements to a forklift
-                forklift_match = st.session_state.matcher.match_forklift(requirements)
-                
-                # Generate a quote
-                quote_result = st.session_state.quote_generator.generate_quote(forklift_match)
+                requirements = conversation_manager.get_requirements()
                 
-                # Format the quote for display
-                formatted_quote = st.session_state.quote_generator.format_quote_for_display(quote_result)
-                
-                # Store the quote result in session state
-                st.session_state.current_formatted_quote = formatted_quote
-                
-                # Set the quote as displayed
-                st.session_state.quote_displayed = True
+                # Match, quote, format and render as revision 0, so later edits only
+                # recompute what depends on the changed answer
+                revision = st.session_state.quote_reviser.open(requirements)
+                inquiries.record(inquiry, revision)
         
         # Display the quote - always do this if conversation is complete,
-        # even after button clicks or page refreshes
-        if 'current_formatted_quote' in st.session_state:
-            UIComponents.display_quote(st.session_state.current_formatted_quote)
+        # even after button clicks, page refreshes or switching inquiries
+        UIComponents.display_quote(inquiry['quote_info'], lambda: inquiries.get_html(inquiry))
+        
+        # Correcting an answer revises the quote in place instead of restarting
+        edit = UIComponents.display_answer_editor(conversation_manager)
+        if edit:
+            apply_answer_edit(inquiry, *edit)
+            st.rerun()
+
+def apply_answer_edit(inquiry, question_id, answer):
+    """Change one answer of an inquiry and revise its quote to match"""
+    conversation_manager = inquiry['conversation']
+    inquiry['messages'].append({"role": "user", "content": answer})
+    is_valid, feedback = conversation_manager.edit_answer(question_id, answer)
+    inquiry['messages'].append({"role": "assistant", "content": feedback})
+    if not is_valid:
+        return
+    
+    requirements = conversation_manager.get_requirements()
+    reviser = st.session_state.quote_reviser
+    if inquiry['quote_id'] is None:
+        # The earlier answers matched nothing, so there is no quote to revise
+        revision = reviser.open(requirements)
+    else:
+        revision = reviser.update(inquiry['quote_id'], requirements)
+    st.session_state.inquiries.record(inquiry, revision)
 
 if __name__ == "__main__":
-    main()
+    # Expose stage timings locally when a metrics port is configured
+    if metrics.enabled and os.environ.get('FORKLIFT_METRICS_PORT'):
+        start_metrics_server(int(os.environ['FORKLIFT_METRICS_PORT']))
+    
+    with metrics.span('streamlit_rerun'):
+        main()
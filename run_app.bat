@@ -28,6 +28,6 @@ mkdir src\fonts 2>nul
 copy fonts\DejaVuSansCondensed*.ttf src\fonts\
 
 echo Starting Streamlit application...
-streamlit run app.py
+python -m src.startup serve app.py
 
 echo Note: The virtual environment will be deactivated when the terminal is closed
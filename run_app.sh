@@ -39,6 +39,6 @@ cp fonts/DejaVuSansCondensed*.ttf src/fonts/
 
 # Run the application
 echo "Starting Streamlit application..."
-streamlit run app.py
+python -m src.startup serve app.py
 
 # Note: The virtual environment will be deactivated when the terminal is closed
@@ -0,0 +1,21 @@
+#!/bin/bash
+
+# Run the quote hot-path benchmarks and compare them with the saved baseline.
+#
+#   ./run_benchmarks.sh            # compare against the latest saved run, fail on regression
+#   ./run_benchmarks.sh --save     # record a new baseline
+#
+# BENCH_THRESHOLD sets the allowed slowdown of the mean (default 20%).
+# BENCH_INQUIRIES sets the size of the synthetic end-to-end load (default 200).
+
+THRESHOLD="${BENCH_THRESHOLD:-20%}"
+STORAGE=".benchmarks"
+
+if [[ "$1" == "--save" ]] || [ -z "$(find "$STORAGE" -name '*.json' 2>/dev/null)" ]; then
+    echo "Saving benchmark baseline..."
+    python -m pytest tests/benchmarks --benchmark-only --benchmark-storage="$STORAGE" --benchmark-autosave
+else
+    echo "Comparing against saved baseline (threshold: mean +$THRESHOLD)..."
+    python -m pytest tests/benchmarks --benchmark-only --benchmark-storage="$STORAGE" \
+        --benchmark-compare --benchmark-compare-fail="mean:$THRESHOLD"
+fi
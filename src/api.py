@@ -0,0 +1,349 @@
+import argparse
+import json
+import socket
+import struct
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from src.archive import ARCHIVE_FORMATS, stream_archive
+from src.bulk import quote_requirements
+from src.conversation import ConversationManager
+from src.data_loader import ForkliftData
+from src.html_pdf_generator import PDFGenerator as HTMLGenerator
+from src.match_cache import MatchCache
+from src.matcher import ForkliftMatcher, requirements_error
+from src.metrics import metrics
+from src.quote import QuoteGenerator
+from src.startup import readiness_report
+
+class QuoteAPI:
+    """
+    Transport-independent handlers for the JSON quote API.
+
+    Conversations are held in memory and share one catalog, matcher and
+    quote generator. The oldest conversations are dropped once
+    max_conversations is reached.
+    """
+
+    # Most quotes one archive request may ask for
+    MAX_ARCHIVE_QUOTES = 5000
+
+    def __init__(self, forklift_data=None, max_conversations: int = 10000, match_cache=None,
+                 render_pool=None):
+        """
+        Initialize the API
+
+        Args:
+            forklift_data: Instance of ForkliftData (loaded from data/ if omitted)
+            max_conversations: Maximum number of conversations kept in memory
+            match_cache: Optional MatchCache for hot requirement tuples
+            render_pool: Optional RenderPool that archive documents are rendered on
+        """
+        self.data = forklift_data if forklift_data is not None else ForkliftData()
+        self.matcher = ForkliftMatcher(self.data, cache=match_cache)
+        self.quote_generator = QuoteGenerator(self.data)
+        self.render_pool = render_pool
+        self.max_conversations = max_conversations
+        self._conversations = OrderedDict()
+        self._lock = threading.Lock()
+
+    def handle(self, method: str, path: str, body: Optional[Dict]) -> Tuple[int, Dict]:
+        """
+        Dispatch a request
+
+        Args:
+            method: HTTP method
+            path: Request path without the query string
+            body: Decoded JSON body, or the query parameters of a GET request
+
+        Returns:
+            Tuple of HTTP status code and JSON-serializable response; a
+            successful archive request returns an iterator of ZIP chunks instead.
+            Malformed input gets a 400 and any other failure a 500.
+        """
+        if body is not None and not isinstance(body, dict):
+            return 400, {'success': False, 'message': 'The request body must be a JSON object.'}
+        try:
+            return self._route(method, path, body or {})
+        except Exception as e:
+            traceback.print_exc()
+            return 500, {'success': False, 'message': f"Could not handle the request ({type(e).__name__})."}
+
+    def _route(self, method: str, path: str, body: Dict) -> Tuple[int, Dict]:
+        """Dispatch a request with a JSON object body (see handle)"""
+        parts = [p for p in path.split('/') if p]
+
+        if method == 'GET' and parts == ['health']:
+            return 200, {'status': 'ok'}
+        if method == 'GET' and parts == ['ready']:
+            report = readiness_report({'forklift_data': self.data, 'match_cache': self.matcher.cache})
+            return (200 if report['ready'] else 503), report
+        if method == 'GET' and parts == ['cache', 'snapshot']:
+            return 200, {'entries': self.matcher.cache.snapshot() if self.matcher.cache is not None else []}
+        if method == 'POST' and parts == ['quote']:
+            requirements = body.get('requirements', {})
+            error = requirements_error(requirements)
+            if error:
+                return 400, {'success': False, 'message': f"requirements: {error}"}
+            return 200, self.quote(requirements, render=body.get('render', False))
+        if method == 'POST' and parts == ['quotes', 'archive']:
+            return self.archive(body.get('requirements'), body.get('format', 'html'))
+        if method in ('GET', 'POST') and parts == ['search']:
+            return self.search(body.get('q', body.get('query', '')), body.get('k', 5), body.get('kind', 'model'))
+        if method == 'POST' and parts == ['conversations']:
+            return 201, self.start_conversation()
+        if method == 'POST' and len(parts) == 3 and parts[0] == 'conversations' and parts[2] == 'answers':
+            if 'answer' not in body:
+                return 400, {'success': False, 'message': "Missing 'answer'."}
+            return self.answer(parts[1], str(body['answer']), render=body.get('render', False))
+
+        return 404, {'success': False, 'message': f"No route for {method} {path}"}
+
+    def quote(self, requirements: Dict, render: bool = False) -> Dict:
+        """
+        Run match -> quote -> format (-> HTML) for a set of requirements
+
+        Args:
+            requirements: Requirements as produced by ConversationManager
+            render: Whether to include the rendered HTML document
+
+        Returns:
+            Formatted quote, with an 'html' key when render is set
+        """
+        forklift_match = self.matcher.match_forklift(requirements)
+        quote_result = self.quote_generator.generate_quote(forklift_match)
+        formatted_quote = self.quote_generator.format_quote_for_display(quote_result)
+
+        if render and formatted_quote.get('success', False):
+            formatted_quote = dict(formatted_quote, html=HTMLGenerator(formatted_quote).get_html_string())
+        return formatted_quote
+
+    def archive(self, requirements_list, fmt: str = 'html') -> Tuple[int, object]:
+        """
+        Quote many inquiries into a ZIP of documents, streamed as it is built
+
+        Args:
+            requirements_list: List of requirement dictionaries
+            fmt: 'html' or 'pdf'
+
+        Returns:
+            Tuple of HTTP status code and an iterator of ZIP chunks, or an
+            error response for an invalid request. Every entry is checked
+            here because the status is sent before the first document renders.
+        """
+        if not isinstance(requirements_list, list) or not requirements_list:
+            return 400, {'success': False, 'message': "'requirements' must be a non-empty list."}
+        if len(requirements_list) > self.MAX_ARCHIVE_QUOTES:
+            return 400, {'success': False,
+                         'message': f"At most {self.MAX_ARCHIVE_QUOTES} quotes per archive."}
+        if fmt not in ARCHIVE_FORMATS:
+            return 400, {'success': False, 'message': f"'format' must be one of: {', '.join(ARCHIVE_FORMATS)}."}
+        for index, requirements in enumerate(requirements_list):
+            error = requirements_error(requirements)
+            if error:
+                return 400, {'success': False, 'message': f"requirements[{index}]: {error}"}
+
+        quotes = quote_requirements(requirements_list, self.matcher, self.quote_generator)
+        return 200, stream_archive(quotes, fmt, self.render_pool)
+
+    def search(self, query: str, k=5, kind: str = 'model') -> Tuple[int, Dict]:
+        """
+        Full-text search over the catalog
+        
+        Args:
+            query: Free-text query
+            k: Maximum number of hits
+            kind: 'model' for forklifts, 'equipment' for rate schedule rows, or 'all'
+        
+        Returns:
+            Tuple of HTTP status code and {'query', 'results'}
+        """
+        try:
+            k = int(k)
+        except (TypeError, ValueError):
+            return 400, {'success': False, 'message': "'k' must be an integer."}
+        if not str(query).strip():
+            return 400, {'success': False, 'message': "Missing 'q'."}
+        
+        if kind == 'model':
+            results = self.matcher.search_forklifts(query, k)
+        else:
+            results = self.data.search_index.search(query, k, kind=None if kind == 'all' else kind)
+        return 200, {'query': query, 'results': results}
+    
+    def start_conversation(self) -> Dict:
+        """
+        Start a new conversation
+
+        Returns:
+            Conversation ID and the first question
+        """
+        conversation_id = uuid.uuid4().hex
+        conversation = ConversationManager()
+
+        with self._lock:
+            self._conversations[conversation_id] = conversation
+            while len(self._conversations) > self.max_conversations:
+                self._conversations.popitem(last=False)
+
+        return {'id': conversation_id, 'question': self._question_text(conversation.get_current_question())}
+
+    def answer(self, conversation_id: str, answer: str, render: bool = False) -> Tuple[int, Dict]:
+        """
+        Answer the current question of a conversation
+
+        Args:
+            conversation_id: ID returned by start_conversation
+            answer: The user's answer
+            render: Whether to render the HTML document once complete
+
+        Returns:
+            Tuple of HTTP status code and response; the formatted quote is
+            included once the last question has been answered
+        """
+        with self._lock:
+            conversation = self._conversations.get(conversation_id)
+        if conversation is None:
+            return 404, {'success': False, 'message': 'Unknown conversation.'}
+
+        is_valid, feedback = conversation.process_answer(answer)
+        response = {'valid': is_valid, 'feedback': feedback, 'complete': conversation.is_complete()}
+
+        if conversation.is_complete():
+            response['quote'] = self.quote(conversation.get_requirements(), render=render)
+            with self._lock:
+                self._conversations.pop(conversation_id, None)
+
+        return 200, response
+
+    @staticmethod
+    def _question_text(question: Dict) -> str:
+        text = question.get('question', question.get('message', ''))
+        if 'options' in question:
+            text += f" ({', '.join(question['options'])})"
+        return text
+
+
+class _APIHandler(BaseHTTPRequestHandler):
+    """Maps HTTP requests onto QuoteAPI.handle"""
+
+    api = None
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send(200, metrics.render_prometheus().encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8')
+            return
+        self._dispatch('GET', dict(parse_qsl(urlsplit(self.path).query)))
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'success': False, 'message': 'Invalid JSON body.'})
+            return
+        self._dispatch('POST', body)
+
+    def _dispatch(self, method, body):
+        status, response = self.api.handle(method, self.path.split('?', 1)[0], body)
+        if isinstance(response, dict):
+            self._send_json(status, response)
+        else:
+            self._send_stream(status, response, 'application/zip')
+
+    def _send_stream(self, status, chunks, content_type):
+        # The first chunk is built before the status goes out, so an early failure is still a 500
+        chunks = iter(chunks)
+        try:
+            first = next(chunks, b'')
+        except Exception as e:
+            self._send_json(500, {'success': False, 'message': f"Could not build the archive: {e}"})
+            return
+
+        # HTTP/1.0 without Content-Length: the body ends when the connection closes
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Disposition', 'attachment; filename="quotes.zip"')
+        self.end_headers()
+        self.wfile.write(first)
+        try:
+            for chunk in chunks:
+                self.wfile.write(chunk)
+        except Exception:
+            self._abort()
+
+    def _abort(self):
+        # Reset instead of closing cleanly (the server's shutdown would send a FIN),
+        # so the client sees a failed download rather than a short archive
+        self.close_connection = True
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        self.connection.close()
+
+    def _send_json(self, status, response):
+        self._send(status, json.dumps(response).encode('utf-8'), 'application/json')
+
+    def _send(self, status, payload, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(api: QuoteAPI, host: str = '127.0.0.1', port: int = 8502) -> ThreadingHTTPServer:
+    """
+    Create an HTTP server for the API (call serve_forever to run it)
+
+    Args:
+        api: QuoteAPI instance to serve
+        host: Interface to bind to
+        port: Port to listen on (0 picks a free port)
+
+    Returns:
+        The HTTP server
+    """
+    handler = type('QuoteAPIHandler', (_APIHandler,), {'api': api})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the forklift quote JSON API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--cache-snapshot', default=None,
+                        help="Saved /cache/snapshot of hot requirement tuples to match before serving")
+    parser.add_argument('--render-workers', type=int, default=0,
+                        help="Render archive documents on a pool with this many bulk worker processes")
+    args = parser.parse_args()
+
+    render_pool = None
+    if args.render_workers > 0:
+        from src.render_pool import RenderPool
+        render_pool = RenderPool(workers=1, bulk_workers=args.render_workers)
+        render_pool.warm_up()
+    api = QuoteAPI(ForkliftData(args.data_dir), match_cache=MatchCache(), render_pool=render_pool)
+    api.data.get_candidate_table()
+    if args.cache_snapshot:
+        print(f"Prepopulated {api.matcher.cache.prepopulate(api.matcher, args.cache_snapshot)} cached matches")
+    server = create_server(api, args.host, args.port)
+    print(f"Serving quote API on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if render_pool is not None:
+            render_pool.shutdown()
+
+if __name__ == "__main__":
+    main()
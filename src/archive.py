@@ -0,0 +1,213 @@
+import argparse
+import json
+import re
+import sys
+import time
+import zipfile
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from src.metrics import metrics
+
+ARCHIVE_FORMATS = ('html', 'pdf')
+
+# Render jobs kept in flight per render pool worker; bounds memory while keeping workers busy
+WINDOW_PER_WORKER = 2
+
+
+class _ChunkWriter:
+    """
+    Unseekable sink for ZipFile that hands back what was written since the
+    last drain. Without seek or tell, ZipFile streams each entry with a data
+    descriptor instead of going back to patch its header.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def document_name(quote_info: Dict, fmt: str) -> str:
+    """
+    File name of a quote document, e.g. Forklift_Rental_Quote_QT-20250101-D35s-5.pdf
+
+    Args:
+        quote_info: Result of QuoteGenerator.format_quote_for_display
+        fmt: 'html' or 'pdf'
+
+    Returns:
+        File name with only letters, digits, '-', '_' and '.'
+    """
+    title = quote_info['formatted_quote']['title']
+    number = title.split('#')[-1].strip() if '#' in title else 'quote'
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', f"Forklift_Rental_Quote_{number}") + f".{fmt}"
+
+
+def render_documents(quotes: Iterable[Dict], fmt: str = 'html', render_pool=None,
+                     window: Optional[int] = None) -> Iterator[Tuple[Dict, Optional[bytes]]]:
+    """
+    Render quotes one by one, in order
+
+    With a RenderPool the renders run on its bulk lane, at most `window` at a
+    time, so the pool's workers render in parallel while only a bounded number
+    of documents is held in memory.
+
+    Args:
+        quotes: Results of QuoteGenerator.format_quote_for_display
+        fmt: 'html' or 'pdf'
+        render_pool: Optional RenderPool
+        window: Renders in flight (defaults to WINDOW_PER_WORKER per bulk worker)
+
+    Yields:
+        Tuples of (quote, document bytes or None for an unsuccessful quote)
+    """
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown document format: {fmt}")
+
+    if render_pool is None:
+        from src.service import render_document
+        for quote_info in quotes:
+            document = render_document(quote_info, fmt) if quote_info.get('success', False) else None
+            yield quote_info, document.encode('utf-8') if isinstance(document, str) else document
+        return
+
+    window = window or WINDOW_PER_WORKER * max(1, render_pool.stats()['workers']['bulk'])
+    pending = deque()
+    for quote_info in quotes:
+        future = render_pool.submit(quote_info, fmt, bulk=True) if quote_info.get('success', False) else None
+        pending.append((quote_info, future))
+        if len(pending) >= window:
+            quote_info, future = pending.popleft()
+            yield quote_info, future.result() if future is not None else None
+    while pending:
+        quote_info, future = pending.popleft()
+        yield quote_info, future.result() if future is not None else None
+
+
+def stream_archive(quotes: Iterable[Dict], fmt: str = 'html', render_pool=None,
+                   window: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Render quotes into a ZIP archive, yielding it in chunks as it is built
+
+    Each document is compressed into the stream as soon as it is rendered and
+    nothing is written to disk; besides the documents in flight, memory only
+    holds the archive's directory (under 1 KB per document). Unsuccessful
+    quotes are skipped and repeated names get a numeric suffix.
+
+    Args:
+        quotes: Results of QuoteGenerator.format_quote_for_display (any iterable,
+            e.g. a generator quoting spreadsheet lines as they are read)
+        fmt: 'html' or 'pdf'
+        render_pool: Optional RenderPool to render on (see render_documents)
+        window: Renders in flight on the pool
+
+    Yields:
+        Consecutive byte chunks of the ZIP file (roughly one per document)
+    """
+    sink = _ChunkWriter()
+    names = {}
+    with metrics.span('archive_stream'):
+        with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for quote_info, document in render_documents(quotes, fmt, render_pool, window):
+                if document is None:
+                    continue
+                name = document_name(quote_info, fmt)
+                names[name] = names.get(name, 0) + 1
+                if names[name] > 1:
+                    stem, extension = name.rsplit('.', 1)
+                    name = f"{stem}_{names[name]}.{extension}"
+                entry = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+                entry.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(entry, document)
+                yield sink.drain()
+        # Central directory; if rendering raised, ZipFile still writes it to the
+        # sink on the way out, but it is never yielded, so no partial archive reads as whole
+        yield sink.drain()
+
+
+def write_archive(quotes: Iterable[Dict], target, fmt: str = 'html', render_pool=None,
+                  window: Optional[int] = None) -> int:
+    """
+    Stream a ZIP archive of quote documents to a file
+
+    Args:
+        quotes: Results of QuoteGenerator.format_quote_for_display
+        target: Path, or a binary file object such as sys.stdout.buffer
+        fmt: 'html' or 'pdf'
+        render_pool: Optional RenderPool
+        window: Renders in flight on the pool
+
+    Returns:
+        Archive size in bytes
+    """
+    handle = open(target, 'wb') if isinstance(target, (str, Path)) else target
+    size = 0
+    try:
+        for chunk in stream_archive(quotes, fmt, render_pool, window):
+            handle.write(chunk)
+            size += len(chunk)
+    finally:
+        if handle is not target:
+            handle.close()
+    return size
+
+
+def main(argv=None):
+    """Quote a spreadsheet or JSON list of requirements into a ZIP of documents"""
+    from src.bulk import iter_quotes, quote_requirements
+    from src.data_loader import ForkliftData
+    from src.matcher import ForkliftMatcher
+    from src.quote import QuoteGenerator
+
+    parser = argparse.ArgumentParser(description="Stream quote documents into a ZIP archive")
+    parser.add_argument('output', help="Archive path, or - for standard output")
+    parser.add_argument('--from', dest='source', required=True,
+                        help="CSV/XLSX spreadsheet of equipment needs, or a JSON list of requirements")
+    parser.add_argument('--format', choices=ARCHIVE_FORMATS, default='html')
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Render on a pool with this many worker processes (default: in process)")
+    parser.add_argument('--data-dir', default='data')
+    args = parser.parse_args(argv)
+
+    data = ForkliftData(args.data_dir)
+    matcher = ForkliftMatcher(data)
+    quote_generator = QuoteGenerator(data)
+    if args.source.lower().endswith('.json'):
+        with open(args.source) as f:
+            quotes = quote_requirements(json.load(f), matcher, quote_generator)
+    else:
+        quotes = (
+            {'success': True, 'formatted_quote': result['formatted_quote']}
+            for result in iter_quotes(args.source, args.source, matcher, quote_generator)
+            if result['success']
+        )
+
+    render_pool = None
+    if args.workers > 0:
+        from src.render_pool import RenderPool
+        render_pool = RenderPool(workers=1, bulk_workers=args.workers)
+    start = time.perf_counter()
+    try:
+        target = sys.stdout.buffer if args.output == '-' else args.output
+        size = write_archive(quotes, target, args.format, render_pool)
+    finally:
+        if render_pool is not None:
+            render_pool.shutdown()
+    print(f"Wrote {size / 1024:.0f} KiB in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,501 @@
+import bisect
+import datetime
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def to_date(value) -> datetime.date:
+    """
+    Coerce a date, datetime or ISO date string to a date
+
+    Args:
+        value: Date-like value
+
+    Returns:
+        datetime.date
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value))
+
+
+# Open ends of free gaps, as day ordinals (real ordinals start at 1)
+_NEVER = 0
+_FOREVER = 1 << 62
+# Leaves of the gap tree: one per day ordinal up to datetime.date.max
+_DAYS = 1 << 22
+
+
+class UnitSchedule:
+    """
+    Sorted, non-overlapping busy intervals for one physical unit.
+
+    Intervals are half-open day ordinals [start, end). Because they never
+    overlap, both the start and end arrays are sorted, so overlap checks
+    are a single bisect.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.booking_ids = []
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Check whether [start, end) intersects any busy interval (O(log n))"""
+        i = bisect.bisect_right(self.ends, start)
+        return i < len(self.starts) and self.starts[i] < end
+
+    def insert(self, start: int, end: int, booking_id: int) -> bool:
+        """Insert a busy interval; returns False if it would overlap"""
+        if self.overlaps(start, end):
+            return False
+        i = bisect.bisect_left(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.booking_ids.insert(i, booking_id)
+        return True
+
+    def remove(self, start: int, booking_id: int) -> bool:
+        """Remove a busy interval by its start and booking ID"""
+        i = bisect.bisect_left(self.starts, start)
+        if i < len(self.starts) and self.booking_ids[i] == booking_id:
+            del self.starts[i], self.ends[i], self.booking_ids[i]
+            return True
+        return False
+
+    def free_gap(self, start: int, end: int) -> Tuple[int, int]:
+        """Free gap [a, b) around [start, end), which must not overlap a busy interval"""
+        i = bisect.bisect_left(self.starts, start)
+        return (self.ends[i - 1] if i else _NEVER), (self.starts[i] if i < len(self.starts) else _FOREVER)
+
+    def free_run(self, day: int) -> float:
+        """Number of consecutive free days starting at `day` (inf if never booked again)"""
+        i = bisect.bisect_right(self.ends, day)
+        if i == len(self.starts):
+            return float('inf')
+        return max(self.starts[i] - day, 0)
+
+    def first_free(self, earliest: int, length: int) -> int:
+        """
+        Earliest start >= earliest with `length` free days.
+
+        Bisects to the first relevant interval, then walks forward only past
+        gaps that are too short.
+        """
+        candidate = earliest
+        i = bisect.bisect_right(self.ends, candidate)
+        while i < len(self.starts) and self.starts[i] < candidate + length:
+            candidate = self.ends[i]
+            i += 1
+        return candidate
+
+
+class ModelAvailability:
+    """
+    Free gaps of every unit of one model, kept in a sparse max tree over
+    gap start days, so model-level queries and updates are O(log n) rather
+    than a scan over units.
+
+    A period [start, end) is free on some unit exactly when a gap starting
+    on or before `start` reaches `end`, so each node keeps the furthest gap
+    end below it; it also keeps the longest gap below it, to find the first
+    gap after a day that is long enough. Bookings and cancellations split
+    and merge one unit's gaps in place.
+    """
+
+    def __init__(self, unit_ids: List[str], schedules: Dict[str, UnitSchedule]):
+        """
+        Build the index from the units' schedules
+
+        Args:
+            unit_ids: Units of the model, in registration order
+            schedules: FleetAvailability.schedules
+        """
+        self.unit_ids = []
+        self.schedules = []
+        self._positions = {}  # unit_id -> index into unit_ids
+        self._gaps = {}       # gap start day -> {unit index: gap end}
+        self._furthest = {}   # gap start day -> unit index whose gap there reaches furthest
+        self._tree = {}       # node -> (furthest gap end, longest gap) below it; empty nodes are absent
+        self._reach = None    # sorted gap start days and running furthest end, for contains_many
+        for unit_id in unit_ids:
+            self.add_unit(unit_id, schedules[unit_id])
+
+    def add_unit(self, unit_id: str, schedule: UnitSchedule):
+        """Add a unit and its free gaps"""
+        k = self._positions[unit_id] = len(self.unit_ids)
+        self.unit_ids.append(unit_id)
+        self.schedules.append(schedule)
+        for start, end in zip([_NEVER] + schedule.ends, schedule.starts + [_FOREVER]):
+            self._set_gap(start, k, end)
+
+    def book(self, unit_id: str, gap: Tuple[int, int], start: int, end: int):
+        """Split the free gap of a unit around a new busy interval [start, end)"""
+        k = self._positions[unit_id]
+        self._set_gap(gap[0], k, start)
+        self._set_gap(end, k, gap[1])
+
+    def cancel(self, unit_id: str, gap: Tuple[int, int], start: int, end: int):
+        """Merge the free gaps of a unit on either side of a cancelled interval [start, end)"""
+        k = self._positions[unit_id]
+        self._set_gap(end, k, end)
+        self._set_gap(gap[0], k, gap[1])
+
+    def containing(self, start: int, end: int) -> Optional[int]:
+        """A unit (index into unit_ids) with a gap containing [start, end), or None (O(log n))"""
+        day = self._leftmost(_NEVER, start, lambda node: node[0] >= end)
+        return None if day is None else self._furthest[day]
+
+    def contains_many(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Whether some gap contains each [starts[i], ends[i]) (one searchsorted for all)"""
+        if self._reach is None:
+            days = np.array(sorted(self._gaps), dtype=np.int64)
+            furthest = np.array([self._tree[day + _DAYS][0] for day in days.tolist()], dtype=np.int64)
+            self._reach = days, np.maximum.accumulate(furthest) if len(days) else furthest
+        days, reach = self._reach
+        i = np.searchsorted(days, starts, side='right')
+        if not len(reach):
+            return np.zeros(len(i), dtype=bool)
+        return (i > 0) & (reach[np.maximum(i - 1, 0)] >= ends)
+
+    def covering(self, start: int, end: int) -> List[int]:
+        """Units (indexes into unit_ids) free for all of [start, end), in unit order"""
+        return [k for k, schedule in enumerate(self.schedules) if not schedule.overlaps(start, end)]
+
+    def first_covering(self, start: int, end: int) -> Optional[int]:
+        """First unit in unit order free for all of [start, end), or None"""
+        if self.containing(start, end) is None:
+            return None
+        return next(k for k, schedule in enumerate(self.schedules) if not schedule.overlaps(start, end))
+
+    def free_runs(self, day: int) -> np.ndarray:
+        """Consecutive free days from `day` per unit (inf if never booked again)"""
+        return np.array([schedule.free_run(day) for schedule in self.schedules], dtype=float)
+
+    def first_free(self, earliest: int, length: int) -> Optional[Tuple[int, int]]:
+        """
+        Earliest start >= earliest with `length` free days on some unit
+
+        Returns:
+            Tuple of (start ordinal, unit index), or None if the model has no units
+        """
+        unit = self.containing(earliest, earliest + length)
+        if unit is not None:
+            return earliest, unit
+
+        # First gap starting after `earliest` that is long enough
+        day = self._leftmost(earliest + 1, _DAYS - 1, lambda node: node[1] >= length)
+        return None if day is None else (day, self._furthest[day])
+
+    def _set_gap(self, start: int, k: int, end: int):
+        """Set unit k's gap starting on `start` to end on `end` (no gap if end <= start)"""
+        gaps = self._gaps.get(start)
+        if end > start:
+            if gaps is None:
+                gaps = self._gaps[start] = {}
+            gaps[k] = end
+        elif gaps is None or gaps.pop(k, None) is None:
+            return
+        elif not gaps:
+            del self._gaps[start]
+            gaps = None
+        self._reach = None
+
+        # Leaf, then every ancestor up to the root
+        tree = self._tree
+        node = start + _DAYS
+        if gaps:
+            unit = self._furthest[start] = max(gaps, key=gaps.__getitem__)
+            tree[node] = (gaps[unit], gaps[unit] - start)
+        else:
+            self._furthest.pop(start, None)
+            tree.pop(node, None)
+        node >>= 1
+        while node:
+            left, right = tree.get(2 * node), tree.get(2 * node + 1)
+            if left is None or right is None:
+                value = left or right
+            else:
+                value = (max(left[0], right[0]), max(left[1], right[1]))
+            if value is None:
+                tree.pop(node, None)
+            else:
+                tree[node] = value
+            node >>= 1
+
+    def _leftmost(self, low: int, high: int, accept, node: int = 1, node_low: int = 0,
+                  node_high: int = _DAYS - 1) -> Optional[int]:
+        """Smallest gap start day in [low, high] whose leaf passes `accept` (O(log n))"""
+        value = self._tree.get(node)
+        if value is None or node_high < low or node_low > high or not accept(value):
+            return None
+        if node_low == node_high:
+            return node_low
+        middle = (node_low + node_high) // 2
+        found = self._leftmost(low, high, accept, 2 * node, node_low, middle)
+        if found is None:
+            found = self._leftmost(low, high, accept, 2 * node + 1, middle + 1, node_high)
+        return found
+
+
+class FleetAvailability:
+    """
+    Tracks rental units per model, their bookings and maintenance windows,
+    and answers availability queries for matching and quoting.
+    """
+
+    def __init__(self):
+        """Initialize an empty fleet"""
+        self.units_by_model = {}  # model -> [unit_id]
+        self.unit_model = {}      # unit_id -> model
+        self.schedules = {}       # unit_id -> UnitSchedule
+        self.bookings = {}        # booking_id -> booking details
+        self._booking_ids = itertools.count(1)
+        self._indexes = {}        # model -> ModelAvailability, built on first use and updated in place
+
+    @classmethod
+    def from_counts(cls, unit_counts: Dict[str, int]) -> 'FleetAvailability':
+        """
+        Build a fleet with a number of identical units per model
+
+        Args:
+            unit_counts: Mapping of model to number of units
+
+        Returns:
+            FleetAvailability instance
+        """
+        fleet = cls()
+        for model, count in unit_counts.items():
+            fleet.add_units(model, count)
+        return fleet
+
+    def add_unit(self, model: str, unit_id: Optional[str] = None) -> str:
+        """
+        Register a physical unit
+
+        Args:
+            model: Forklift model
+            unit_id: Unit identifier (generated from the model if omitted)
+
+        Returns:
+            The unit ID
+        """
+        units = self.units_by_model.setdefault(model, [])
+        if unit_id is None:
+            unit_id = f"{model}#{len(units) + 1}"
+        if unit_id in self.unit_model:
+            raise ValueError(f"Unit {unit_id} is already registered")
+        units.append(unit_id)
+        self.unit_model[unit_id] = model
+        self.schedules[unit_id] = UnitSchedule()
+        if model in self._indexes:
+            self._indexes[model].add_unit(unit_id, self.schedules[unit_id])
+        return unit_id
+
+    def add_units(self, model: str, count: int) -> List[str]:
+        """Register `count` units of a model"""
+        return [self.add_unit(model) for _ in range(count)]
+
+    def is_tracked(self, model: str) -> bool:
+        """Check whether any units of a model are registered"""
+        return bool(self.units_by_model.get(model))
+
+    def book(self, model: str, start, days: int, unit_id: Optional[str] = None,
+             kind: str = 'booking', reference: Optional[str] = None) -> Dict:
+        """
+        Book a unit of a model for a period
+
+        Args:
+            model: Forklift model
+            start: First day of the period
+            days: Number of days
+            unit_id: Specific unit to book (the first free unit if omitted)
+            kind: 'booking' or 'maintenance'
+            reference: Optional quote or customer reference
+
+        Returns:
+            Dictionary with success flag, booking_id and unit_id, or a message
+        """
+        start_ordinal = to_date(start).toordinal()
+        end_ordinal = start_ordinal + days
+        if unit_id is not None:
+            schedule = self.schedules.get(unit_id)
+            candidate = unit_id if schedule is not None and not schedule.overlaps(start_ordinal, end_ordinal) else None
+        else:
+            index = self._index(model)
+            free = index.first_covering(start_ordinal, end_ordinal)
+            candidate = index.unit_ids[free] if free is not None else None
+        if candidate is None:
+            return {'success': False, 'message': f"No {model} unit is free for the requested period."}
+
+        # IDs are only allocated once the unit is known to be free
+        booking_id = next(self._booking_ids)
+        schedule = self.schedules[candidate]
+        gap = schedule.free_gap(start_ordinal, end_ordinal)
+        schedule.insert(start_ordinal, end_ordinal, booking_id)
+        self.bookings[booking_id] = {
+            'unit_id': candidate,
+            'model': self.unit_model[candidate],
+            'start': start_ordinal,
+            'end': end_ordinal,
+            'kind': kind,
+            'reference': reference,
+        }
+        index = self._indexes.get(self.unit_model[candidate])
+        if index is not None:
+            index.book(candidate, gap, start_ordinal, end_ordinal)
+        return {'success': True, 'booking_id': booking_id, 'unit_id': candidate}
+
+    def add_maintenance(self, unit_id: str, start, days: int) -> Dict:
+        """
+        Block a unit for a maintenance window
+
+        Args:
+            unit_id: Unit to block
+            start: First day of the window
+            days: Number of days
+
+        Returns:
+            Result of book()
+        """
+        return self.book(self.unit_model.get(unit_id), start, days, unit_id=unit_id, kind='maintenance')
+
+    def cancel(self, booking_id: int) -> bool:
+        """
+        Cancel a booking or maintenance window
+
+        Args:
+            booking_id: ID returned by book()
+
+        Returns:
+            True if the booking existed
+        """
+        booking = self.bookings.pop(booking_id, None)
+        if booking is None:
+            return False
+        schedule = self.schedules[booking['unit_id']]
+        if not schedule.remove(booking['start'], booking_id):
+            return False
+        index = self._indexes.get(booking['model'])
+        if index is not None:
+            gap = schedule.free_gap(booking['start'], booking['end'])
+            index.cancel(booking['unit_id'], gap, booking['start'], booking['end'])
+        return True
+
+    def _index(self, model: str) -> ModelAvailability:
+        """Get the free-gap index of a model, building it on first use"""
+        index = self._indexes.get(model)
+        if index is None:
+            index = self._indexes[model] = ModelAvailability(self.units_by_model.get(model, []), self.schedules)
+        return index
+
+    def free_units(self, model: str, start, days: int) -> List[str]:
+        """
+        List the units of a model that are free for a whole period
+
+        Args:
+            model: Forklift model
+            start: First day of the period
+            days: Number of days
+
+        Returns:
+            List of free unit IDs
+        """
+        start_ordinal = to_date(start).toordinal()
+        index = self._index(model)
+        return [index.unit_ids[k] for k in index.covering(start_ordinal, start_ordinal + days)]
+
+    def count_free(self, model: str, start, days: int) -> int:
+        """Count the units of a model that are free for a whole period"""
+        return len(self.free_units(model, start, days))
+
+    def is_available(self, model: str, start, days: int) -> bool:
+        """Check whether at least one unit of a model is free for a period (O(log n))"""
+        start_ordinal = to_date(start).toordinal()
+        return self._index(model).containing(start_ordinal, start_ordinal + days) is not None
+
+    def availability_matrix(self, models: List[str], starts: List, days) -> np.ndarray:
+        """
+        Check many periods against many models at once
+
+        Each distinct (start, days) period is looked up once per model with a
+        vectorized bisect, so the cost grows with the number of models rather
+        than with inquiries times models.
+
+        Args:
+            models: Forklift models (columns)
+            starts: First day of each period (rows)
+            days: Number of days of each period
+
+        Returns:
+            Boolean array of shape (len(starts), len(models)), True where the
+            model has a unit free for the whole period
+        """
+        periods = np.empty((len(starts), 2), dtype=np.int64)
+        periods[:, 0] = [to_date(start).toordinal() for start in starts]
+        periods[:, 1] = np.asarray(days, dtype=np.int64)
+        distinct, rows = np.unique(periods, axis=0, return_inverse=True)
+        first, last = distinct[:, 0], distinct[:, 0] + distinct[:, 1]
+
+        mask = np.empty((len(distinct), len(models)), dtype=bool)
+        for j, model in enumerate(models):
+            mask[:, j] = self._index(model).contains_many(first, last)
+        return mask[rows.reshape(-1)]
+
+    def free_run_lengths(self, model: str, start) -> np.ndarray:
+        """
+        Consecutive free days from `start` for every unit of a model
+
+        Args:
+            model: Forklift model
+            start: First day of the period
+
+        Returns:
+            Array with one entry per unit (0 if the unit is busy on `start`)
+        """
+        return self._index(model).free_runs(to_date(start).toordinal())
+
+    def can_supply(self, model: str, start, unit_periods: List[Dict]) -> bool:
+        """
+        Check in bulk whether a model can cover a fleet order starting on one day
+
+        Longest requested periods are matched to the units with the longest
+        free runs, which succeeds whenever any assignment exists.
+
+        Args:
+            model: Forklift model
+            start: First day of every period
+            unit_periods: List of {'quantity': n, 'days': d} groups
+
+        Returns:
+            True if enough units are free for every group
+        """
+        needed = np.sort(np.repeat(
+            [p['days'] for p in unit_periods], [p['quantity'] for p in unit_periods]
+        ))[::-1]
+        runs = np.sort(self.free_run_lengths(model, start))[::-1]
+        if len(needed) > len(runs):
+            return False
+        return bool(np.all(runs[:len(needed)] >= needed))
+
+    def first_free_slot(self, model: str, days: int, earliest) -> Optional[Tuple[datetime.date, str]]:
+        """
+        Find the earliest period of `days` days on or after `earliest` for any unit of a model
+
+        Args:
+            model: Forklift model
+            days: Number of days required
+            earliest: Earliest acceptable start date
+
+        Returns:
+            Tuple of (start date, unit ID), or None if the model has no units
+        """
+        index = self._index(model)
+        slot = index.first_free(to_date(earliest).toordinal(), days)
+        if slot is None:
+            return None
+        return datetime.date.fromordinal(slot[0]), index.unit_ids[slot[1]]
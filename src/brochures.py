@@ -0,0 +1,344 @@
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+# pypdf is only needed when brochure PDFs are extracted, which happens in worker
+# processes, so it is imported there rather than by every app process
+PYPDF_AVAILABLE = importlib.util.find_spec('pypdf') is not None
+
+CACHE_DIR_NAME = '.brochure_cache'
+EXCERPT_CHARS = 1500
+
+_MODEL_PATTERN = re.compile(r'^([A-Za-z]+)(\d+)')
+_RANGE_KEY_PATTERN = re.compile(r'^([A-Za-z]+)(\d+)\s*-\s*([A-Za-z]*)(\d+)$')
+_TOKEN_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9.\-]*[A-Za-z0-9]')
+
+
+def file_sha256(path) -> str:
+    """Hex SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_pdf_text(path) -> str:
+    """
+    Extract the text of a brochure PDF (runs in a worker process)
+
+    Args:
+        path: PDF file
+
+    Returns:
+        Page texts joined by blank lines
+    """
+    if not PYPDF_AVAILABLE:
+        raise ImportError("Brochure extraction requires pypdf (pip install pypdf)")
+    from pypdf import PdfReader
+    reader = PdfReader(str(path))
+    return '\n\n'.join((page.extract_text() or '').strip() for page in reader.pages).strip()
+
+
+def excerpt(text: str, max_chars: int = EXCERPT_CHARS) -> str:
+    """
+    Leading part of a brochure, cut at a paragraph or line boundary
+
+    Args:
+        text: Full brochure text
+        max_chars: Maximum excerpt length
+
+    Returns:
+        The excerpt (the full text if it is short enough)
+    """
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind('\n\n', 0, max_chars)
+    if cut < max_chars // 2:
+        cut = text.rfind('\n', 0, max_chars)
+    if cut < max_chars // 2:
+        cut = max_chars
+    return text[:cut].rstrip()
+
+
+def summarize(text: str, max_chars: int = EXCERPT_CHARS) -> Dict:
+    """
+    Everything the catalog needs from a brochure without keeping its full text
+
+    Args:
+        text: Full brochure text
+        max_chars: Maximum excerpt length
+
+    Returns:
+        Dictionary with the 'excerpt', the full text 'length', the model-like
+        'tokens' it mentions, its 'features' bitset and its search 'terms' with counts
+    """
+    from collections import Counter
+    from src.features import parse_features
+    from src.search import analyze
+    return {
+        'excerpt': excerpt(text, max_chars),
+        'length': len(text),
+        'tokens': sorted(t for t in set(_TOKEN_PATTERN.findall(text)) if any(c.isdigit() for c in t)),
+        'features': int(parse_features(text)),
+        'terms': dict(Counter(analyze(text))),
+    }
+
+
+def map_models_to_brochures(models: Iterable[str], brochures: Dict) -> Dict[str, str]:
+    """
+    Precompute which brochure describes each model
+
+    A brochure that names a model in its text wins. Otherwise a brochure
+    keyed by a family range such as "D35-D55" covers the models with that
+    prefix whose numeric size lies within the range.
+
+    Args:
+        models: Catalog model names
+        brochures: Mapping of brochure key to text, or to its summary (see summarize)
+
+    Returns:
+        Mapping of model to brochure key
+    """
+    models = [str(m) for m in models]
+    model_set = set(models)
+    mapping = {}
+
+    for key in sorted(brochures):
+        if key in model_set:
+            mapping.setdefault(key, key)
+        brochure = brochures[key]
+        tokens = brochure['tokens'] if isinstance(brochure, dict) else set(_TOKEN_PATTERN.findall(brochure))
+        for token in tokens:
+            if token in model_set:
+                mapping.setdefault(token, key)
+
+    ranges = []
+    for key in sorted(brochures):
+        match = _RANGE_KEY_PATTERN.match(key)
+        if match and match.group(3) in ('', match.group(1)):
+            ranges.append((match.group(1).upper(), int(match.group(2)), int(match.group(4)), key))
+    for model in models:
+        if model in mapping:
+            continue
+        match = _MODEL_PATTERN.match(model)
+        if not match:
+            continue
+        prefix, size = match.group(1).upper(), int(match.group(2))
+        for range_prefix, low, high, key in ranges:
+            if prefix == range_prefix and low <= size <= high:
+                mapping[model] = key
+                break
+    return mapping
+
+
+class BrochureStore:
+    """
+    Content-hashed cache of text extracted from brochure PDFs.
+
+    The manifest records each PDF's size, modification time and SHA-256, so
+    a refresh only hashes files whose stat changed and only extracts content
+    it has never seen. Extracted text is stored once per content hash next
+    to a small summary (see summarize); the catalog loads the summaries and
+    the text is only read on demand.
+    """
+
+    def __init__(self, data_dir, cache_dir=None, workers: Optional[int] = None):
+        """
+        Initialize the store
+
+        Args:
+            data_dir: Directory scanned (recursively) for *.pdf brochures
+            cache_dir: Cache location (defaults to <data_dir>/.brochure_cache)
+            workers: Extraction processes (defaults to min(4, CPU count))
+        """
+        self.data_dir = Path(data_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else self.data_dir / CACHE_DIR_NAME
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.manifest = self._read_manifest()
+
+    @property
+    def _manifest_path(self):
+        return self.cache_dir / 'manifest.json'
+
+    def _text_path(self, digest):
+        return self.cache_dir / 'text' / f"{digest}.txt"
+
+    def _summary_path(self, digest):
+        return self.cache_dir / 'text' / f"{digest}.json"
+
+    def _write_summary(self, digest, text) -> Dict:
+        summary = summarize(text)
+        tmp = self._summary_path(digest).with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(summary, f)
+        os.replace(tmp, self._summary_path(digest))
+        return summary
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(self._manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._manifest_path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp, self._manifest_path)
+
+    def scan(self):
+        """List brochure PDFs under the data directory, in path order"""
+        if not self.data_dir.is_dir():
+            return []
+        return sorted(
+            path for path in self.data_dir.rglob('*')
+            if path.is_file() and path.suffix.lower() == '.pdf'
+            and not any(part.startswith('.') for part in path.relative_to(self.data_dir).parts)
+        )
+
+    def refresh(self) -> Dict:
+        """
+        Bring the cache up to date with the PDFs on disk
+
+        Returns:
+            Report listing extracted, reused (same content seen before) and removed
+            sources, the number left unchanged, and extraction errors
+        """
+        report = {'extracted': [], 'reused': [], 'removed': [], 'unchanged': 0, 'errors': []}
+        paths = self.scan()
+        seen = set()
+        pending = {}  # digest -> (source, path)
+
+        for path in paths:
+            source = path.relative_to(self.data_dir).as_posix()
+            seen.add(source)
+            stat = path.stat()
+            entry = self.manifest.get(source)
+            if (entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+                    and self._text_path(entry['sha256']).exists()):
+                report['unchanged'] += 1
+                continue
+
+            digest = file_sha256(path)
+            self.manifest[source] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+            if self._text_path(digest).exists() or digest in pending:
+                report['reused'].append(source)
+            else:
+                pending[digest] = (source, path)
+
+        for source in sorted(set(self.manifest) - seen):
+            del self.manifest[source]
+            report['removed'].append(source)
+
+        if pending:
+            self._extract(pending, report)
+        if report['extracted'] or report['reused'] or report['removed'] or report['errors']:
+            self._collect_garbage()
+            self._write_manifest()
+        return report
+
+    def _extract(self, pending, report):
+        (self.cache_dir / 'text').mkdir(parents=True, exist_ok=True)
+        items = list(pending.items())
+        if len(items) > 1 and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(items))) as executor:
+                futures = [(digest, source, executor.submit(extract_pdf_text, path))
+                           for digest, (source, path) in items]
+                results = []
+                for digest, source, future in futures:
+                    try:
+                        results.append((digest, source, future.result(), None))
+                    except Exception as e:
+                        results.append((digest, source, None, e))
+        else:
+            results = []
+            for digest, (source, path) in items:
+                try:
+                    results.append((digest, source, extract_pdf_text(path), None))
+                except Exception as e:
+                    results.append((digest, source, None, e))
+
+        for digest, source, text, error in results:
+            if error is not None:
+                report['errors'].append({'source': source, 'error': f"{type(error).__name__}: {error}"})
+                self.manifest.pop(source, None)
+                continue
+            tmp = self._text_path(digest).with_suffix('.tmp')
+            tmp.write_text(text)
+            os.replace(tmp, self._text_path(digest))
+            self._write_summary(digest, text)
+            report['extracted'].append(source)
+
+    def _collect_garbage(self):
+        live = {entry['sha256'] for entry in self.manifest.values()}
+        text_dir = self.cache_dir / 'text'
+        if text_dir.is_dir():
+            for path in list(text_dir.glob('*.txt')) + list(text_dir.glob('*.json')):
+                if path.stem not in live:
+                    path.unlink()
+
+    def keys(self) -> Dict[str, str]:
+        """Mapping of brochure key (PDF file name without extension) to content hash"""
+        return {Path(source).stem: entry['sha256'] for source, entry in sorted(self.manifest.items())}
+
+    def read(self, key: str) -> Optional[str]:
+        """
+        Load the extracted text of one brochure
+
+        Args:
+            key: Brochure key from keys()
+
+        Returns:
+            The text, or None if the key is unknown
+        """
+        digest = self.keys().get(key)
+        if digest is None:
+            return None
+        return self._text_path(digest).read_text()
+
+    def summary(self, key: str) -> Optional[Dict]:
+        """
+        Load the summary of one brochure, creating it for text cached before summaries existed
+
+        Args:
+            key: Brochure key from keys()
+
+        Returns:
+            The summary (see summarize), or None if the key is unknown
+        """
+        digest = self.keys().get(key)
+        if digest is None:
+            return None
+        try:
+            with open(self._summary_path(digest)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return self._write_summary(digest, self._text_path(digest).read_text())
+
+
+def main(argv=None):
+    """Extract brochure PDFs ahead of deployment"""
+    parser = argparse.ArgumentParser(description="Extract brochure PDF text into the brochure cache")
+    parser.add_argument('data_dir', nargs='?', default='data')
+    parser.add_argument('--cache-dir', default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    report = BrochureStore(args.data_dir, args.cache_dir, args.workers).refresh()
+    print(f"Extracted {len(report['extracted'])}, reused {len(report['reused'])}, "
+          f"unchanged {report['unchanged']}, removed {len(report['removed'])}")
+    for error in report['errors']:
+        print(f"Error extracting {error['source']}: {error['error']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,437 @@
+import csv
+import io
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from src.archive import stream_archive
+from src.availability import to_date
+from src.conversation import ConversationManager
+from src.html_pdf_generator import render_combined
+from src.ingest import _normalize_header
+from src.metrics import metrics
+
+# Rows parsed, matched and quoted together
+CHUNK_ROWS = int(os.environ.get('FORKLIFT_BULK_CHUNK_ROWS', 100))
+
+# Normalized header -> (field, unit appended to bare numbers). Fields are the
+# conversation question IDs plus 'quantity', 'start_date' and 'reference'.
+COLUMN_ALIASES = {
+    'load_weight': ('load_weight', None), 'weight': ('load_weight', None), 'load': ('load_weight', None),
+    'heaviest_load': ('load_weight', None), 'max_load': ('load_weight', None),
+    'weight_kg': ('load_weight', 'kg'), 'load_kg': ('load_weight', 'kg'), 'load_weight_kg': ('load_weight', 'kg'),
+    'weight_t': ('load_weight', 'tons'), 'weight_tons': ('load_weight', 'tons'), 'load_tons': ('load_weight', 'tons'),
+    'load_weight_tons': ('load_weight', 'tons'),
+    'rental_period': ('rental_period', None), 'period': ('rental_period', None), 'duration': ('rental_period', None),
+    'days': ('rental_period', 'days'), 'rental_days': ('rental_period', 'days'),
+    'weeks': ('rental_period', 'weeks'), 'rental_weeks': ('rental_period', 'weeks'),
+    'months': ('rental_period', 'months'), 'rental_months': ('rental_period', 'months'),
+    'indoor_outdoor': ('indoor_outdoor', None), 'environment': ('indoor_outdoor', None),
+    'usage': ('indoor_outdoor', None), 'use': ('indoor_outdoor', None),
+    'lift_height': ('lift_height', None), 'height': ('lift_height', None), 'max_height': ('lift_height', None),
+    'lift_height_m': ('lift_height', 'm'), 'height_m': ('lift_height', 'm'),
+    'special_requirements': ('special_requirements', None), 'requirements': ('special_requirements', None),
+    'attachments': ('special_requirements', None), 'notes': ('special_requirements', None),
+    'quantity': ('quantity', None), 'qty': ('quantity', None), 'units': ('quantity', None),
+    'start_date': ('start_date', None), 'start': ('start_date', None), 'date': ('start_date', None),
+    'reference': ('reference', None), 'ref': ('reference', None), 'customer': ('reference', None),
+    'site': ('reference', None), 'po': ('reference', None), 'po_number': ('reference', None),
+}
+
+_NUMBER = re.compile(r'^\d+(\.\d+)?$')
+
+
+def _cell_text(value) -> str:
+    """Spreadsheet cell as answer text (whole floats lose their '.0')"""
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def map_columns(headers) -> Dict[int, Tuple[str, Optional[str]]]:
+    """
+    Map spreadsheet columns to requirement fields
+
+    Args:
+        headers: Header cells in column order
+
+    Returns:
+        Column position -> (field, unit) for every recognized header; the first
+        column wins when several map to the same field
+
+    Raises:
+        ValueError: If a required column (load weight, rental period, environment) is missing
+    """
+    columns = {}
+    for position, header in enumerate(headers):
+        alias = COLUMN_ALIASES.get(_normalize_header(header))
+        if alias and alias[0] not in {field for field, _ in columns.values()}:
+            columns[position] = alias
+    missing = {'load_weight', 'rental_period', 'indoor_outdoor'} - {field for field, _ in columns.values()}
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(sorted(missing))}")
+    return columns
+
+
+def _open(source, mode='rb'):
+    """Open a path, or rewind an already open file (e.g. a Streamlit upload)"""
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, mode)
+    source.seek(0)
+    return source
+
+
+def _is_excel(name) -> bool:
+    return str(name).lower().endswith(('.xlsx', '.xlsm'))
+
+
+def _iter_csv(source) -> Iterator[list]:
+    """Yield header then data rows of a CSV file, reading it in chunks"""
+    handle = _open(source)
+    reader = pd.read_csv(handle, dtype=str, keep_default_na=False, chunksize=CHUNK_ROWS,
+                         skipinitialspace=True, skip_blank_lines=False)
+    first = True
+    for chunk in reader:
+        if first:
+            yield list(chunk.columns)
+            first = False
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def _iter_excel(source) -> Iterator[list]:
+    """Yield header then data rows of the first worksheet, without loading the workbook"""
+    try:
+        import openpyxl
+    except ImportError:
+        raise ValueError("Reading XLSX files requires the openpyxl package")
+    workbook = openpyxl.load_workbook(_open(source), read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def count_rows(source, name) -> Optional[int]:
+    """
+    Estimate the number of data rows, for progress reporting
+
+    Args:
+        source: Path or binary file object
+        name: File name (its extension selects the format)
+
+    Returns:
+        Row count (an estimate for CSV files with line breaks inside cells), or None if unknown
+    """
+    if _is_excel(name):
+        try:
+            import openpyxl
+        except ImportError:
+            return None
+        workbook = openpyxl.load_workbook(_open(source), read_only=True)
+        try:
+            rows = workbook.worksheets[0].max_row
+        finally:
+            workbook.close()
+        return rows - 1 if rows else None
+    handle = _open(source)
+    lines = 0
+    last = b'\n'
+    for block in iter(lambda: handle.read(1 << 20), b''):
+        lines += block.count(b'\n')
+        last = block[-1:]
+    if isinstance(source, (str, os.PathLike)):
+        handle.close()
+    return max(0, lines + (last != b'\n') - 1)
+
+
+def read_lines(source, name, chunk_rows: int = CHUNK_ROWS) -> Iterator[List[Dict]]:
+    """
+    Stream the equipment lines of a CSV or XLSX spreadsheet in chunks
+
+    Args:
+        source: Path or binary file object
+        name: File name (its extension selects the format)
+        chunk_rows: Lines per chunk
+
+    Yields:
+        Lists of {'line': spreadsheet row number, 'reference', 'answers': answer
+        text per field}; blank rows are skipped
+
+    Raises:
+        ValueError: If the header lacks a required column or the format is unreadable
+    """
+    rows = _iter_excel(source) if _is_excel(name) else _iter_csv(source)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = map_columns(header)
+
+    chunk = []
+    for line, row in enumerate(rows, start=2):
+        answers = {}
+        for position, (field, unit) in columns.items():
+            text = _cell_text(row[position]) if position < len(row) else ''
+            if text and unit and _NUMBER.match(text):
+                text = f"{text} {unit}"
+            answers[field] = text
+        if not any(answers.values()):
+            continue
+        chunk.append({'line': line, 'reference': answers.pop('reference', ''), 'answers': answers})
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def line_requirements(answers: Dict) -> Tuple[Dict, List[str]]:
+    """
+    Turn one spreadsheet line into requirements, as the conversation would
+
+    Args:
+        answers: Answer text per field (see read_lines)
+
+    Returns:
+        Tuple of (requirements, error messages)
+    """
+    answers = dict(answers)
+    quantity = answers.pop('quantity', '')
+    start_date = answers.pop('start_date', '')
+
+    # Several units become a fleet order, e.g. "3 for 14 days"
+    period = answers.get('rental_period', '')
+    if quantity and _NUMBER.match(quantity) and float(quantity) > 1 and period:
+        if _NUMBER.match(period):
+            period = f"{period} days"
+        answers['rental_period'] = f"{int(float(quantity))} for {period}"
+
+    conversation = ConversationManager()
+    errors = conversation.answer_all(answers)
+    requirements = dict(conversation.get_requirements())
+    if start_date:
+        try:
+            requirements['start_date'] = to_date(start_date.split(' ')[0]).isoformat()
+        except ValueError:
+            errors.append(f"Invalid start date: {start_date}")
+    return requirements, errors
+
+
+def quote_lines(lines: List[Dict], matcher, quote_generator) -> List[Dict]:
+    """
+    Match and quote a chunk of spreadsheet lines
+
+    Args:
+        lines: One chunk from read_lines
+        matcher: ForkliftMatcher (the chunk is matched with match_batch)
+        quote_generator: QuoteGenerator
+
+    Returns:
+        One result per line with 'line', 'reference', 'requirements', 'success',
+        'message' (why the line was not quoted), 'model', 'total_cents' and
+        'formatted_quote'; quote numbers end in -L<line>
+    """
+    parsed = [line_requirements(line['answers']) for line in lines]
+    valid = [i for i, (_, errors) in enumerate(parsed) if not errors]
+    matches = dict(zip(valid, matcher.match_batch([parsed[i][0] for i in valid])))
+
+    results = []
+    for i, line in enumerate(lines):
+        requirements, errors = parsed[i]
+        result = {'line': line['line'], 'reference': line['reference'], 'requirements': requirements,
+                  'success': False, 'message': '; '.join(errors), 'model': None, 'total_cents': None,
+                  'formatted_quote': None}
+        match = matches.get(i)
+        if match is not None:
+            quote_result = quote_generator.generate_quote(match)
+            if quote_result.get('success', False):
+                # Lines of one upload often share a model, so number quotes by line
+                quote = dict(quote_result['quote'])
+                quote['quote_number'] = f"{quote['quote_number']}-L{line['line']}"
+                quote_result = dict(quote_result, quote=quote)
+                result.update(
+                    success=True, message='', model=quote['forklift']['model'],
+                    total_cents=quote['pricing']['total_rental_cost_cents'],
+                    formatted_quote=quote_generator.format_quote_for_display(quote_result)['formatted_quote'],
+                )
+            else:
+                result['message'] = quote_result.get('message', 'No suitable forklift found.')
+        results.append(result)
+    return results
+
+
+def iter_quotes(source, name, matcher, quote_generator, chunk_rows: int = CHUNK_ROWS) -> Iterator[Dict]:
+    """
+    Quote a spreadsheet line by line as it is read (see quote_lines for the results)
+
+    Args:
+        source: Path or binary file object
+        name: File name (its extension selects the format)
+        matcher: ForkliftMatcher
+        quote_generator: QuoteGenerator
+        chunk_rows: Lines matched together
+    """
+    for chunk in read_lines(source, name, chunk_rows):
+        yield from quote_lines(chunk, matcher, quote_generator)
+
+
+def quote_requirements(requirements_list: List[Dict], matcher, quote_generator,
+                       chunk_rows: int = CHUNK_ROWS) -> Iterator[Dict]:
+    """
+    Quote a list of requirement dictionaries, matching chunk_rows at a time
+
+    Args:
+        requirements_list: Requirements as produced by ConversationManager
+        matcher: ForkliftMatcher
+        quote_generator: QuoteGenerator
+        chunk_rows: Inquiries matched together
+
+    Yields:
+        QuoteGenerator.format_quote_for_display results, in order
+    """
+    for start in range(0, len(requirements_list), chunk_rows):
+        for match in matcher.match_batch(requirements_list[start:start + chunk_rows]):
+            yield quote_generator.format_quote_for_display(quote_generator.generate_quote(match))
+
+
+class BulkQuoteJob:
+    """
+    Quotes every line of an uploaded spreadsheet in a background thread.
+
+    The file is read in chunks of chunk_rows lines; each chunk is matched
+    with ForkliftMatcher.match_batch and quoted before the next is read, so
+    progress can be polled while the job runs and the caller (the Streamlit
+    script) never blocks on it.
+    """
+
+    def __init__(self, source, name, matcher, quote_generator, chunk_rows: int = CHUNK_ROWS):
+        """
+        Initialize the job
+
+        Args:
+            source: Path or binary file object of the spreadsheet
+            name: File name (its extension selects the format)
+            matcher: Shared ForkliftMatcher
+            quote_generator: Shared QuoteGenerator
+            chunk_rows: Lines per chunk
+        """
+        self.source = source
+        self.name = name
+        self.matcher = matcher
+        self.quote_generator = quote_generator
+        self.chunk_rows = chunk_rows
+        self.results = []
+        self.total = None
+        self.error = None
+        self.done = False
+        self.elapsed = 0.0
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self) -> 'BulkQuoteJob':
+        """Start processing in a background thread"""
+        self._thread = threading.Thread(target=self.run, name='forklift-bulk-quotes', daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop after the chunk in progress"""
+        self._cancelled.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the job to finish; returns True if it has"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+
+    @metrics.timed('bulk_quote')
+    def run(self):
+        """Process the whole file in the calling thread"""
+        start = time.perf_counter()
+        try:
+            self.total = count_rows(self.source, self.name)
+            for chunk in read_lines(self.source, self.name, self.chunk_rows):
+                if self._cancelled.is_set():
+                    break
+                results = quote_lines(chunk, self.matcher, self.quote_generator)
+                with self._lock:
+                    self.results.extend(results)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self.done = True
+
+    def progress(self) -> Dict:
+        """
+        Get the job's progress
+
+        Returns:
+            Dictionary with 'processed', 'quoted' and 'failed' line counts, the
+            estimated 'total' (None until known), 'fraction' (0-1), 'done',
+            'error' and 'elapsed' seconds
+        """
+        with self._lock:
+            processed = len(self.results)
+            quoted = sum(1 for r in self.results if r['success'])
+        if self.done:
+            fraction = 1.0
+        elif self.total:
+            fraction = min(processed / self.total, 0.99)
+        else:
+            fraction = 0.0
+        return {
+            'processed': processed,
+            'quoted': quoted,
+            'failed': processed - quoted,
+            'total': self.total,
+            'fraction': fraction,
+            'done': self.done,
+            'error': self.error,
+            'elapsed': self.elapsed,
+        }
+
+    def quotes(self) -> List[Dict]:
+        """Formatted quotes of the lines quoted so far, in file order"""
+        with self._lock:
+            return [r['formatted_quote'] for r in self.results if r['success']]
+
+    def combined_html(self, title: Optional[str] = None) -> str:
+        """All quotes as one printable HTML document, one quote per page"""
+        return render_combined(self.quotes(), title or f"Forklift Rental Quotes - {self.name}")
+
+    def archive(self, fmt: str = 'html', render_pool=None) -> Iterator[bytes]:
+        """
+        Stream the quotes as a ZIP of one document per line (see src.archive.stream_archive)
+
+        Args:
+            fmt: 'html' or 'pdf'
+            render_pool: Optional RenderPool to render on
+
+        Returns:
+            Iterator over the archive's byte chunks
+        """
+        quotes = [{'success': True, 'formatted_quote': quote} for quote in self.quotes()]
+        return stream_archive(quotes, fmt, render_pool)
+
+    def summary_csv(self) -> str:
+        """One CSV row per spreadsheet line with its quote number, model and total, or the error"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['line', 'reference', 'status', 'quote', 'model', 'total', 'message'])
+        with self._lock:
+            results = list(self.results)
+        for r in results:
+            quote_title = r['formatted_quote']['title'] if r['success'] else ''
+            writer.writerow([
+                r['line'], r['reference'], 'quoted' if r['success'] else 'failed',
+                quote_title.split('#')[-1].strip() if '#' in quote_title else quote_title,
+                r['model'] or '', f"{r['total_cents'] / 100:.2f}" if r['success'] else '', r['message'],
+            ])
+        return buffer.getvalue()
@@ -0,0 +1,95 @@
+import html
+import sys
+from typing import Dict, Iterator
+
+ROLES = ('assistant', 'user')
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+_MESSAGE_CLASSES = ('assistant-message', 'user-message')
+
+
+class ChatHistory:
+    """
+    Compact, append-only chat transcript.
+
+    Roles are kept as one byte per message and repeated texts (questions,
+    confirmations) are interned, so a long session costs little memory.
+    Rendering works on index ranges, so the UI can draw the recent window
+    and one page of older turns without walking the whole history.
+
+    Messages are read and appended as {'role', 'content'} dictionaries, like
+    the list this replaces.
+    """
+
+    def __init__(self):
+        """Initialize an empty history"""
+        self._roles = bytearray()
+        self._contents = []
+
+    def __len__(self):
+        return len(self._contents)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return {'role': ROLES[self._roles[index]], 'content': self._contents[index]}
+
+    def append(self, message: Dict):
+        """
+        Add a message
+
+        Args:
+            message: Dictionary with 'role' ('assistant' or 'user') and 'content'
+        """
+        self._roles.append(_ROLE_CODES[message['role']])
+        self._contents.append(sys.intern(str(message['content'])))
+
+    def page_count(self, page_size: int, exclude_recent: int = 0) -> int:
+        """
+        Number of pages of older messages
+
+        Args:
+            page_size: Messages per page
+            exclude_recent: Most recent messages left out (shown separately)
+
+        Returns:
+            Page count (0 when there are no older messages)
+        """
+        older = max(0, len(self) - exclude_recent)
+        return -(-older // page_size)
+
+    def page_range(self, page: int, page_size: int, exclude_recent: int = 0):
+        """
+        Index range of a page of older messages, page 1 being the oldest
+
+        Args:
+            page: 1-based page number
+            page_size: Messages per page
+            exclude_recent: Most recent messages left out (shown separately)
+
+        Returns:
+            Tuple of (start, stop) indices
+        """
+        older = max(0, len(self) - exclude_recent)
+        start = min(older, max(0, (page - 1) * page_size))
+        return start, min(older, start + page_size)
+
+    def render_html(self, start: int = 0, stop=None) -> str:
+        """
+        Render a range of messages as chat bubbles in one HTML string
+
+        Args:
+            start: First message index
+            stop: End index (defaults to the end of the history)
+
+        Returns:
+            HTML markup with one escaped div per message
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        return ''.join(
+            f'<div class="chat-message {_MESSAGE_CLASSES[self._roles[i]]}">{html.escape(self._contents[i])}</div>'
+            for i in range(max(0, start), stop)
+        )
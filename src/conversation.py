@@ -47,6 +47,7 @@ class ConversationManager:
         # Track the state of the conversation
         self.current_question_index = 0
         self.answered_questions = {}
+        self.raw_answers = {}
         self.conversation_complete = False
     
     def get_current_question(self) -> Dict:
@@ -83,7 +84,7 @@ class ConversationManager:
         
         if is_valid:
             # Store the answer
-            self.answered_questions[question_id] = self._normalize_answer(question_id, answer)
+            self._store_answer(question_id, answer)
             
             # Move to the next question
             self.current_question_index += 1
@@ -105,13 +106,113 @@ class ConversationManager:
             return True, f"Thank you. {next_question_text}"
         else:
             # Return an error message
-            if 'follow_up' in current_question:
-                return False, f"Invalid input. {current_question['follow_up']}"
-            elif 'options' in current_question:
-                options_str = ', '.join(current_question['options'])
-                return False, f"Invalid input. Please select one of: {options_str}"
+            return False, self._invalid_message(current_question)
+    
+    def edit_answer(self, question_id: str, answer: str) -> Tuple[bool, str]:
+        """
+        Change the answer to a question already answered, without re-asking the others
+        
+        Args:
+            question_id: ID of the question to change
+            answer: The user's new answer
+            
+        Returns:
+            Tuple containing:
+            - Boolean indicating if the answer is valid
+            - String with feedback (error message or confirmation)
+        """
+        question = next((q for q in self.questions if q['id'] == question_id), None)
+        if question is None:
+            return False, f"Unknown question: {question_id}."
+        if question_id not in self.raw_answers:
+            return False, "That question has not been answered yet."
+        if not question['validation'](answer):
+            return False, self._invalid_message(question)
+        
+        changed = self._store_answer(question_id, answer)
+        if not changed:
+            return True, "That matches your previous answer, so nothing has changed."
+        return True, f"Updated: {question['question']} {answer}"
+    
+    def answer_all(self, answers: Dict[str, str]) -> List[str]:
+        """
+        Answer every question at once, e.g. from a spreadsheet row
+        
+        Blank answers to optional questions are skipped, and answers to
+        questions with options are matched case-insensitively.
+        
+        Args:
+            answers: Answer text per question ID
+            
+        Returns:
+            Error messages for missing or invalid answers; empty when the
+            conversation is complete
+        """
+        errors = []
+        for question in self.questions:
+            answer = str(answers.get(question['id']) or '').strip()
+            if 'options' in question:
+                answer = answer.lower()
+            if not answer:
+                if question['required']:
+                    errors.append(f"Missing answer: {question['question']}")
+                continue
+            if not question['validation'](answer):
+                errors.append(f"{question['question']} {self._invalid_message(question)}")
+                continue
+            self._store_answer(question['id'], answer)
+        
+        self.current_question_index = len(self.questions)
+        self.conversation_complete = not errors
+        return errors
+    
+    def get_answer(self, question_id: str) -> Optional[str]:
+        """Get the answer as the user typed it, or None if not answered"""
+        return self.raw_answers.get(question_id)
+    
+    def answered(self) -> List[Dict]:
+        """Get the questions answered so far, in question order"""
+        return [q for q in self.questions if q['id'] in self.raw_answers]
+    
+    def _store_answer(self, question_id: str, answer: str) -> List[str]:
+        """
+        Store a valid answer and the requirement fields derived from it
+        
+        Args:
+            question_id: ID of the question
+            answer: The user's answer
+            
+        Returns:
+            Requirement fields whose value changed
+        """
+        previous = dict(self.answered_questions)
+        self.raw_answers[question_id] = answer
+        self.answered_questions[question_id] = self._normalize_answer(question_id, answer)
+        
+        # Fleet orders such as "3 for 2 weeks and 3 for 3 months" also record
+        # the quantity per period; the rental period becomes the longest one
+        if question_id == 'rental_period':
+            unit_periods = self._parse_unit_periods(answer)
+            if unit_periods:
+                self.answered_questions['unit_periods'] = unit_periods
+                self.answered_questions['rental_period'] = max(p['days'] for p in unit_periods)
             else:
-                return False, "Invalid input. Please try again."
+                self.answered_questions.pop('unit_periods', None)
+        
+        return [
+            field for field in dict.fromkeys(list(previous) + list(self.answered_questions))
+            if previous.get(field) != self.answered_questions.get(field)
+        ]
+    
+    def _invalid_message(self, question: Dict) -> str:
+        """Explain what a valid answer to a question looks like"""
+        if 'follow_up' in question:
+            return f"Invalid input. {question['follow_up']}"
+        elif 'options' in question:
+            options_str = ', '.join(question['options'])
+            return f"Invalid input. Please select one of: {options_str}"
+        else:
+            return "Invalid input. Please try again."
     
     def get_requirements(self) -> Dict:
         """
@@ -135,6 +236,7 @@ class ConversationManager:
         """Reset the conversation to start over"""
         self.current_question_index = 0
         self.answered_questions = {}
+        self.raw_answers = {}
         self.conversation_complete = False
     
     def _validate_weight(self, answer: str) -> bool:
@@ -196,6 +298,25 @@ class ConversationManager:
             return True
         return False
     
+    def _parse_unit_periods(self, answer: str) -> List[Dict]:
+        """
+        Parse per-unit rental periods from a fleet order
+        
+        Args:
+            answer: User's rental period input, e.g. "3 for 2 weeks and 3 units for 3 months"
+            
+        Returns:
+            List of {'quantity': n, 'days': d} groups, empty for a single-unit answer
+        """
+        import re
+        groups = []
+        pattern = r'(\d+)\s*(?:x\s*)?(?:[a-z]+\s+)?for\s+(\d+)\s*(day|week|month)s?'
+        for quantity, amount, unit in re.findall(pattern, answer.lower()):
+            days = int(amount) * {'day': 1, 'week': 7, 'month': 30}[unit]
+            if int(quantity) > 0 and days > 0:
+                groups.append({'quantity': int(quantity), 'days': days})
+        return groups
+    
     def _normalize_answer(self, question_id: str, answer: str):
         """
         Normalize the user's answer to a standard format
@@ -1,28 +1,105 @@
+import hashlib
+import numpy as np
 import pandas as pd
 import os
 from pathlib import Path
 import io
 import re
 
+from src.brochures import BrochureStore, excerpt, map_models_to_brochures, summarize
+from src.ingest import CatalogIngestor
+from src.metrics import metrics
+from src.money import daily_rate_cents, line_total_cents, to_dollars
+
 class ForkliftData:
     """
     Class to load and access forklift data from CSV files and brochures
     """
-    def __init__(self, data_dir="data"):
+    def __init__(self, data_dir="data", on_duplicate="last", ingest_workers=None, load_budget=None,
+                 rate_rule=None, rate_overrides=None):
         self.data_dir = Path(data_dir)
         self.specs_df = None
         self.rates_df = None
         self.brochure_content = {}
+        self.brochure_summaries = {}
+        self.catalog_report = None
+        self.brochure_report = None
+        self.brochure_by_model = {}
+        self.search_index = None
+        self.catalog_version = None
+        self._ingestor = CatalogIngestor(self.data_dir, workers=ingest_workers,
+                                         on_duplicate=on_duplicate, budget=load_budget)
+        self._candidate_table = None
+        self._rate_index = None
+        self._rate_curve = None
+        self._model_rates = None
+        self.rate_rule = rate_rule
+        self.rate_overrides = dict(rate_overrides or {})
         self._load_data()
     
+    @metrics.timed('catalog_load')
     def _load_data(self):
         """Load all data sources"""
-        self._load_specs()
-        self._load_rates()
-        self._load_brochures()
+        # Every spec, rate and brochure file under the data directory is parsed in parallel
+        catalog = self._ingestor.load()
+        self.catalog_report = catalog['report']
+        for error in self.catalog_report['errors']:
+            print(f"Error loading {error['source']}: {error['error']}")
+        if self.catalog_report['over_budget']:
+            print(f"Catalog load took {self.catalog_report['elapsed']:.2f}s, over the startup budget")
+        
+        self._load_specs(catalog['specs'])
+        self._load_rates(catalog['rates'])
+        self._load_brochures(catalog['brochures'])
+        self._build_search_index()
+        self.catalog_version = self._catalog_version()
+    
+    def _catalog_version(self):
+        """Short content hash of the specs, rates and brochure mapping; changes whenever a quote could"""
+        digest = hashlib.sha256()
+        for df in (self.specs_df, self.rates_df):
+            digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+            digest.update('|'.join(map(str, df.columns)).encode('utf-8'))
+        digest.update(repr(sorted(self.brochure_by_model.items())).encode('utf-8'))
+        return digest.hexdigest()[:12]
     
-    def _load_specs(self):
-        """Load forklift specifications"""
+    @metrics.timed('search_index_build')
+    def _build_search_index(self):
+        """Index brochure text, spec fields and rate descriptions for full-text search"""
+        from src.search import SearchIndex
+        self.search_index = SearchIndex()
+        self.refresh_search()
+    
+    def refresh_search(self, models=None):
+        """
+        Re-index catalog documents after a change
+        
+        Args:
+            models: Models to re-index (all models if omitted); equipment rows are always re-synced
+        """
+        from src.search import model_document
+        specs = self.specs_df if models is None else self.specs_df[self.specs_df['model'].isin(list(models))]
+        model_rates = self.get_model_rates()
+        for forklift in specs.to_dict('records'):
+            # Brochures are indexed from their summarized search terms, not their full text
+            summary = self.brochure_summaries.get(self.get_brochure_key(forklift['model']))
+            self.search_index.add(
+                f"model:{forklift['model']}",
+                model_document(forklift, '', model_rates['descriptions'][model_rates['index'][forklift['model']]]),
+                {'kind': 'model', 'model': forklift['model']},
+                terms=summary['terms'] if summary else None
+            )
+        
+        descriptions = {str(d).strip() for d in self.rates_df['Equipment Description']}
+        for doc_id in [d for d in self.search_index.ids('equipment') if d[len('rate:'):] not in descriptions]:
+            self.search_index.remove(doc_id)
+        for description in sorted(descriptions):
+            if f"rate:{description}" not in self.search_index:
+                self.search_index.add(f"rate:{description}", description,
+                                      {'kind': 'equipment', 'description': description})
+    
+    def _load_specs(self, sources=None):
+        """Load forklift specifications, merging spec sources over the built-in models"""
         # For this example, we'll extract specs from the brochure PDFs
         # In a real application, you would parse the PDFs or use a dedicated specs CSV
         specs_data = []
@@ -47,27 +124,21 @@ class ForkliftData:
         
         # Create DataFrame from extracted specs
         self.specs_df = pd.DataFrame(specs_data)
+        
+        # Dealer spec sources extend the built-in models and override them by model name
+        if sources is not None and not sources.empty:
+            merged = pd.concat([self.specs_df, sources], ignore_index=True)
+            self.specs_df = merged.drop_duplicates('model', keep='last').reset_index(drop=True)
     
-    def _load_rates(self):
-        """Load rental rates"""
-        try:
-            # Read rates from CSV
-            rates_path = self.data_dir / "Schedule of Rates Example - Sheet1.csv"
-            self.rates_df = pd.read_csv(rates_path)
-            
-            # Clean the data
-            self.rates_df.columns = self.rates_df.columns.str.strip()
-            
-            # Extract and clean rate columns
-            for col in self.rates_df.columns[1:]:  # Skip the first column (Equipment Description)
-                if self.rates_df[col].dtype == object:
-                    # Remove $ and commas, convert to float
-                    self.rates_df[col] = self.rates_df[col].str.replace('$', '', regex=False)
-                    self.rates_df[col] = self.rates_df[col].str.replace(',', '', regex=False)
-                    self.rates_df[col] = self.rates_df[col].str.strip()
-                    self.rates_df[col] = pd.to_numeric(self.rates_df[col], errors='coerce')
-        except Exception as e:
-            print(f"Error loading rates: {e}")
+    def _load_rates(self, rates=None):
+        """Load rental rates from the merged rate sources (re-reading the rate sources if none are given)"""
+        if rates is None:
+            rates = self._ingestor.load(self._rate_sources())['rates']
+        
+        if rates is not None and not rates.empty:
+            self.rates_df = rates
+        else:
+            print(f"Error loading rates: no rate schedule found in {self.data_dir}")
             # Create a fallback rates dataframe
             self.rates_df = pd.DataFrame({
                 "Equipment Description": [
@@ -79,10 +150,17 @@ class ForkliftData:
                 "Weekly Rate (Inc GST) 28+ Days": [140.00, 210.00, 105.00, 126.00, 126.00]
             })
     
-    def _load_brochures(self):
+    def _rate_sources(self):
+        """Table sources that may hold rates: all but those that held none at the last full load"""
+        paths = self._ingestor.scan(tables_only=True)
+        if self.catalog_report is None:
+            return paths
+        no_rates = {source['source'] for source in self.catalog_report['sources'] if not source['rates']}
+        return [path for path in paths if str(path.relative_to(self.data_dir)) not in no_rates]
+    
+    def _load_brochures(self, sources=None):
         """Load brochure content"""
-        # In a real app, you would extract text from PDF files
-        # Here we're simulating with the content we have
+        # Built-in brochure text; PDFs dropped into the data directory are extracted below
         
         # D35-40-45-50-55 series brochure
         self.brochure_content["D35-D55"] = """
@@ -136,71 +214,181 @@ class ForkliftData:
         - Powerful diesel engines
         - Oil-cooled disc brakes
         """
+        
+        # Brochure files (keyed by file name, e.g. "D35-D55.txt") add to or replace the built-in text
+        self.brochure_content.update(sources or {})
+        
+        # Brochure PDFs are extracted into a content-hashed cache; only new or changed files are read.
+        # The catalog only loads their summaries; the full text stays on disk until asked for.
+        self.brochure_store = BrochureStore(self.data_dir)
+        try:
+            self.brochure_report = self.brochure_store.refresh()
+        except OSError as e:
+            self.brochure_report = {'errors': [{'source': str(self.data_dir), 'error': str(e)}]}
+        for error in self.brochure_report['errors']:
+            print(f"Error extracting brochure {error['source']}: {error['error']}")
+        self.brochure_summaries = {key: summarize(text) for key, text in self.brochure_content.items()}
+        for key in self.brochure_store.keys():
+            if key not in self.brochure_summaries:
+                self.brochure_summaries[key] = self.brochure_store.summary(key)
+        
+        # Exact model -> brochure mapping, computed once per catalog
+        self.brochure_by_model = map_models_to_brochures(self.specs_df['model'], self.brochure_summaries)
     
     def get_forklift_by_capacity(self, capacity_tons):
         """Find a forklift model based on capacity requirements"""
+        valid_models = self.get_forklifts_by_capacity(capacity_tons)
+        
+        if valid_models.empty:
+            return None
+        
+        # Return the smallest suitable forklift (most efficient option)
+        return valid_models.iloc[0]
+    
+    @metrics.timed('capacity_lookup')
+    def get_forklifts_by_capacity(self, capacity_tons):
+        """Get all models that meet a capacity requirement, smallest first"""
         # Convert to numeric if it's a string
         if isinstance(capacity_tons, str):
             capacity_tons = float(re.findall(r'\d+\.?\d*', capacity_tons)[0])
         
         # Find models that meet or exceed the capacity requirement
         valid_models = self.specs_df[self.specs_df['capacity_tons'] >= capacity_tons]
+        return valid_models.sort_values('capacity_tons')
+    
+    def reload_rates(self):
+        """
+        Re-read the rate sources and report what changed
         
-        if valid_models.empty:
-            return None
+        Specs and brochures are left as they are, and table files that held no
+        rates at the last full load are not parsed again.
         
-        # Return the smallest suitable forklift (most efficient option)
-        return valid_models.sort_values('capacity_tons').iloc[0]
+        Returns:
+            Row diff from diff_rate_schedules, plus 'models': the changed tiers per forklift model
+        """
+        from src.repricing import changed_model_tiers, diff_rate_schedules
+        old_rates, old_table = self.rates_df, self.get_candidate_table()
+        self._load_rates()
+        self._candidate_table = None
+        self._rate_index = None
+        self._rate_curve = None
+        self._model_rates = None
+        
+        diff = diff_rate_schedules(old_rates, self.rates_df)
+        diff['models'] = changed_model_tiers(old_table, self.get_candidate_table())
+        
+        # Only models priced from a changed row can have a different rate description
+        if self.search_index is not None:
+            self.refresh_search(diff['models'].keys())
+        self.catalog_version = self._catalog_version()
+        return diff
+    
+    def get_rate_index(self):
+        """Get the vectorized index over the full rate schedule, building it on first use"""
+        if self._rate_index is None:
+            from src.pricing import RateIndex
+            self._rate_index = RateIndex(self.rates_df)
+        return self._rate_index
+    
+    def get_candidate_table(self):
+        """Get the precomputed ranking table, building it on first use"""
+        if self._candidate_table is None:
+            from src.ranking import CandidateTable
+            self._candidate_table = CandidateTable(self)
+        return self._candidate_table
+    
+    def indexes_built(self):
+        """Report which lazily built indexes exist, without building any"""
+        return {
+            'rate_index': self._rate_index is not None,
+            'candidate_table': self._candidate_table is not None,
+            'search_index': self.search_index is not None and len(self.search_index) > 0,
+        }
     
+    def get_rate_curve(self):
+        """Get the per-fuel, per-tier pricing curve over the schedule, building it on first use"""
+        if self._rate_curve is None:
+            from src.pricing import RATE_RULE, RateCurve
+            self._rate_curve = RateCurve(self.rates_df, self.rate_rule or RATE_RULE, self.rate_overrides)
+        return self._rate_curve
+    
+    def get_model_rates(self):
+        """
+        Get the tier rates of every model, evaluated on the rate curve once per catalog
+        
+        Returns:
+            RateCurve.evaluate arrays in specs order, plus 'index': the position of each model
+        """
+        if self._model_rates is None:
+            with metrics.span('rate_lookup'):
+                self._model_rates = self.get_rate_curve().evaluate(
+                    self.specs_df['fuel_type'], self.specs_df['capacity_tons'], list(self.specs_df['model'])
+                )
+            self._model_rates['index'] = {model: i for i, model in enumerate(self.specs_df['model'])}
+        return self._model_rates
+    
+    @metrics.timed('rate_lookup')
     def get_rate_for_model(self, model, rental_days):
         """Get the rental rate for a particular model and duration"""
-        # Match model to equipment description
-        capacity_tons = self.specs_df.loc[self.specs_df['model'] == model, 'capacity_tons'].iloc[0]
-        equipment_desc = f"Diesel {capacity_tons}t Forklift"
-        
-        # Find the closest match in rates DataFrame
-        closest_match = None
-        
-        for _, row in self.rates_df.iterrows():
-            desc = row['Equipment Description']
-            if 'Diesel' in desc and 'Forklift' in desc:
-                try:
-                    # Extract tonnage from the description
-                    tonnage = float(re.findall(r'(\d+\.?\d*)t', desc)[0])
-                    if closest_match is None or abs(tonnage - capacity_tons) < abs(closest_match[0] - capacity_tons):
-                        closest_match = (tonnage, row)
-                except (IndexError, ValueError):
-                    continue
-        
-        if closest_match is None:
-            return {
-                "daily": 50.0,   # Default rates if no match found
-                "weekly_short": 280.0,
-                "weekly_long": 200.0
-            }
-        
-        # Determine which rate to apply based on rental duration
-        rate_row = closest_match[1]
-        if rental_days <= 7:
-            rate = rate_row['Daily Rate (Inc GST) 0-7 Days']
-        elif rental_days <= 28:
-            rate = rate_row['Weekly Rate (Inc GST) 8-28 Days'] / 7  # Convert weekly to daily
-        else:
-            rate = rate_row['Weekly Rate (Inc GST) 28+ Days'] / 7  # Convert weekly to daily
+        model_rates = self.get_model_rates()
+        i = model_rates['index'][model]
+        
+        # Determine which rate to apply based on rental duration, in exact cents
+        # (weekly tiers are converted to a daily equivalent; see src.money for rounding)
+        tiers = [int(model_rates[f"{tier}_cents"][i]) for tier in ('daily', 'weekly_short', 'weekly_long')]
+        applied_cents = int(daily_rate_cents(*tiers, rental_days))
+        total_cents = int(line_total_cents(*tiers, rental_days))
         
         return {
-            "daily": float(rate_row['Daily Rate (Inc GST) 0-7 Days']),
-            "weekly_short": float(rate_row['Weekly Rate (Inc GST) 8-28 Days']),
-            "weekly_long": float(rate_row['Weekly Rate (Inc GST) 28+ Days']),
-            "applied_rate": float(rate),
-            "total_cost": float(rate * rental_days)
+            "daily": to_dollars(tiers[0]),
+            "weekly_short": to_dollars(tiers[1]),
+            "weekly_long": to_dollars(tiers[2]),
+            "applied_rate": to_dollars(applied_cents),
+            "total_cost": to_dollars(total_cents),
+            "applied_rate_cents": applied_cents,
+            "total_cost_cents": total_cents
         }
     
+    def get_model_features(self, model):
+        """Get a model's feature bitset from its brochure and any 'features' spec field"""
+        from src.features import parse_features
+        summary = self.brochure_summaries.get(self.get_brochure_key(model))
+        features = np.uint64(summary['features'] if summary else 0)
+        if 'features' in self.specs_df.columns:
+            listed = self.specs_df.loc[self.specs_df['model'] == model, 'features']
+            if not listed.empty:
+                features |= parse_features(listed.iloc[0])
+        return features
+    
+    def get_brochure_key(self, model):
+        """Get the key of the brochure describing a model, or None"""
+        return self.brochure_by_model.get(model)
+    
+    def get_brochure_text(self, key):
+        """Get the full text of a brochure by key, reading extracted PDFs from the cache each time"""
+        if key in self.brochure_content:
+            return self.brochure_content[key]
+        if key in self.brochure_summaries:
+            return self.brochure_store.read(key)
+        return None
+    
     def get_brochure_content(self, model):
         """Get brochure content for a specific model"""
-        if "D35" <= model <= "D55":
-            return self.brochure_content["D35-D55"]
-        elif "D60" <= model <= "D90":
-            return self.brochure_content["D60-D90"]
-        else:
+        text = self.get_brochure_text(self.get_brochure_key(model))
+        if text is None:
             return "Brochure not available for this model."
+        return text
+    
+    def get_brochure_excerpt(self, model, max_chars=None):
+        """Get the leading part of a model's brochure for quotes and documents"""
+        summary = self.brochure_summaries.get(self.get_brochure_key(model))
+        if summary is None:
+            return self.get_brochure_content(model)
+        if max_chars is None:
+            return summary['excerpt']
+        return excerpt(self.get_brochure_content(model), max_chars)
+    
+    def is_brochure_truncated(self, model):
+        """Check whether a model's brochure excerpt leaves out part of the full text"""
+        summary = self.brochure_summaries.get(self.get_brochure_key(model))
+        return summary is not None and len(summary['excerpt']) < summary['length']
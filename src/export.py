@@ -0,0 +1,294 @@
+import argparse
+import datetime
+import itertools
+import os
+import time
+from typing import Dict, Iterable, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    pa = None
+
+# Flattened quote columns and their Arrow types. String columns with few
+# distinct values are dictionary encoded.
+_STRING = 'string'
+_CATEGORY = 'category'
+COLUMNS = [
+    ('quote_number', _STRING),
+    ('date_issued', 'date'),
+    ('model', _CATEGORY),
+    ('series', _CATEGORY),
+    ('fuel_type', _CATEGORY),
+    ('capacity_tons', 'float64'),
+    ('quantity', 'int32'),
+    ('environment', _CATEGORY),
+    ('start_date', 'date'),
+    ('end_date', 'date'),
+    ('days', 'int32'),
+    ('daily_rate', 'float64'),
+    ('total_rental_cost', 'float64'),
+    ('deposit_required', 'float64'),
+    ('line_count', 'int32'),
+]
+
+FORMATS = ('parquet', 'arrow')
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Quote export requires pyarrow (pip install pyarrow)")
+
+
+def quote_schema():
+    """Arrow schema of the exported quote table"""
+    _require_pyarrow()
+    types = {
+        _STRING: pa.string(),
+        _CATEGORY: pa.dictionary(pa.int32(), pa.string()),
+        'date': pa.date32(),
+        'float64': pa.float64(),
+        'int32': pa.int32(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in COLUMNS])
+
+
+class QuoteExporter:
+    """
+    Streaming writer of quotes to Parquet or Arrow IPC files.
+
+    Quotes are flattened into per-column lists and flushed as one record
+    batch every `batch_size` rows, so memory stays bounded regardless of how
+    many quotes are exported. Each exporter writes a new part file inside
+    the target directory; appending a later export adds a part file instead
+    of rewriting existing ones, and the directory reads back as one dataset.
+    """
+
+    def __init__(self, directory: str, fmt: str = 'parquet', batch_size: int = 65536,
+                 row_group_size: Optional[int] = None, compression: str = 'zstd'):
+        """
+        Initialize the exporter
+
+        Args:
+            directory: Dataset directory (created if missing)
+            fmt: 'parquet' or 'arrow' (Arrow IPC file)
+            batch_size: Rows buffered before a record batch is written
+            row_group_size: Parquet row group size (defaults to batch_size)
+            compression: Parquet compression codec
+        """
+        _require_pyarrow()
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        os.makedirs(directory, exist_ok=True)
+
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.row_group_size = row_group_size or batch_size
+        self.compression = compression
+        self.schema = quote_schema()
+        self.path = self._next_part_path(directory)
+        self.rows_written = 0
+
+        self._columns = {name: [] for name, _ in COLUMNS}
+        self._dates = {}
+        self._capacities = {}
+        self._writer = None
+
+    def _next_part_path(self, directory):
+        extension = 'parquet' if self.fmt == 'parquet' else 'arrow'
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        for n in itertools.count(1):
+            path = os.path.join(directory, f"quotes-{stamp}-{n:04d}.{extension}")
+            if not os.path.exists(path):
+                return path
+
+    def write(self, quote_result: Dict):
+        """
+        Add one quote to the export
+
+        Args:
+            quote_result: Result of QuoteGenerator.generate_quote (unsuccessful results are skipped)
+        """
+        if not quote_result.get('success', False):
+            return
+        quote = quote_result['quote']
+        forklift = quote['forklift']
+        rental = quote['rental_period']
+        pricing = quote['pricing']
+
+        columns = self._columns
+        columns['quote_number'].append(quote['quote_number'])
+        columns['date_issued'].append(self._date(quote['date_issued']))
+        columns['model'].append(forklift['model'])
+        columns['series'].append(forklift['series'])
+        columns['fuel_type'].append(forklift['fuel_type'])
+        columns['capacity_tons'].append(self._capacity(forklift['capacity']))
+        columns['quantity'].append(forklift.get('quantity', 1))
+        columns['environment'].append(quote.get('indoor_outdoor', 'both'))
+        columns['start_date'].append(self._date(rental['start_date']))
+        columns['end_date'].append(self._date(rental['end_date']))
+        columns['days'].append(rental['days'])
+        columns['daily_rate'].append(pricing['daily_rate'])
+        columns['total_rental_cost'].append(pricing['total_rental_cost'])
+        columns['deposit_required'].append(pricing['deposit_required'])
+        columns['line_count'].append(len(quote.get('line_items', [])) or 1)
+
+        if len(columns['quote_number']) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, quote_results: Iterable[Dict]) -> int:
+        """
+        Add many quotes to the export
+
+        Args:
+            quote_results: Iterable of generate_quote results
+
+        Returns:
+            Total number of rows written so far (after flushing)
+        """
+        for quote_result in quote_results:
+            self.write(quote_result)
+        self.flush()
+        return self.rows_written
+
+    def _date(self, text):
+        # Quotes carry display dates; only a handful of distinct values occur per export
+        value = self._dates.get(text)
+        if value is None:
+            value = self._dates[text] = datetime.datetime.strptime(text, '%d %B %Y').date()
+        return value
+
+    def _capacity(self, text):
+        value = self._capacities.get(text)
+        if value is None:
+            value = self._capacities[text] = float(str(text).split()[0])
+        return value
+
+    def flush(self):
+        """Write buffered rows as one record batch"""
+        rows = len(self._columns['quote_number'])
+        if rows == 0:
+            return
+
+        arrays = []
+        for field, (name, kind) in zip(self.schema, COLUMNS):
+            if kind == _CATEGORY:
+                arrays.append(pa.array(self._columns[name], type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(self._columns[name], type=field.type))
+            self._columns[name] = []
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+        if self._writer is None:
+            if self.fmt == 'parquet':
+                self._writer = pq.ParquetWriter(
+                    self.path, self.schema, compression=self.compression,
+                    use_dictionary=[name for name, kind in COLUMNS if kind == _CATEGORY]
+                )
+            else:
+                self._writer = ipc.new_file(self.path, self.schema)
+
+        if self.fmt == 'parquet':
+            self._writer.write_batch(batch, row_group_size=self.row_group_size)
+        else:
+            self._writer.write_batch(batch)
+        self.rows_written += rows
+
+    def close(self) -> Optional[str]:
+        """
+        Flush remaining rows and finish the part file
+
+        Returns:
+            Path of the written file, or None if no rows were exported
+        """
+        self.flush()
+        if self._writer is None:
+            return None
+        self._writer.close()
+        self._writer = None
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_quotes(quote_results: Iterable[Dict], directory: str, fmt: str = 'parquet', **kwargs) -> Optional[str]:
+    """
+    Export quotes to a new part file in a dataset directory
+
+    Args:
+        quote_results: Iterable of generate_quote results
+        directory: Dataset directory
+        fmt: 'parquet' or 'arrow'
+        **kwargs: QuoteExporter options
+
+    Returns:
+        Path of the written file, or None if no rows were exported
+    """
+    exporter = QuoteExporter(directory, fmt, **kwargs)
+    exporter.write_many(quote_results)
+    return exporter.close()
+
+
+def read_quotes(directory: str, fmt: str = 'parquet'):
+    """
+    Read every part file of an export directory as one Arrow table
+
+    Args:
+        directory: Dataset directory
+        fmt: 'parquet' or 'arrow'
+
+    Returns:
+        pyarrow.Table
+    """
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+    return ds.dataset(directory, format='parquet' if fmt == 'parquet' else 'ipc', schema=quote_schema()).to_table()
+
+
+def main(argv=None):
+    """Export synthetic quotes, e.g. to size row groups or time the exporter"""
+    parser = argparse.ArgumentParser(description="Export quotes to Parquet or Arrow IPC")
+    parser.add_argument('directory', help="Dataset directory")
+    parser.add_argument('--format', choices=FORMATS, default='parquet')
+    parser.add_argument('--quotes', type=int, default=100000, help="Number of synthetic quotes")
+    parser.add_argument('--batch-size', type=int, default=65536)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import random
+    from src.data_loader import ForkliftData
+    from src.matcher import ForkliftMatcher
+    from src.quote import QuoteGenerator
+
+    data = ForkliftData()
+    matcher = ForkliftMatcher(data)
+    quote_generator = QuoteGenerator(data)
+    rng = random.Random(args.seed)
+
+    # Quote a small pool of inquiries and replicate them to the requested volume
+    pool = []
+    for _ in range(64):
+        requirements = {
+            'load_weight': round(rng.uniform(0.5, 6.0), 1),
+            'rental_period': rng.choice([1, 3, 7, 14, 21, 30, 60, 90]),
+            'indoor_outdoor': rng.choice(['indoor', 'outdoor', 'both']),
+            'special_requirements': 'none',
+        }
+        quote_result = quote_generator.generate_quote(matcher.match_forklift(requirements))
+        if quote_result.get('success', False):
+            pool.append(quote_result)
+
+    start = time.perf_counter()
+    path = export_quotes((pool[i % len(pool)] for i in range(args.quotes)), args.directory,
+                         args.format, batch_size=args.batch_size)
+    print(f"Exported {args.quotes} quotes to {path} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import re
+from typing import List
+
+import numpy as np
+
+# Fixed feature vocabulary; a feature's bit is its position in this list.
+# Each pattern matches the ways customers and brochures describe it.
+FEATURES = [
+    ('side_shift', r'side[\s-]*shift'),
+    ('fork_positioner', r'fork[\s-]*position(?:er|ing)'),
+    ('weight_scale', r'weigh(?:t|ing)[\s-]*scale|load[\s-]*weigh'),
+    ('cab', r'\bcab(?:in)?\b'),
+    ('non_marking_tyres', r'non[\s-]*marking'),
+    ('pneumatic_tyres', r'pneumatic'),
+    ('solid_tyres', r'solid[\s-]*(?:tyre|tire)s?|cushion[\s-]*(?:tyre|tire)s?'),
+    ('container_mast', r'container[\s-]*mast|triple[\s-]*mast|full[\s-]*free[\s-]*lift'),
+    ('oil_cooled_brakes', r'oil[\s-]*cooled[\s-]*(?:disc[\s-]*)?brakes?'),
+    ('operator_sensing', r'operator[\s-]*sensing|\boss\b'),
+    ('backup_alarm', r'back[\s-]*up[\s-]*alarm|reverse[\s-]*alarm|reversing[\s-]*beeper'),
+    ('rear_view_mirror', r'rear[\s-]*view[\s-]*mirror'),
+    ('suspension_seat', r'suspen(?:ded|sion)[\s-]*seat'),
+    ('tilt_steering', r'tilt(?:able)?[\s-]*steering'),
+    ('jib_attachment', r'\bjib\b'),
+    ('rotator', r'\brotator\b'),
+]
+
+FEATURE_BITS = {name: np.uint64(1) << np.uint64(i) for i, (name, _) in enumerate(FEATURES)}
+_PATTERNS = [(FEATURE_BITS[name], re.compile(pattern, re.IGNORECASE)) for name, pattern in FEATURES]
+
+
+def parse_features(text) -> np.uint64:
+    """
+    Parse free text into a feature bitset
+
+    Args:
+        text: Special requirements answer, brochure text or a spec 'features' field
+
+    Returns:
+        Bitset with one bit per recognised feature
+    """
+    mask = np.uint64(0)
+    if not text or not isinstance(text, str):
+        return mask
+    for bit, pattern in _PATTERNS:
+        if pattern.search(text):
+            mask |= bit
+    return mask
+
+
+def feature_names(mask) -> List[str]:
+    """Names of the features set in a bitset, in vocabulary order"""
+    mask = np.uint64(mask)
+    return [name for name, _ in FEATURES if mask & FEATURE_BITS[name]]
+
+
+def covers(model_features, required) -> np.ndarray:
+    """
+    Check which models have every required feature
+
+    Args:
+        model_features: Bitset per model (array)
+        required: Required bitset, or one per inquiry as a column (n, 1)
+
+    Returns:
+        Boolean array broadcast over models (and inquiries)
+    """
+    required = np.asarray(required, dtype=np.uint64)
+    return (np.asarray(model_features, dtype=np.uint64) & required) == required
@@ -5,35 +5,27 @@ from datetime import datetime
 import webbrowser
 from pathlib import Path
 import html
+from typing import Dict, Iterable, List, Optional, Tuple
 
-class PDFGenerator:
-    """
-    Generates PDF files for forklift rental quotes using HTML
-    """
-    
-    def __init__(self, quote_info):
-        """
-        Initialize with quote information
-        
-        Args:
-            quote_info: Dictionary with formatted quote information
-        """
-        self.quote_info = quote_info
-        
-    def get_html_string(self):
-        """
-        Generate HTML representation of the quote
-        
-        Returns:
-            HTML string
+from src.metrics import metrics
+
+# Document sections in page order; each renders to an independent HTML fragment
+SECTIONS = [
+    'header', 'model_info', 'rental_info', 'line_items_info', 'pricing_info',
+    'recommendations', 'safety_info', 'terms', 'brochure',
+]
+
+_DOCUMENT_FOOT = """
+            <div class="no-print">
+                <p>To print this quote, please use your browser's print functionality.</p>
+            </div>
+        </body>
+        </html>
         """
-        if not self.quote_info.get('success', False):
-            return None
-            
-        formatted_quote = self.quote_info['formatted_quote']
-        
-        # Start HTML content
-        html_content = f"""
+
+
+def _document_head(formatted_quote):
+    return f"""
         <!DOCTYPE html>
         <html>
         <head>
@@ -95,130 +87,157 @@ class PDFGenerator:
             </style>
         </head>
         <body>
-            <div class="header">
-                <h1>Bobcat Forklift Rentals</h1>
-                <h2>{formatted_quote['title']}</h2>
-                <div class="date">{formatted_quote['date']}</div>
-            </div>
         """
-        
-        # Add Forklift Model Information
-        html_content += f"""
-            <div class="section">
-                <h2>{formatted_quote['model_info']['title']}</h2>
-                <table>
-                    <tr>
-                        <th>Item</th>
-                        <th>Value</th>
-                    </tr>
-        """
-        
-        for item in formatted_quote['model_info']['items']:
-            html_content += f"""
+
+
+def _table_section(section, value_heading='Value'):
+    rows = ''.join(
+        f"""
                     <tr>
                         <td>{html.escape(item['label'])}</td>
                         <td>{html.escape(str(item['value']))}</td>
                     </tr>
             """
-            
-        html_content += """
-                </table>
-            </div>
-        """
-        
-        # Add Rental Information
-        html_content += f"""
+        for item in section['items']
+    )
+    return f"""
             <div class="section">
-                <h2>{formatted_quote['rental_info']['title']}</h2>
+                <h2>{section['title']}</h2>
                 <table>
                     <tr>
                         <th>Item</th>
-                        <th>Value</th>
-                    </tr>
-        """
-        
-        for item in formatted_quote['rental_info']['items']:
-            html_content += f"""
-                    <tr>
-                        <td>{html.escape(item['label'])}</td>
-                        <td>{html.escape(str(item['value']))}</td>
+                        <th>{value_heading}</th>
                     </tr>
-            """
-            
-        html_content += """
+                    {rows}
                 </table>
             </div>
         """
-        
-        # Add Pricing Information
-        html_content += f"""
+
+
+def _text_section(section):
+    # Multi-line texts (terms, brochure) keep their line breaks
+    text_html = html.escape(section['text']).replace("\n", "<br>")
+    return f"""
             <div class="section">
-                <h2>{formatted_quote['pricing_info']['title']}</h2>
-                <table>
-                    <tr>
-                        <th>Item</th>
-                        <th>Value</th>
-                    </tr>
-        """
-        
-        for item in formatted_quote['pricing_info']['items']:
-            html_content += f"""
-                    <tr>
-                        <td>{html.escape(item['label'])}</td>
-                        <td>{html.escape(str(item['value']))}</td>
-                    </tr>
-            """
-            
-        html_content += """
-                </table>
+                <h2>{section['title']}</h2>
+                <p>{text_html}</p>
             </div>
         """
+
+
+def render_section(formatted_quote: Dict, name: str) -> str:
+    """
+    Render one section of a formatted quote as an HTML fragment
+    
+    Args:
+        formatted_quote: Formatted quote from QuoteGenerator.format_quote_for_display
+        name: Section name from SECTIONS
         
-        # Add Recommendations and Safety Information
-        html_content += f"""
-            <div class="section">
-                <h2>{formatted_quote['recommendations']['title']}</h2>
-                <p>{html.escape(formatted_quote['recommendations']['text'])}</p>
-            </div>
-            
-            <div class="section">
-                <h2>{formatted_quote['safety_info']['title']}</h2>
-                <p>{html.escape(formatted_quote['safety_info']['text'])}</p>
+    Returns:
+        HTML fragment (empty for a section with nothing to show)
+    """
+    if name == 'header':
+        return f"""
+            <div class="header">
+                <h1>Bobcat Forklift Rentals</h1>
+                <h2>{formatted_quote['title']}</h2>
+                <div class="date">{formatted_quote['date']}</div>
             </div>
         """
+    section = formatted_quote.get(name, {})
+    if name == 'line_items_info':
+        # Only multi-item quotes list their lines
+        return _table_section(section, 'Amount') if section.get('items') else ''
+    if 'items' in section:
+        return _table_section(section)
+    return _text_section(section)
+
+
+def section_content(formatted_quote: Dict, name: str):
+    """Formatted data a section is rendered from (the header uses the title and date)"""
+    if name == 'header':
+        return formatted_quote['title'], formatted_quote['date']
+    return formatted_quote.get(name)
+
+
+def render_sections(formatted_quote: Dict, previous: Optional[Dict] = None,
+                    previous_fragments: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Render the sections of a formatted quote, reusing unchanged fragments
+    
+    Args:
+        formatted_quote: Formatted quote to render
+        previous: Formatted quote the previous fragments were rendered from
+        previous_fragments: Fragments rendered from previous
         
-        # Add Terms and Conditions - Fix the backslash issue by using a function
-        terms_text = formatted_quote['terms']['text']
-        terms_text_html = html.escape(terms_text).replace("\n", "<br>")
+    Returns:
+        Tuple of (fragments by section name, names of the sections re-rendered)
+    """
+    fragments, changed = {}, []
+    for name in SECTIONS:
+        if (previous is not None and previous_fragments and name in previous_fragments
+                and section_content(previous, name) == section_content(formatted_quote, name)):
+            fragments[name] = previous_fragments[name]
+        else:
+            fragments[name] = render_section(formatted_quote, name)
+            changed.append(name)
+    return fragments, changed
+
+
+def render_combined(formatted_quotes: Iterable[Dict], title: str = 'Forklift Rental Quotes') -> str:
+    """
+    Render several quotes as one printable HTML document, each starting on a new page
+    
+    Args:
+        formatted_quotes: Formatted quotes in document order
+        title: Document title
         
-        html_content += f"""
-            <div class="section">
-                <h2>{formatted_quote['terms']['title']}</h2>
-                <p>{terms_text_html}</p>
-            </div>
+    Returns:
+        HTML string
+    """
+    pages = (''.join(render_section(formatted_quote, name) for name in SECTIONS)
+             for formatted_quote in formatted_quotes)
+    return (_document_head({'title': html.escape(title)})
+            + '<div style="page-break-before: always;"></div>'.join(pages)
+            + _DOCUMENT_FOOT)
+
+
+class PDFGenerator:
+    """
+    Generates PDF files for forklift rental quotes using HTML
+    """
+    
+    def __init__(self, quote_info):
         """
+        Initialize with quote information
         
-        # Add Specifications - Fix the backslash issue by using a function
-        brochure_text = formatted_quote['brochure']['text']
-        brochure_text_html = html.escape(brochure_text).replace("\n", "<br>")
-        
-        html_content += f"""
-            <div class="section">
-                <h2>{formatted_quote['brochure']['title']}</h2>
-                <p>{brochure_text_html}</p>
-            </div>
+        Args:
+            quote_info: Dictionary with formatted quote information
         """
+        self.quote_info = quote_info
         
-        # Close HTML
-        html_content += """
-            <div class="no-print">
-                <p>To print this quote, please use your browser's print functionality.</p>
-            </div>
-        </body>
-        </html>
+    @metrics.timed('render_html')
+    def get_html_string(self, fragments: Optional[Dict[str, str]] = None):
         """
+        Generate HTML representation of the quote
+        
+        Args:
+            fragments: Optional pre-rendered section fragments (see render_sections);
+                sections missing from it are rendered here
         
-        return html_content
+        Returns:
+            HTML string
+        """
+        if not self.quote_info.get('success', False):
+            return None
+            
+        formatted_quote = self.quote_info['formatted_quote']
+        fragments = fragments or {}
+        body = ''.join(
+            fragments[name] if name in fragments else render_section(formatted_quote, name)
+            for name in SECTIONS
+        )
+        return _document_head(formatted_quote) + body + _DOCUMENT_FOOT
     
     def generate_html_file(self):
         """
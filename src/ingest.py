@@ -0,0 +1,305 @@
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from src.metrics import metrics
+from src.pricing import DAILY_COLUMN, FUEL_TYPES, WEEKLY_LONG_COLUMN, WEEKLY_SHORT_COLUMN, rate_key
+
+SPEC_COLUMNS = ['model', 'capacity_kg', 'capacity_tons', 'load_center_mm', 'fuel_type', 'series']
+RATE_COLUMNS = ['Equipment Description', DAILY_COLUMN, WEEKLY_SHORT_COLUMN, WEEKLY_LONG_COLUMN]
+
+# Normalized header -> canonical spec column
+SPEC_ALIASES = {
+    'model_number': 'model', 'model_name': 'model',
+    'capacity': 'capacity_tons', 'capacity_t': 'capacity_tons', 'capacity_tonnes': 'capacity_tons',
+    'capacity_tons': 'capacity_tons', 'rated_capacity_kg': 'capacity_kg', 'capacity_kg': 'capacity_kg',
+    'load_centre_mm': 'load_center_mm', 'load_center': 'load_center_mm', 'load_centre': 'load_center_mm',
+    'fuel': 'fuel_type', 'power': 'fuel_type', 'power_type': 'fuel_type',
+}
+
+# Normalized header -> canonical rate column
+RATE_ALIASES = {
+    'description': 'Equipment Description', 'equipment': 'Equipment Description',
+    'equipment_description': 'Equipment Description',
+    'daily_rate_inc_gst_0_7_days': DAILY_COLUMN, 'daily_rate': DAILY_COLUMN, 'daily': DAILY_COLUMN,
+    'weekly_rate_inc_gst_8_28_days': WEEKLY_SHORT_COLUMN, 'weekly_short': WEEKLY_SHORT_COLUMN,
+    'weekly_rate_8_28_days': WEEKLY_SHORT_COLUMN,
+    'weekly_rate_inc_gst_28_days': WEEKLY_LONG_COLUMN, 'weekly_long': WEEKLY_LONG_COLUMN,
+    'weekly_rate_28_days': WEEKLY_LONG_COLUMN,
+}
+
+DUPLICATE_POLICIES = ('last', 'first', 'error')
+
+# Plain-text brochures are only read from this directory under the data directory,
+# so notes and READMEs elsewhere are not mistaken for brochures
+BROCHURE_DIR = 'brochures'
+TEXT_EXTENSIONS = ('.txt', '.md')
+
+
+def _normalize_header(name) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', str(name).strip().lower()).strip('_')
+
+
+def clean_money(series: pd.Series) -> pd.Series:
+    """Convert "$ 1,234.00"-style text to floats (non-numeric values become NaN)"""
+    if series.dtype != object and not pd.api.types.is_string_dtype(series):
+        return pd.to_numeric(series, errors='coerce')
+    text = series.astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False).str.strip()
+    return pd.to_numeric(text, errors='coerce')
+
+
+def normalize_specs(frame: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """
+    Map a spec table onto the catalog schema
+
+    Args:
+        frame: Raw table with model and capacity columns under any known header
+
+    Returns:
+        DataFrame with SPEC_COLUMNS, or None if the table is not a spec table
+    """
+    renamed = {}
+    for column in frame.columns:
+        header = _normalize_header(column)
+        renamed[column] = SPEC_ALIASES.get(header, header)
+    frame = frame.rename(columns=renamed)
+    frame = frame.loc[:, ~frame.columns.duplicated()]
+    if 'model' not in frame.columns or not ({'capacity_kg', 'capacity_tons'} & set(frame.columns)):
+        return None
+
+    specs = pd.DataFrame({'model': frame['model'].astype(str).str.strip()})
+    kg = pd.to_numeric(frame['capacity_kg'], errors='coerce') if 'capacity_kg' in frame else None
+    tons = pd.to_numeric(frame['capacity_tons'], errors='coerce') if 'capacity_tons' in frame else None
+    specs['capacity_tons'] = tons if tons is not None else kg / 1000
+    specs['capacity_kg'] = kg if kg is not None else tons * 1000
+    if kg is not None and tons is not None:
+        specs['capacity_tons'] = specs['capacity_tons'].fillna(kg / 1000)
+        specs['capacity_kg'] = specs['capacity_kg'].fillna(tons * 1000)
+    specs['load_center_mm'] = (pd.to_numeric(frame['load_center_mm'], errors='coerce')
+                               if 'load_center_mm' in frame else 500)
+    fuel = frame['fuel_type'].astype(str).str.strip() if 'fuel_type' in frame else pd.Series('Diesel', index=frame.index)
+    specs['fuel_type'] = fuel.map(lambda f: FUEL_TYPES.get(f.lower(), f))
+    specs['series'] = frame['series'].astype(str).str.strip() if 'series' in frame else ''
+    if 'features' in frame:
+        # Free-text feature lists are parsed into bitsets when the catalog is indexed
+        specs['features'] = frame['features'].fillna('').astype(str)
+
+    specs = specs[(specs['model'] != '') & specs['capacity_tons'].notna()]
+    specs['capacity_kg'] = specs['capacity_kg'].round().astype(int)
+    return specs[SPEC_COLUMNS + (['features'] if 'features' in specs else [])].reset_index(drop=True)
+
+
+def normalize_rates(frame: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """
+    Map a rate table onto the rate schedule schema
+
+    Args:
+        frame: Raw table with a description column and the three tier columns
+
+    Returns:
+        DataFrame with RATE_COLUMNS and numeric rates, or None if the table is not a rate table
+    """
+    renamed = {}
+    for column in frame.columns:
+        stripped = str(column).strip()
+        renamed[column] = stripped if stripped in RATE_COLUMNS else RATE_ALIASES.get(_normalize_header(column), stripped)
+    frame = frame.rename(columns=renamed)
+    frame = frame.loc[:, ~frame.columns.duplicated()]
+    if not set(RATE_COLUMNS) <= set(frame.columns):
+        return None
+
+    rates = pd.DataFrame({'Equipment Description': frame['Equipment Description'].astype(str)})
+    for column in RATE_COLUMNS[1:]:
+        rates[column] = clean_money(frame[column])
+    rates = rates[rates['Equipment Description'].str.strip() != '']
+    return rates.reset_index(drop=True)
+
+
+def _read_csv(path: Path) -> Dict:
+    return {'tables': [pd.read_csv(path)]}
+
+
+def _read_excel(path: Path) -> Dict:
+    # Requires openpyxl; a missing engine is reported as a source error
+    return {'tables': list(pd.read_excel(path, sheet_name=None).values())}
+
+
+def _read_json(path: Path) -> Dict:
+    with open(path) as f:
+        content = json.load(f)
+    if isinstance(content, list):
+        return {'tables': [pd.DataFrame(content)]}
+    tables = [pd.DataFrame(content[key]) for key in ('specs', 'rates') if content.get(key)]
+    return {'tables': tables, 'brochures': dict(content.get('brochures', {}))}
+
+
+def _read_text(path: Path) -> Dict:
+    return {'tables': [], 'brochures': {path.stem: path.read_text()}}
+
+
+# File extension -> reader returning {'tables': [DataFrame], 'brochures': {key: text}}
+READERS: Dict[str, Callable[[Path], Dict]] = {
+    '.csv': _read_csv,
+    '.xlsx': _read_excel,
+    '.xls': _read_excel,
+    '.json': _read_json,
+    '.txt': _read_text,
+    '.md': _read_text,
+}
+
+
+def register_reader(extension: str, reader: Callable[[Path], Dict]):
+    """
+    Add or replace the reader for a file extension
+
+    Args:
+        extension: Extension including the dot, e.g. '.parquet'
+        reader: Callable taking a Path and returning {'tables': [...], 'brochures': {...}}
+    """
+    READERS[extension.lower()] = reader
+
+
+class CatalogIngestor:
+    """
+    Scans a data directory for spec, rate and brochure sources, parses them
+    in parallel and merges them into one normalized catalog.
+
+    Tables are classified by their columns, so a source may live anywhere
+    under the directory and a workbook may mix spec and rate sheets; text
+    brochures are read from the brochures/ subdirectory only. Files
+    merge in path order; when a model or rate row appears more than once,
+    the duplicate policy decides which copy is kept.
+    """
+
+    def __init__(self, data_dir, workers: Optional[int] = None, on_duplicate: str = 'last',
+                 budget: Optional[float] = None):
+        """
+        Initialize the ingestor
+
+        Args:
+            data_dir: Directory to scan (recursively)
+            workers: Parser threads (defaults to min(8, CPU count))
+            on_duplicate: 'last' (later files win), 'first', or 'error'
+            budget: Optional startup budget in seconds; overruns are reported
+        """
+        if on_duplicate not in DUPLICATE_POLICIES:
+            raise ValueError(f"Unsupported duplicate policy: {on_duplicate}")
+        self.data_dir = Path(data_dir)
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.on_duplicate = on_duplicate
+        self.budget = budget
+
+    def scan(self, tables_only: bool = False) -> List[Path]:
+        """
+        List the readable source files under the data directory, in path order
+
+        Args:
+            tables_only: Skip text brochures (for reloads that only need tables)
+
+        Returns:
+            List of paths
+        """
+        if not self.data_dir.is_dir():
+            return []
+        return sorted(
+            path for path in self.data_dir.rglob('*')
+            if path.is_file() and path.suffix.lower() in READERS
+            and not any(part.startswith('.') for part in path.relative_to(self.data_dir).parts)
+            and (path.suffix.lower() not in TEXT_EXTENSIONS
+                 or (not tables_only and path.relative_to(self.data_dir).parts[0] == BROCHURE_DIR))
+        )
+
+    def _parse(self, path: Path) -> Dict:
+        try:
+            parsed = READERS[path.suffix.lower()](path)
+        except Exception as e:
+            return {'path': path, 'error': f"{type(e).__name__}: {e}"}
+
+        specs, rates = [], []
+        for table in parsed.get('tables', []):
+            normalized = normalize_specs(table)
+            if normalized is not None:
+                specs.append(normalized)
+                continue
+            normalized = normalize_rates(table)
+            if normalized is not None:
+                rates.append(normalized)
+        return {'path': path, 'specs': specs, 'rates': rates, 'brochures': parsed.get('brochures', {})}
+
+    @metrics.timed('catalog_ingest')
+    def load(self, paths: Optional[List[Path]] = None) -> Dict:
+        """
+        Parse and merge every source
+
+        Args:
+            paths: Only parse these sources (defaults to scan())
+
+        Returns:
+            Dictionary with 'specs' and 'rates' DataFrames (None if no source of that kind),
+            'brochures' mapping, and a 'report' with sources, errors, duplicates and timing
+        """
+        start = time.perf_counter()
+        paths = self.scan() if paths is None else sorted(paths)
+        if len(paths) > 1 and self.workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(paths)),
+                                    thread_name_prefix='catalog-ingest') as executor:
+                parsed = list(executor.map(self._parse, paths))
+        else:
+            parsed = [self._parse(path) for path in paths]
+
+        report = {'sources': [], 'errors': [], 'duplicates': {'specs': [], 'rates': [], 'brochures': []}}
+        spec_frames, rate_frames, brochures = [], [], {}
+        for result in parsed:
+            source = str(result['path'].relative_to(self.data_dir))
+            if 'error' in result:
+                report['errors'].append({'source': source, 'error': result['error']})
+                continue
+            for frame in result['specs']:
+                spec_frames.append(frame.assign(source=source))
+            for frame in result['rates']:
+                rate_frames.append(frame.assign(source=source))
+            for key, text in result['brochures'].items():
+                if key in brochures:
+                    report['duplicates']['brochures'].append({'key': key, 'sources': [brochures[key][1], source]})
+                    if self.on_duplicate == 'first':
+                        continue
+                brochures[key] = (text, source)
+            report['sources'].append({
+                'source': source,
+                'specs': sum(len(f) for f in result['specs']),
+                'rates': sum(len(f) for f in result['rates']),
+                'brochures': len(result['brochures']),
+            })
+
+        specs = self._merge(spec_frames, lambda frame: frame['model'], 'specs', report)
+        rates = self._merge(rate_frames, lambda frame: frame['Equipment Description'].map(rate_key), 'rates', report)
+        if self.on_duplicate == 'error' and any(report['duplicates'].values()):
+            raise ValueError(f"Duplicate catalog entries: {report['duplicates']}")
+
+        report['elapsed'] = time.perf_counter() - start
+        report['over_budget'] = self.budget is not None and report['elapsed'] > self.budget
+        return {
+            'specs': specs,
+            'rates': rates,
+            'brochures': {key: text for key, (text, _) in brochures.items()},
+            'report': report,
+        }
+
+    def _merge(self, frames, key_of, kind, report):
+        if not frames:
+            return None
+        merged = pd.concat(frames, ignore_index=True)
+        keys = key_of(merged)
+        duplicated = keys.duplicated(keep=False)
+        if duplicated.any():
+            for key, group in merged[duplicated].groupby(keys[duplicated], sort=True):
+                report['duplicates'][kind].append({'key': key, 'sources': group['source'].tolist()})
+        keep = 'first' if self.on_duplicate == 'first' else 'last'
+        merged = merged[~keys.duplicated(keep=keep)]
+        return merged.drop(columns='source').reset_index(drop=True)
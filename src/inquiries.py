@@ -0,0 +1,136 @@
+import itertools
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from src.chat_history import ChatHistory
+from src.conversation import ConversationManager
+
+# Inquiries one session keeps open; the least recently viewed is closed beyond this
+MAX_INQUIRIES = int(os.environ.get('FORKLIFT_MAX_INQUIRIES', 10))
+
+
+class InquiryBook:
+    """
+    The inquiries open in one session.
+
+    Each inquiry keeps its own conversation, chat history and quote, while
+    all of them share the session's QuoteReviser (and through it the
+    process-wide matcher, quote generator and cached HTML fragments).
+    Switching only changes which inquiry is shown, so it never re-runs the
+    pipeline. Inquiries are kept in least recently viewed order and the
+    oldest is closed, with its revision chain, once max_inquiries is exceeded.
+    """
+
+    def __init__(self, reviser, max_inquiries: int = MAX_INQUIRIES):
+        """
+        Initialize an empty book
+
+        Args:
+            reviser: Shared QuoteReviser
+            max_inquiries: Maximum number of open inquiries
+        """
+        self.reviser = reviser
+        self.max_inquiries = max(1, max_inquiries)
+        self._inquiries = OrderedDict()  # inquiry ID -> inquiry, least recently viewed first
+        self._ids = itertools.count(1)
+        self.active_id = None
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._inquiries)
+
+    def __contains__(self, inquiry_id):
+        return inquiry_id in self._inquiries
+
+    def new(self) -> Dict:
+        """
+        Open a new inquiry and make it the active one
+
+        Returns:
+            Inquiry dictionary with 'id', 'label', 'conversation'
+            (ConversationManager), 'messages' (ChatHistory), 'quote_id'
+            (revision chain, None until quoted) and 'quote_info' (the
+            displayed quote, None until quoted)
+        """
+        inquiry_id = next(self._ids)
+        inquiry = {
+            'id': inquiry_id,
+            'label': f"Inquiry {inquiry_id}",
+            'conversation': ConversationManager(),
+            'messages': ChatHistory(),
+            'quote_id': None,
+            'quote_info': None,
+        }
+        self._inquiries[inquiry_id] = inquiry
+        self.active_id = inquiry_id
+        while len(self._inquiries) > self.max_inquiries:
+            self.close(next(iter(self._inquiries)))
+            self.evicted += 1
+        return inquiry
+
+    def get(self, inquiry_id) -> Optional[Dict]:
+        """Get an open inquiry (None if unknown or closed)"""
+        return self._inquiries.get(inquiry_id)
+
+    def switch(self, inquiry_id) -> Optional[Dict]:
+        """
+        Make an open inquiry the active one
+
+        Args:
+            inquiry_id: Inquiry ID
+
+        Returns:
+            The inquiry, or None if it is not open (the active inquiry is unchanged)
+        """
+        inquiry = self._inquiries.get(inquiry_id)
+        if inquiry is not None:
+            self._inquiries.move_to_end(inquiry_id)
+            self.active_id = inquiry_id
+        return inquiry
+
+    @property
+    def active(self) -> Dict:
+        """The active inquiry, opening one if there is none"""
+        inquiry = self._inquiries.get(self.active_id)
+        return inquiry if inquiry is not None else self.new()
+
+    def close(self, inquiry_id):
+        """
+        Close an inquiry and drop its revision chain
+
+        If it was the active inquiry, the most recently viewed remaining one
+        becomes active.
+        """
+        inquiry = self._inquiries.pop(inquiry_id, None)
+        if inquiry is None:
+            return
+        if inquiry['quote_id'] is not None:
+            self.reviser.discard(inquiry['quote_id'])
+        if self.active_id == inquiry_id:
+            self.active_id = next(reversed(self._inquiries), None)
+
+    def inquiries(self) -> List[Dict]:
+        """Open inquiries in the order they were started"""
+        return sorted(self._inquiries.values(), key=lambda inquiry: inquiry['id'])
+
+    def record(self, inquiry: Dict, revision: Dict):
+        """
+        Make a quote revision (or a failed match) the inquiry's displayed quote
+
+        Args:
+            inquiry: Inquiry from new()
+            revision: Result of QuoteReviser.open, revise or update
+        """
+        if revision.get('success', False):
+            inquiry['quote_id'] = revision['quote_id']
+            inquiry['quote_info'] = {'success': True, 'formatted_quote': revision['formatted_quote']}
+            inquiry['label'] = f"Inquiry {inquiry['id']}: {revision['match']['forklift']['model']}"
+        else:
+            inquiry['quote_info'] = revision
+
+    def get_html(self, inquiry: Dict) -> Optional[str]:
+        """HTML document of the inquiry's quote, assembled from the cached fragments"""
+        if inquiry['quote_id'] is None:
+            return None
+        return self.reviser.get_html(inquiry['quote_id'])
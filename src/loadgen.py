@@ -0,0 +1,328 @@
+import argparse
+import json
+import math
+import os
+import random
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from src.conversation import ConversationManager
+from src.data_loader import ForkliftData
+from src.html_pdf_generator import PDFGenerator as HTMLGenerator
+from src.matcher import ForkliftMatcher
+from src.quote import QuoteGenerator
+
+class AnswerStreamGenerator:
+    """
+    Synthesizes realistic answer streams for the qualifying questions.
+
+    Answers mix units (tons/kg, days/weeks/months, meters/feet) and, with
+    probability invalid_rate, an invalid answer is given first and then
+    retried with a valid one, the way a real user corrects a typo.
+    """
+
+    INVALID_ANSWERS = {
+        'load_weight': ['heavy', 'a few tons', ''],
+        'rental_period': ['0', 'a while', 'soon'],
+        'indoor_outdoor': ['Outdoor', 'inside', 'yard'],
+        'lift_height': ['high', 'top shelf'],
+    }
+
+    def __init__(self, seed: int = 0, invalid_rate: float = 0.1):
+        """
+        Initialize the generator
+
+        Args:
+            seed: Random seed for reproducible workloads
+            invalid_rate: Probability of an invalid answer before each valid one
+        """
+        self.rng = random.Random(seed)
+        self.invalid_rate = invalid_rate
+
+    def conversation(self) -> List[str]:
+        """
+        Generate the answers for one conversation
+
+        Returns:
+            Answers in the order they are typed, including invalid attempts
+        """
+        answers = []
+        for question_id, valid in [
+            ('load_weight', self._weight()),
+            ('rental_period', self._period()),
+            ('indoor_outdoor', self.rng.choice(['indoor', 'outdoor', 'both'])),
+            ('lift_height', self._height()),
+            ('special_requirements', self.rng.choice(['none', 'side shift', 'weight scale', 'non-marking tyres'])),
+        ]:
+            if question_id in self.INVALID_ANSWERS and self.rng.random() < self.invalid_rate:
+                answers.append(self.rng.choice(self.INVALID_ANSWERS[question_id]))
+            answers.append(valid)
+        return answers
+
+    def _weight(self) -> str:
+        tons = round(self.rng.uniform(0.5, 7.5), 1)
+        return self.rng.choice([f"{tons} tons", f"{int(tons * 1000)} kg", f"{tons}"])
+
+    def _period(self) -> str:
+        return self.rng.choice([
+            str(self.rng.randint(1, 7)),
+            f"{self.rng.randint(1, 28)} days",
+            f"{self.rng.randint(1, 4)} weeks",
+            f"{self.rng.randint(1, 6)} months",
+        ])
+
+    def _height(self) -> str:
+        return self.rng.choice([
+            f"{round(self.rng.uniform(2, 6), 1)} meters",
+            f"{self.rng.randint(6, 20)} feet",
+            f"{self.rng.randint(2, 6)}",
+        ])
+
+
+class InProcessTarget:
+    """
+    Drives conversations directly through ConversationManager and the quote pipeline
+    """
+
+    name = 'inprocess'
+
+    def __init__(self, forklift_data=None, render: bool = True):
+        """
+        Initialize the target
+
+        Args:
+            forklift_data: Shared ForkliftData instance (loaded from data/ if omitted)
+            render: Whether to render the HTML document for each completed quote
+        """
+        self.data = forklift_data if forklift_data is not None else ForkliftData()
+        self.matcher = ForkliftMatcher(self.data)
+        self.quote_generator = QuoteGenerator(self.data)
+        self.render = render
+
+    def run_conversation(self, answers: List[str]) -> List[float]:
+        """
+        Run one conversation
+
+        Args:
+            answers: Answer stream from AnswerStreamGenerator
+
+        Returns:
+            Latency of each turn in seconds (the final turn includes the quote)
+        """
+        conversation = ConversationManager()
+        latencies = []
+        for answer in answers:
+            start = time.perf_counter()
+            conversation.process_answer(answer)
+            if conversation.is_complete():
+                forklift_match = self.matcher.match_forklift(conversation.get_requirements())
+                quote_result = self.quote_generator.generate_quote(forklift_match)
+                formatted_quote = self.quote_generator.format_quote_for_display(quote_result)
+                if self.render:
+                    HTMLGenerator(formatted_quote).get_html_string()
+            latencies.append(time.perf_counter() - start)
+        if not conversation.is_complete():
+            raise RuntimeError("Conversation did not complete")
+        return latencies
+
+
+class HTTPTarget:
+    """
+    Drives conversations through the JSON API (see src/api.py)
+    """
+
+    name = 'http'
+
+    def __init__(self, base_url: str = 'http://127.0.0.1:8502', render: bool = True, timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/')
+        self.render = render
+        self.timeout = timeout
+
+    def _post(self, path: str, payload: Dict) -> Dict:
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST',
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def run_conversation(self, answers: List[str]) -> List[float]:
+        conversation_id = self._post('/conversations', {})['id']
+        latencies = []
+        response = {}
+        for answer in answers:
+            start = time.perf_counter()
+            response = self._post(f'/conversations/{conversation_id}/answers', {'answer': answer, 'render': self.render})
+            latencies.append(time.perf_counter() - start)
+        if not response.get('complete'):
+            raise RuntimeError("Conversation did not complete")
+        return latencies
+
+
+class StreamlitTarget:
+    """
+    Drives conversations through the Streamlit app itself using Streamlit's
+    headless AppTest harness, so every turn pays a full script rerun.
+
+    AppTest shares one process-wide runtime stub, so script runs are
+    serialized; concurrent conversations interleave turn by turn.
+    """
+
+    name = 'streamlit'
+    _run_lock = threading.Lock()
+
+    def __init__(self, app_path: str = 'app.py', timeout: float = 30.0):
+        self.app_path = os.path.abspath(app_path)
+        self.timeout = timeout
+
+    def run_conversation(self, answers: List[str]) -> List[float]:
+        from streamlit.testing.v1 import AppTest
+
+        app = AppTest.from_file(self.app_path, default_timeout=self.timeout)
+        with self._run_lock:
+            app.run()
+        latencies = []
+        for answer in answers:
+            with self._run_lock:
+                start = time.perf_counter()
+                app.chat_input[0].set_value(answer).run()
+                latencies.append(time.perf_counter() - start)
+            if app.exception:
+                raise RuntimeError(app.exception[0].message)
+        if len(app.chat_input):
+            raise RuntimeError("Conversation did not complete")
+        return latencies
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+
+    Args:
+        sorted_values: Values in ascending order
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value (0.0 for an empty list)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _summarize(values: List[float]) -> Dict:
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'mean_ms': 1000 * sum(values) / len(values) if values else 0.0,
+        'p50_ms': 1000 * percentile(values, 50),
+        'p90_ms': 1000 * percentile(values, 90),
+        'p95_ms': 1000 * percentile(values, 95),
+        'p99_ms': 1000 * percentile(values, 99),
+        'max_ms': 1000 * values[-1] if values else 0.0,
+    }
+
+
+def run_load(target, conversations: int = 100, concurrency: int = 8, seed: int = 0,
+             invalid_rate: float = 0.1) -> Dict:
+    """
+    Drive many concurrent conversations against a target and report the results
+
+    Args:
+        target: InProcessTarget, HTTPTarget or StreamlitTarget
+        conversations: Total number of conversations to run
+        concurrency: Number of conversations in flight at once
+        seed: Random seed for the answer streams
+        invalid_rate: Probability of an invalid answer before each valid one
+
+    Returns:
+        Report with throughput and per-turn / per-conversation latency percentiles
+    """
+    generator = AnswerStreamGenerator(seed=seed, invalid_rate=invalid_rate)
+    streams = [generator.conversation() for _ in range(conversations)]
+
+    turn_latencies = []
+    conversation_latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker(answers):
+        try:
+            latencies = target.run_conversation(answers)
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+            return
+        with lock:
+            turn_latencies.extend(latencies)
+            conversation_latencies.append(sum(latencies))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, streams))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'target': target.name,
+        'conversations': conversations,
+        'concurrency': concurrency,
+        'completed': len(conversation_latencies),
+        'errors': len(errors),
+        'error_samples': errors[:5],
+        'elapsed_s': elapsed,
+        'conversations_per_s': len(conversation_latencies) / elapsed if elapsed else 0.0,
+        'turns_per_s': len(turn_latencies) / elapsed if elapsed else 0.0,
+        'turn_latency': _summarize(turn_latencies),
+        'conversation_latency': _summarize(conversation_latencies),
+    }
+
+
+def format_report(report: Dict) -> str:
+    """Render a load report as readable text"""
+    lines = [
+        f"Target: {report['target']}  conversations: {report['conversations']}  concurrency: {report['concurrency']}",
+        f"Completed: {report['completed']}  errors: {report['errors']}  elapsed: {report['elapsed_s']:.2f}s",
+        f"Throughput: {report['conversations_per_s']:.1f} conversations/s, {report['turns_per_s']:.1f} turns/s",
+    ]
+    for key, label in [('turn_latency', 'Turn'), ('conversation_latency', 'Conversation')]:
+        s = report[key]
+        lines.append(
+            f"{label} latency (ms): mean {s['mean_ms']:.2f}  p50 {s['p50_ms']:.2f}  p90 {s['p90_ms']:.2f}  "
+            f"p95 {s['p95_ms']:.2f}  p99 {s['p99_ms']:.2f}  max {s['max_ms']:.2f}"
+        )
+    for sample in report['error_samples']:
+        lines.append(f"Error: {sample}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Synthetic load generator for the quote pipeline")
+    parser.add_argument('--target', choices=['inprocess', 'http', 'streamlit'], default='inprocess')
+    parser.add_argument('--url', default='http://127.0.0.1:8502', help="Base URL for the http target")
+    parser.add_argument('--app', default='app.py', help="App script for the streamlit target")
+    parser.add_argument('--conversations', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--invalid-rate', type=float, default=0.1)
+    parser.add_argument('--no-render', action='store_true', help="Skip HTML rendering of completed quotes")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.target == 'http':
+        target = HTTPTarget(args.url, render=not args.no_render)
+    elif args.target == 'streamlit':
+        target = StreamlitTarget(args.app)
+    else:
+        target = InProcessTarget(render=not args.no_render)
+
+    report = run_load(target, args.conversations, args.concurrency, args.seed, args.invalid_rate)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import datetime
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# Requirement fields ForkliftMatcher.match_forklift reads; others (lift_height,
+# location) do not change a match, so they are left out of the key
+MATCH_FIELDS = (
+    'load_weight', 'rental_period', 'unit_periods', 'start_date',
+    'indoor_outdoor', 'special_requirements', 'items',
+)
+
+
+def match_requirements(requirements: Dict) -> Dict:
+    """The part of a requirements dictionary a match depends on"""
+    return {field: requirements[field] for field in MATCH_FIELDS if field in requirements}
+
+
+class MatchCache:
+    """
+    Bounded LRU cache of match results for hot requirement tuples.
+
+    Keys combine the catalog version, the current day (matches default to
+    starting tomorrow) and the normalized requirements, so a catalog reload
+    or a new day never serves a stale match. Hit counts are kept per entry
+    so the hottest tuples can be snapshotted and replayed into a new
+    replica's cache before it takes traffic.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize an empty cache
+
+        Args:
+            max_entries: Maximum number of cached matches
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> [requirements, result, hits]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.prepopulated = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(requirements: Dict, catalog_version: Optional[str] = None) -> tuple:
+        """
+        Cache key of a set of requirements
+
+        Args:
+            requirements: Requirements as produced by ConversationManager
+            catalog_version: ForkliftData.catalog_version
+
+        Returns:
+            Hashable key
+        """
+        normalized = json.dumps(match_requirements(requirements), sort_keys=True, default=str)
+        return catalog_version, datetime.date.today().isoformat(), normalized
+
+    def get(self, key) -> Optional[Dict]:
+        """Get a cached match (None on a miss)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry[2] += 1
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, requirements: Dict, result: Dict):
+        """
+        Store a match, evicting the least recently used entries beyond max_entries
+
+        Args:
+            key: Key from key()
+            requirements: Requirements the match was computed for
+            result: Match result (treated as read-only once cached)
+        """
+        with self._lock:
+            hits = self._entries[key][2] if key in self._entries else 0
+            self._entries[key] = [match_requirements(requirements), result, hits]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.prepopulated = 0
+
+    def stats(self) -> Dict:
+        """
+        Get fill and hit statistics
+
+        Returns:
+            Dictionary with entries, max_entries, fill (0-1), hits, misses,
+            hit_rate and the number of prepopulated entries
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'fill': len(self._entries) / self.max_entries if self.max_entries else 0.0,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'prepopulated': self.prepopulated,
+            }
+
+    def snapshot(self, top: Optional[int] = None) -> List[Dict]:
+        """
+        Hottest requirement tuples, most hits first
+
+        Args:
+            top: Maximum number of tuples (defaults to all)
+
+        Returns:
+            List of {'requirements': ..., 'hits': n}, one per distinct tuple
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+        tuples = {}
+        for requirements, _, hits in entries:
+            normalized = json.dumps(requirements, sort_keys=True, default=str)
+            if normalized not in tuples or tuples[normalized]['hits'] < hits:
+                tuples[normalized] = {'requirements': requirements, 'hits': hits}
+        ranked = sorted(tuples.values(), key=lambda t: t['hits'], reverse=True)
+        return ranked[:top] if top is not None else ranked
+
+    def save_snapshot(self, path, top: Optional[int] = None):
+        """Write the hottest requirement tuples to a JSON file"""
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'entries': self.snapshot(top)}, f, indent=1, default=str)
+        os.replace(tmp, path)
+
+    def prepopulate(self, matcher, snapshot) -> int:
+        """
+        Compute and cache the matches for a snapshot of hot requirement tuples
+
+        Args:
+            matcher: ForkliftMatcher using this cache
+            snapshot: Result of snapshot(), a path to a saved snapshot, or a
+                list of requirement dictionaries
+
+        Returns:
+            Number of tuples matched
+        """
+        if isinstance(snapshot, (str, os.PathLike)):
+            with open(snapshot) as f:
+                snapshot = json.load(f)['entries']
+        count = 0
+        for entry in snapshot:
+            requirements = entry.get('requirements', entry) if isinstance(entry, dict) else entry
+            matcher.match_forklift(requirements)
+            count += 1
+        with self._lock:
+            self.prepopulated += count
+        return count
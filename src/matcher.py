@@ -1,20 +1,99 @@
+import copy
 import re
+import datetime
+import json
+import numpy as np
 from typing import Dict, List, Optional, Tuple
 
+from src.availability import to_date
+from src.features import covers, feature_names, parse_features
+from src.match_cache import match_requirements
+from src.metrics import metrics
+from src.money import daily_rate_cents, line_total_cents, to_dollars
+from src.ranking import ForkliftRanker
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_days(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def _whole_days(value) -> Optional[int]:
+    """A quantity or day count as a positive whole number (2, 2.0 or '2'), or None"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    elif isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    return value if _is_days(value) else None
+
+
+def requirements_error(requirements) -> Optional[str]:
+    """
+    Check that a requirements dictionary from a client can be matched
+    
+    Args:
+        requirements: Requirements as described in ForkliftMatcher.match_forklift
+        
+    Returns:
+        What is wrong with the requirements, or None if they are well formed
+    """
+    if not isinstance(requirements, dict):
+        return "Requirements must be an object."
+    if not (_is_number(requirements.get('load_weight', 0)) or isinstance(requirements.get('load_weight'), str)):
+        return "'load_weight' must be a number or text such as '2000 kg'."
+    if 'rental_period' in requirements and not _is_days(requirements['rental_period']):
+        return "'rental_period' must be a positive whole number of days."
+    for field in ('indoor_outdoor', 'special_requirements'):
+        if requirements.get(field) is not None and not isinstance(requirements[field], str):
+            return f"'{field}' must be text."
+    if requirements.get('start_date'):
+        try:
+            to_date(requirements['start_date'])
+        except (TypeError, ValueError):
+            return "'start_date' must be an ISO date such as 2030-01-31."
+    unit_periods = requirements.get('unit_periods') or []
+    if not isinstance(unit_periods, list) or not all(
+            isinstance(p, dict) and _is_days(p.get('quantity')) and _is_days(p.get('days')) for p in unit_periods):
+        return "'unit_periods' must be a list of {'quantity', 'days'} with positive whole numbers."
+    items = requirements.get('items') or []
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return "'items' must be a list of objects."
+    for item in items:
+        if not isinstance(item.get('description', ''), str):
+            return "Each item's 'description' must be text."
+        if not all(_is_days(item[field]) for field in ('quantity', 'days') if field in item):
+            return "Each item's 'quantity' and 'days' must be positive whole numbers."
+    return None
+
+
 class ForkliftMatcher:
     """
     Class to match customer requirements to appropriate forklift models
     """
     
-    def __init__(self, forklift_data):
+    # Number of alternative models included with each match
+    ALTERNATIVES = 2
+    
+    def __init__(self, forklift_data, availability=None, cache=None):
         """
         Initialize with forklift data
         
         Args:
             forklift_data: Instance of ForkliftData containing specifications
+            availability: Optional FleetAvailability; when given, only models with
+                a free unit for the rental period are offered
+            cache: Optional MatchCache shared across requests; not used with a
+                fleet calendar, since bookings change what is available
         """
         self.data = forklift_data
+        self.availability = availability
+        self.cache = cache
+        self._ranker = None
     
+    @metrics.timed('match')
     def match_forklift(self, requirements: Dict) -> Dict:
         """
         Match customer requirements to the best forklift model
@@ -26,52 +105,508 @@ class ForkliftMatcher:
                 - indoor_outdoor: Whether the forklift will be used indoors, outdoors, or both
                 - height_requirement: Maximum height required in meters
                 - special_requirements: Any special requirements or features needed
+                - start_date: Optional first rental day (defaults to tomorrow)
+                - unit_periods: Optional fleet order as [{'quantity': n, 'days': d}, ...]
         
         Returns:
             Dictionary with matched forklift information and options
         """
+        if self.cache is None or self.availability is not None:
+            return self._match(requirements)
+        
+        key = self.cache.key(requirements, self.data.catalog_version)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._match(requirements)
+            self.cache.put(key, requirements, result)
+        # Deep copy so callers can edit any part of the match without touching the cached one
+        return copy.deepcopy(result)
+    
+    def _match(self, requirements: Dict) -> Dict:
+        """Match requirements to a forklift without the cache (see match_forklift)"""
         # Extract and normalize load weight requirement
         load_weight = self._normalize_weight(requirements.get('load_weight', 0))
         
         # Add safety margin (20% extra capacity for safety)
         required_capacity = load_weight * 1.2
         
-        # Find a suitable forklift
-        matched_forklift = self.data.get_forklift_by_capacity(required_capacity)
+        rental_days, unit_periods, start_date = self.rental_terms(requirements)
+        required_features = parse_features(requirements.get('special_requirements', ''))
+        
+        # Find a suitable forklift, preferring models with every requested feature
+        candidates = self._candidate_forklifts(required_capacity, required_features)
         
         # If no match found, return empty result
-        if matched_forklift is None:
+        if candidates.empty:
             return {
                 'success': False,
                 'message': f"No suitable forklift found for load weight of {load_weight} tons."
             }
+        matched_forklift = candidates.iloc[0]
         
-        # Calculate rental rate
-        rental_days = requirements.get('rental_period', 1)
-        rate_info = self.data.get_rate_for_model(matched_forklift['model'], rental_days)
+        # Only offer models with a free unit for the whole rental period
+        if self.availability is not None:
+            matched_forklift = self._find_available_forklift(candidates, start_date, rental_days, unit_periods)
+            if matched_forklift is None:
+                return {
+                    'success': False,
+                    'message': self._unavailable_message(load_weight, required_capacity, start_date, rental_days)
+                }
         
-        # Get brochure information
-        brochure = self.data.get_brochure_content(matched_forklift['model'])
+        model = matched_forklift['model']
         
-        # Get indoor/outdoor recommendation
-        indoor_outdoor = requirements.get('indoor_outdoor', 'both')
-        usage_recommendation = self._get_usage_recommendation(matched_forklift, indoor_outdoor)
+        # Get brochure information
+        brochure = self.data.get_brochure_excerpt(model)
         
         # Compile the result
         result = {
             'success': True,
             'forklift': matched_forklift.to_dict(),
-            'rental_details': {
-                'days': rental_days,
-                'rates': rate_info,
-            },
+            'rental_details': self.price_rental(model, requirements),
             'brochure_excerpt': brochure,
-            'recommendations': usage_recommendation,
-            'safety_info': self._get_safety_info(matched_forklift)
+            'brochure_key': self.data.get_brochure_key(model),
+            'brochure_truncated': self.data.is_brochure_truncated(model),
+            'safety_info': self._get_safety_info(matched_forklift),
+            'line_items': self.match_equipment(requirements, rental_days),
+            'alternatives': self.rank_alternatives(model, requirements)
         }
+        result.update(self.recommend(model, requirements))
         
         return result
     
+    @metrics.timed('match_batch')
+    def match_batch(self, requirements_list: List[Dict]) -> List[Dict]:
+        """
+        Match many inquiries at once, e.g. the lines of an uploaded spreadsheet
+
+        Model choice, pricing and alternatives are computed for the whole batch
+        with array operations over the candidate table, and identical
+        requirements are matched once. Results are the same as calling
+        match_forklift for each inquiry; with a fleet calendar every inquiry
+        goes through match_forklift, since each booking check depends on dates.
+
+        Args:
+            requirements_list: List of requirement dictionaries (see match_forklift)
+
+        Returns:
+            One match dictionary per inquiry, in order
+        """
+        if self.availability is not None:
+            return [self.match_forklift(requirements) for requirements in requirements_list]
+
+        # Match each distinct requirement tuple once
+        keys = [json.dumps(match_requirements(r), sort_keys=True, default=str) for r in requirements_list]
+        positions = {}
+        unique = []
+        for key, requirements in zip(keys, requirements_list):
+            if key not in positions:
+                positions[key] = len(unique)
+                unique.append(requirements)
+        matches = self._match_unique(unique) if unique else []
+        # Deep copies, so duplicates (and their nested details) can be changed independently
+        return [copy.deepcopy(matches[positions[key]]) for key in keys]
+
+    def _match_unique(self, requirements_list: List[Dict]) -> List[Dict]:
+        """Vectorized body of match_batch for distinct requirements"""
+        table = self.data.get_candidate_table()
+        load_weights = [self._normalize_weight(r.get('load_weight', 0)) for r in requirements_list]
+        required = np.array(load_weights, dtype=float) * 1.2
+        features = np.array([parse_features(r.get('special_requirements', '')) for r in requirements_list],
+                            dtype=np.uint64)
+        terms = [self.rental_terms(r) for r in requirements_list]
+        days = np.array([t[0] for t in terms], dtype=np.int64)
+
+        # First adequate model per inquiry, preferring models with every requested feature
+        adequate = table.capacity[None, :] >= required[:, None]
+        equipped = adequate & covers(table.features[None, :], features[:, None])
+        preferred = np.where(equipped.any(axis=1, keepdims=True), equipped, adequate)
+        chosen = preferred.argmax(axis=1)
+        found = preferred.any(axis=1)
+
+        # Rates of the chosen model for each inquiry's duration
+        tiers = (table.daily_cents[chosen], table.weekly_short_cents[chosen], table.weekly_long_cents[chosen])
+        applied_cents = daily_rate_cents(*tiers, days).tolist()
+        total_cents = line_total_cents(*tiers, days).tolist()
+
+        ranked = self.ranker.rank_batch(
+            required, days, [r.get('indoor_outdoor', 'both') for r in requirements_list],
+            k=self.ALTERNATIVES + 1, start_dates=[t[2] for t in terms], required_features=features
+        )
+
+        # Per-model parts are the same for every inquiry matched to that model
+        per_model = {}
+        results = []
+        for i, requirements in enumerate(requirements_list):
+            if not found[i]:
+                results.append({
+                    'success': False,
+                    'message': f"No suitable forklift found for load weight of {load_weights[i]} tons."
+                })
+                continue
+
+            j = int(chosen[i])
+            model = table.models[j]
+            if model not in per_model:
+                brochure = self.data.get_brochure_excerpt(model)
+                forklift = table.rows.iloc[j]
+                per_model[model] = {
+                    'forklift': forklift.to_dict(),
+                    'brochure_excerpt': brochure,
+                    'brochure_key': self.data.get_brochure_key(model),
+                    'brochure_truncated': self.data.is_brochure_truncated(model),
+                    'safety_info': self._get_safety_info(forklift),
+                }
+            shared = per_model[model]
+
+            rental_days, unit_periods, start_date = terms[i]
+            rental_details = {
+                'days': rental_days,
+                'start_date': start_date.isoformat(),
+                'rates': {
+                    'daily': float(table.daily[j]),
+                    'weekly_short': float(table.weekly_short[j]),
+                    'weekly_long': float(table.weekly_long[j]),
+                    'applied_rate': to_dollars(applied_cents[i]),
+                    'total_cost': to_dollars(total_cents[i]),
+                    'applied_rate_cents': applied_cents[i],
+                    'total_cost_cents': total_cents[i],
+                },
+            }
+            if unit_periods:
+                rental_details['unit_periods'] = self._price_unit_periods(model, unit_periods)
+
+            result = {
+                'success': True,
+                'forklift': dict(shared['forklift']),
+                'rental_details': rental_details,
+                'brochure_excerpt': shared['brochure_excerpt'],
+                'brochure_key': shared['brochure_key'],
+                'brochure_truncated': shared['brochure_truncated'],
+                'safety_info': shared['safety_info'],
+                'line_items': self.match_equipment(requirements, rental_days),
+                'alternatives': [c for c in ranked[i] if c['model'] != model][:self.ALTERNATIVES],
+            }
+            result.update(self.recommend(model, requirements))
+            results.append(result)
+        return results
+
+    def rental_terms(self, requirements: Dict) -> Tuple[int, List[Dict], datetime.date]:
+        """
+        Read the rental duration, fleet order and start date from requirements
+        
+        Args:
+            requirements: Dictionary containing customer requirements (see match_forklift)
+            
+        Returns:
+            Tuple of (rental days, unit periods, start date); a fleet order runs
+            for its longest group
+        """
+        rental_days = requirements.get('rental_period', 1)
+        unit_periods = requirements.get('unit_periods') or []
+        if unit_periods:
+            rental_days = max(p['days'] for p in unit_periods)
+        start_date = to_date(requirements.get('start_date') or datetime.date.today() + datetime.timedelta(days=1))
+        return rental_days, unit_periods, start_date
+    
+    def price_rental(self, model: str, requirements: Dict) -> Dict:
+        """
+        Price the rental of a matched model
+        
+        Args:
+            model: Matched forklift model
+            requirements: Dictionary containing customer requirements (see match_forklift)
+            
+        Returns:
+            Rental details with days, start date, rates and any priced unit periods
+        """
+        rental_days, unit_periods, start_date = self.rental_terms(requirements)
+        rental_details = {
+            'days': rental_days,
+            'start_date': start_date.isoformat(),
+            'rates': self.data.get_candidate_table().rates_for(model, rental_days),
+        }
+        if unit_periods:
+            rental_details['unit_periods'] = self._price_unit_periods(model, unit_periods)
+        return rental_details
+    
+    def recommend(self, model: str, requirements: Dict) -> Dict:
+        """
+        Usage recommendation and feature check for a matched model
+        
+        Args:
+            model: Matched forklift model
+            requirements: Dictionary containing customer requirements (see match_forklift)
+            
+        Returns:
+            Dictionary with 'recommendations', 'indoor_outdoor' and 'features'
+            (requested and missing feature names)
+        """
+        table = self.data.get_candidate_table()
+        required_features = parse_features(requirements.get('special_requirements', ''))
+        indoor_outdoor = requirements.get('indoor_outdoor', 'both')
+        usage_recommendation = self._get_usage_recommendation(model, indoor_outdoor)
+        
+        # Requested features the matched model does not have as standard
+        missing_features = feature_names(required_features & ~table.features[table.index_of(model)])
+        if missing_features:
+            usage_recommendation += (
+                f" Note: the {model} does not list "
+                f"{', '.join(f.replace('_', ' ') for f in missing_features)} as standard; "
+                "please confirm fitment with our team."
+            )
+        return {
+            'recommendations': usage_recommendation,
+            'indoor_outdoor': indoor_outdoor,
+            'features': {'requested': feature_names(required_features), 'missing': missing_features},
+        }
+    
+    def rank_alternatives(self, model: str, requirements: Dict) -> List[Dict]:
+        """
+        Best-ranked models other than the matched one
+        
+        Args:
+            model: Matched forklift model
+            requirements: Dictionary containing customer requirements (see match_forklift)
+            
+        Returns:
+            Up to ALTERNATIVES ranked candidates
+        """
+        rental_days, _, start_date = self.rental_terms(requirements)
+        required_capacity = self._normalize_weight(requirements.get('load_weight', 0)) * 1.2
+        return [
+            candidate for candidate in self.ranker.rank(
+                required_capacity, rental_days, requirements.get('indoor_outdoor', 'both'),
+                k=self.ALTERNATIVES + 1, start_date=start_date,
+                required_features=parse_features(requirements.get('special_requirements', ''))
+            )
+            if candidate['model'] != model
+        ][:self.ALTERNATIVES]
+    
+    def search_forklifts(self, query: str, k: int = 5) -> List[Dict]:
+        """
+        Full-text search over brochures, specs and rate descriptions
+        
+        Args:
+            query: Free text such as "oil-cooled brakes 6m lift weight scale"
+            k: Maximum number of models
+            
+        Returns:
+            Matching models, best first, with capacity, fuel type and BM25 score
+        """
+        specs = self.data.specs_df.set_index('model')
+        results = []
+        for hit in self.data.search_index.search(query, k, kind='model'):
+            forklift = specs.loc[hit['model']]
+            results.append({
+                'model': hit['model'],
+                'capacity_tons': float(forklift['capacity_tons']),
+                'fuel_type': forklift['fuel_type'],
+                'series': forklift['series'],
+                'score': hit['score'],
+            })
+        return results
+    
+    def match_equipment(self, requirements: Dict, rental_days: int) -> List[Dict]:
+        """
+        Resolve additional machines and attachments to rate schedule rows
+        
+        Lines come from an explicit 'items' list (each with 'description' and
+        optional 'quantity' and 'days') and from the free-text
+        'special_requirements' answer, e.g. "2 x auger 300mm, post hole attachment for 3 days".
+        
+        Args:
+            requirements: Dictionary containing customer requirements
+            rental_days: Default rental days for each line
+            
+        Returns:
+            List of line dictionaries with description, rate_row, quantity and days
+        """
+        rate_index = self.data.get_rate_index()
+        requests = [
+            (item.get('description', ''), item.get('quantity', 1), item.get('days', rental_days), False)
+            for item in requirements.get('items', [])
+        ]
+        # Free text only adds a line when it names a machine or attachment
+        requests.extend(
+            (text, quantity, days, True)
+            for text, quantity, days in self._parse_equipment_text(requirements.get('special_requirements', ''),
+                                                                   rental_days)
+        )
+        
+        lines = []
+        for text, quantity, days, require_noun in requests:
+            # Lines without a positive quantity and duration would price at or below zero
+            quantity, days = _whole_days(quantity), _whole_days(days)
+            if quantity is None or days is None or not isinstance(text, str):
+                continue
+            row = rate_index.search(text, require_noun=require_noun)
+            if row is None:
+                continue
+            lines.append({
+                'description': rate_index.descriptions[row],
+                'rate_row': row,
+                'quantity': quantity,
+                'days': days
+            })
+        return lines
+    
+    def _parse_equipment_text(self, text, rental_days) -> List[Tuple[str, int, int]]:
+        """
+        Split a free-text answer into (text, quantity, days) equipment requests
+        
+        Args:
+            text: Free-text special requirements
+            rental_days: Default days when a segment does not give its own
+            
+        Returns:
+            List of (text, quantity, days) tuples
+        """
+        if not isinstance(text, str) or not text.strip():
+            return []
+        
+        requests = []
+        for segment in re.split(r'[,;+\n]|\band\b', text.lower()):
+            segment = segment.strip()
+            if not segment:
+                continue
+            
+            quantity = 1
+            match = re.match(r'^(\d+)\s*(?:x\s*|\s+)(?=[a-z])', segment)
+            if match:
+                quantity = int(match.group(1))
+                segment = segment[match.end():]
+            
+            days = rental_days
+            match = re.search(r'\bfor\s+(\d+)\s*(day|week|month)s?\b', segment)
+            if match:
+                days = int(match.group(1)) * {'day': 1, 'week': 7, 'month': 30}[match.group(2)]
+                segment = segment[:match.start()] + segment[match.end():]
+            
+            requests.append((segment.strip(), quantity, days))
+        return requests
+    
+    @property
+    def ranker(self):
+        """Ranker over the catalog's precomputed candidate table"""
+        if self._ranker is None or self._ranker.table is not self.data.get_candidate_table():
+            self._ranker = ForkliftRanker(self.data.get_candidate_table(), self.availability)
+        return self._ranker
+    
+    def rank_forklifts(self, requirements: Dict, k: int = 3) -> List[Dict]:
+        """
+        Rank the top-K forklifts for a set of requirements
+        
+        Args:
+            requirements: Dictionary containing customer requirements (see match_forklift)
+            k: Number of candidates to return
+            
+        Returns:
+            Candidates ordered best first, scored by capacity headroom, total
+            price, fuel suitability and availability
+        """
+        return self.rank_forklifts_batch([requirements], k)[0]
+    
+    @metrics.timed('rank_batch')
+    def rank_forklifts_batch(self, requirements_list: List[Dict], k: int = 3) -> List[List[Dict]]:
+        """
+        Rank the top-K forklifts for many inquiries in one vectorized pass
+        
+        Args:
+            requirements_list: List of requirement dictionaries
+            k: Number of candidates per inquiry
+            
+        Returns:
+            One ranked candidate list per inquiry
+        """
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        return self.ranker.rank_batch(
+            [self._normalize_weight(r.get('load_weight', 0)) * 1.2 for r in requirements_list],
+            [r.get('rental_period', 1) for r in requirements_list],
+            [r.get('indoor_outdoor', 'both') for r in requirements_list],
+            k,
+            [to_date(r['start_date']) if r.get('start_date') else tomorrow for r in requirements_list],
+            [parse_features(r.get('special_requirements', '')) for r in requirements_list]
+        )
+    
+    def _candidate_forklifts(self, required_capacity, required_features):
+        """
+        Get the models that meet the capacity requirement in preference order
+        
+        Args:
+            required_capacity: Required capacity in tons (including safety margin)
+            required_features: Feature bitset parsed from the special requirements
+            
+        Returns:
+            DataFrame of models with every requested feature first, then the rest,
+            each group smallest first
+        """
+        candidates = self.data.get_forklifts_by_capacity(required_capacity)
+        if not required_features or candidates.empty:
+            return candidates
+        table = self.data.get_candidate_table()
+        equipped = covers(table.features_of(candidates['model']), required_features)
+        return candidates.iloc[np.argsort(~equipped, kind='stable')]
+    
+    def _find_available_forklift(self, candidates, start_date, rental_days, unit_periods=None):
+        """
+        Get the first candidate model with a free unit for the rental period
+        
+        Args:
+            candidates: Models in preference order (see _candidate_forklifts)
+            start_date: First rental day
+            rental_days: Number of rental days
+            unit_periods: Optional fleet order; every unit must be free for its period
+            
+        Returns:
+            Forklift row, or None if every adequate model is booked
+        """
+        for _, forklift in candidates.iterrows():
+            if unit_periods:
+                if self.availability.can_supply(forklift['model'], start_date, unit_periods):
+                    return forklift
+            elif self.availability.is_available(forklift['model'], start_date, rental_days):
+                return forklift
+        return None
+    
+    def _price_unit_periods(self, model, unit_periods) -> List[Dict]:
+        """
+        Price every group of a fleet order in one array operation
+        
+        Args:
+            model: Matched forklift model
+            unit_periods: List of {'quantity': n, 'days': d} groups
+            
+        Returns:
+            The groups with applied_rate and line_total added
+        """
+        table = self.data.get_candidate_table()
+        column = table.index_of(model)
+        days = np.array([p['days'] for p in unit_periods], dtype=np.int64)
+        quantities = np.array([p['quantity'] for p in unit_periods], dtype=np.int64)
+        applied = table.applied_rates(days)[:, column]
+        totals = table.line_totals_cents(days, quantities)[:, column]
+        return [
+            {'quantity': int(p['quantity']), 'days': int(p['days']), 'applied_rate': rate,
+             'line_total': total / 100, 'line_total_cents': total}
+            for p, rate, total in zip(unit_periods, applied.tolist(), totals.tolist())
+        ]
+    
+    def _unavailable_message(self, load_weight, required_capacity, start_date, rental_days):
+        """Explain that no adequate model is free, with the earliest alternative"""
+        earliest = None
+        for model in self.data.get_forklifts_by_capacity(required_capacity)['model']:
+            slot = self.availability.first_free_slot(model, rental_days, start_date)
+            if slot is not None and (earliest is None or slot[0] < earliest[0]):
+                earliest = (slot[0], model)
+        
+        message = (
+            f"No suitable forklift for load weight of {load_weight} tons is available "
+            f"from {start_date.strftime('%d %B %Y')} for {rental_days} days."
+        )
+        if earliest is not None:
+            message += f" The earliest availability is a {earliest[1]} from {earliest[0].strftime('%d %B %Y')}."
+        return message
+    
     def _normalize_weight(self, weight_input) -> float:
         """
         Normalize weight input to tons
@@ -0,0 +1,235 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+logger = logging.getLogger("forklift.metrics")
+
+
+class StageHistogram:
+    """
+    Cumulative latency histogram for a single pipeline stage
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        """Record one observation"""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self) -> Dict:
+        """Summarise the histogram as plain values"""
+        return {
+            'count': self.count,
+            'sum_seconds': self.total,
+            'mean_seconds': self.total / self.count if self.count else 0.0,
+            'max_seconds': self.max,
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts)),
+        }
+
+
+class Metrics:
+    """
+    Per-stage latency instrumentation for the quote pipeline.
+
+    Disabled by default; when disabled, spans and timed functions cost a
+    single attribute check. Enable with FORKLIFT_METRICS=1 (and
+    FORKLIFT_METRICS_JSON=1 to also emit one JSON log line per span).
+    """
+
+    def __init__(self, enabled=False, json_log=False, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize the metrics registry
+
+        Args:
+            enabled: Whether observations are recorded
+            json_log: Whether each observation is also logged as a JSON line
+            buckets: Histogram bucket upper bounds in seconds
+        """
+        self.enabled = enabled
+        self.json_log = json_log
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def enable(self, json_log: Optional[bool] = None):
+        """Start recording observations"""
+        self.enabled = True
+        if json_log is not None:
+            self.json_log = json_log
+
+    def disable(self):
+        """Stop recording observations"""
+        self.enabled = False
+
+    def reset(self):
+        """Drop all recorded observations"""
+        with self._lock:
+            self._histograms = {}
+
+    def observe(self, stage: str, seconds: float):
+        """
+        Record the duration of a stage
+
+        Args:
+            stage: Name of the pipeline stage
+            seconds: Elapsed wall-clock time in seconds
+        """
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = StageHistogram(self.buckets)
+            histogram.observe(seconds)
+
+        if self.json_log:
+            logger.info(json.dumps({
+                'event': 'stage_timing',
+                'stage': stage,
+                'duration_ms': round(seconds * 1000, 3),
+                'ts': time.time(),
+            }))
+
+    @contextmanager
+    def _span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def span(self, stage: str):
+        """
+        Context manager that times the enclosed block
+
+        Args:
+            stage: Name of the pipeline stage
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._span(stage)
+
+    def timed(self, stage: str):
+        """
+        Decorator that times every call of the wrapped function
+
+        Args:
+            stage: Name of the pipeline stage
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(stage, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict:
+        """
+        Get the current histograms
+
+        Returns:
+            Dictionary mapping stage name to histogram summary
+        """
+        with self._lock:
+            return {stage: h.to_dict() for stage, h in sorted(self._histograms.items())}
+
+    def render_prometheus(self) -> str:
+        """
+        Render all histograms in the Prometheus text exposition format
+
+        Returns:
+            Exposition text
+        """
+        lines = [
+            '# HELP forklift_stage_duration_seconds Latency of quote pipeline stages',
+            '# TYPE forklift_stage_duration_seconds histogram',
+        ]
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'forklift_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'forklift_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'forklift_stage_duration_seconds_sum{{stage="{stage}"}} {h.total}')
+                lines.append(f'forklift_stage_duration_seconds_count{{stage="{stage}"}} {h.count}')
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry used by the pipeline modules
+metrics = Metrics(
+    enabled=os.environ.get('FORKLIFT_METRICS') == '1',
+    json_log=os.environ.get('FORKLIFT_METRICS_JSON') == '1',
+)
+
+_server = None
+_server_lock = threading.Lock()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves /metrics (Prometheus text) and /metrics.json"""
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            body = metrics.render_prometheus().encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        elif self.path == '/metrics.json':
+            body = json.dumps(metrics.snapshot()).encode('utf-8')
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep scrapes out of the application output
+        pass
+
+
+def start_metrics_server(port: int = 9108, host: str = '127.0.0.1'):
+    """
+    Start the local metrics endpoint in a background thread.
+
+    Safe to call on every Streamlit rerun; only the first call starts a server.
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind to
+
+    Returns:
+        The running HTTP server
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            thread = threading.Thread(target=_server.serve_forever, name='forklift-metrics', daemon=True)
+            thread.start()
+        return _server
@@ -0,0 +1,121 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+# Rates in the schedule include GST at 10%, so GST is 1/11 of a GST-inclusive amount
+GST_DIVISOR = 11
+DEPOSIT_PERCENT = 20
+
+# Rounding rules (all amounts are non-negative integer cents, halves round up):
+# - daily tier (1-7 days): line = daily rate x days, exact
+# - weekly tiers (8+ days): line = weekly rate x days / 7, rounded once per unit;
+#   the displayed daily-equivalent rate is weekly rate / 7, rounded separately
+# - quantities multiply the rounded per-unit line
+# - deposit = 20% of the quote total, GST = 1/11 of the quote total, each rounded once
+
+
+def to_cents(amount) -> int:
+    """
+    Convert a dollar amount to integer cents (half up)
+
+    Args:
+        amount: Number or numeric string such as "$ 1,234.50"
+
+    Returns:
+        Integer cents
+    """
+    text = str(amount).replace('$', '').replace(',', '').strip()
+    return int((Decimal(text) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def to_cents_array(amounts) -> np.ndarray:
+    """
+    Convert dollar amounts to an int64 cents array (NaN becomes -1, i.e. unpriced)
+
+    Schedule rates have at most two decimals, so rounding the scaled float is exact.
+    """
+    amounts = np.asarray(amounts, dtype=float)
+    cents = np.floor(amounts * 100 + 0.5)
+    return np.where(np.isnan(cents), -1, cents).astype(np.int64)
+
+
+def to_dollars(cents):
+    """Convert integer cents (scalar or array) to dollars as float"""
+    if isinstance(cents, np.ndarray):
+        return cents / 100
+    return int(cents) / 100
+
+
+def format_money(cents) -> str:
+    """Format integer cents as "$1234.56" without going through float"""
+    cents = int(cents)
+    sign = '-' if cents < 0 else ''
+    dollars, remainder = divmod(abs(cents), 100)
+    return f"{sign}${dollars}.{remainder:02d}"
+
+
+def _div_half_up(numerator, denominator):
+    # Integer division rounding halves up; valid for non-negative numerators
+    return (numerator * 2 + denominator) // (denominator * 2)
+
+
+def _check_priced(cents):
+    # to_cents_array marks a missing rate as -1 cent; it must never reach a total
+    if np.any(np.asarray(cents) < 0):
+        raise ValueError("A missing rate (the -1 cent sentinel) cannot be priced")
+    return cents
+
+
+def daily_rate_cents(daily, weekly_short, weekly_long, days):
+    """
+    Daily (or daily-equivalent) rate for a rental duration
+
+    Args:
+        daily, weekly_short, weekly_long: Tier rates in cents (scalars or int64 arrays)
+        days: Rental days (scalar or array, broadcast against the rates)
+
+    Returns:
+        Cents, with the same shape as the broadcast inputs
+
+    Raises:
+        ValueError: If a line's tier rate is missing (negative)
+    """
+    days = np.asarray(days, dtype=np.int64)
+    weekly_short, weekly_long = np.asarray(weekly_short, dtype=np.int64), np.asarray(weekly_long, dtype=np.int64)
+    rate = np.where(days <= 7, daily, np.where(days <= 28, weekly_short, weekly_long))
+    _check_priced(rate)
+    return np.where(days <= 7, daily,
+                    np.where(days <= 28, _div_half_up(weekly_short, 7), _div_half_up(weekly_long, 7)))
+
+
+def line_total_cents(daily, weekly_short, weekly_long, days, quantity=1):
+    """
+    Total for a quote line under the tier rounding rules
+
+    Args:
+        daily, weekly_short, weekly_long: Tier rates in cents (scalars or int64 arrays)
+        days: Rental days (scalar or array)
+        quantity: Units (scalar or array)
+
+    Returns:
+        Cents as int64 (array when any input is an array)
+
+    Raises:
+        ValueError: If a line's tier rate is missing (negative)
+    """
+    days = np.asarray(days, dtype=np.int64)
+    # Express every tier as a weekly rate (daily x 7) so one rounded division covers all of
+    # them; for the daily tier the division is exact
+    weekly = _check_priced(np.where(days <= 7, np.asarray(daily, dtype=np.int64) * 7,
+                                    np.where(days <= 28, weekly_short, weekly_long)))
+    return (weekly * days * 2 + 7) // 14 * np.asarray(quantity, dtype=np.int64)
+
+
+def deposit_cents(total_cents):
+    """Deposit due on a quote total"""
+    return _div_half_up(np.asarray(total_cents, dtype=np.int64) * DEPOSIT_PERCENT, 100)
+
+
+def gst_cents(total_cents):
+    """GST component of a GST-inclusive total"""
+    return _div_half_up(np.asarray(total_cents, dtype=np.int64), GST_DIVISOR)
@@ -3,6 +3,8 @@ import tempfile
 import os
 from datetime import datetime
 
+from src.metrics import metrics
+
 class PDFGenerator:
     """
     Generates PDF files for forklift rental quotes
@@ -23,6 +25,7 @@ class PDFGenerator:
         # Use built-in fonts for reliability across environments
         self.pdf.set_font('Helvetica', '', 10)
         
+    @metrics.timed('render_pdf')
     def generate_pdf(self):
         """
         Generate the PDF document
@@ -34,7 +37,48 @@ class PDFGenerator:
             return None
             
         formatted_quote = self.quote_info['formatted_quote']
+        self._build_document(formatted_quote)
+        
+        try:
+            # Save the PDF to a temporary file
+            temp_dir = tempfile.gettempdir()
+            quote_number = formatted_quote['title'].split('#')[-1].strip() if '#' in formatted_quote['title'] else 'quote'
+            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            pdf_path = os.path.join(temp_dir, f"Forklift_Rental_Quote_{quote_number}_{timestamp}.pdf")
+            
+            self.pdf.output(pdf_path)
+            
+            # Verify the file was created
+            if os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0:
+                return pdf_path
+            else:
+                print(f"Error: PDF file was not created properly at {pdf_path}")
+                return None
+        except Exception as e:
+            print(f"Error generating PDF: {str(e)}")
+            return None
+    
+    @metrics.timed('render_pdf')
+    def get_pdf_bytes(self):
+        """
+        Generate the PDF document in memory
+        
+        Returns:
+            PDF document as bytes, or None if the quote was not successful
+        """
+        if not self.quote_info.get('success', False):
+            return None
         
+        self._build_document(self.quote_info['formatted_quote'])
+        
+        # FPDF 1.x returns a latin-1 str, fpdf2 returns a bytearray
+        output = self.pdf.output(dest='S')
+        if isinstance(output, str):
+            return output.encode('latin-1')
+        return bytes(output)
+    
+    def _build_document(self, formatted_quote):
+        """Lay out all pages of the quote document"""
         # Add the first page
         self.pdf.add_page()
         
@@ -48,6 +92,8 @@ class PDFGenerator:
         # Add quote sections
         self._add_section(formatted_quote['model_info'])
         self._add_section(formatted_quote['rental_info'])
+        if formatted_quote.get('line_items_info', {}).get('items'):
+            self._add_section(formatted_quote['line_items_info'])
         self._add_section(formatted_quote['pricing_info'])
         self._add_text_section(formatted_quote['recommendations'])
         self._add_text_section(formatted_quote['safety_info'])
@@ -59,25 +105,6 @@ class PDFGenerator:
         # Add brochure excerpt in a separate page
         self.pdf.add_page()
         self._add_text_section(formatted_quote['brochure'], include_full_text=True)
-        
-        try:
-            # Save the PDF to a temporary file
-            temp_dir = tempfile.gettempdir()
-            quote_number = formatted_quote['title'].split('#')[-1].strip() if '#' in formatted_quote['title'] else 'quote'
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-            pdf_path = os.path.join(temp_dir, f"Forklift_Rental_Quote_{quote_number}_{timestamp}.pdf")
-            
-            self.pdf.output(pdf_path)
-            
-            # Verify the file was created
-            if os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0:
-                return pdf_path
-            else:
-                print(f"Error: PDF file was not created properly at {pdf_path}")
-                return None
-        except Exception as e:
-            print(f"Error generating PDF: {str(e)}")
-            return None
     
     def _add_header(self, title, date):
         """Add the header section to the PDF"""
@@ -108,7 +135,7 @@ class PDFGenerator:
         self.pdf.set_font('Helvetica', 'B', 14)
         self.pdf.set_fill_color(255, 107, 0)  # Orange
         self.pdf.set_text_color(0, 0, 0)  # Black
-        self.pdf.cell(0, 10, section_info['title'], 0, 1, 'L', ln=1)
+        self.pdf.cell(0, 10, section_info['title'], 0, 1, 'L')
         
         # Add items as a table
         items = section_info['items']
@@ -134,7 +161,7 @@ class PDFGenerator:
         self.pdf.set_font('Helvetica', 'B', 14)
         self.pdf.set_fill_color(255, 107, 0)  # Orange
         self.pdf.set_text_color(0, 0, 0)  # Black
-        self.pdf.cell(0, 10, section_info['title'], 0, 1, 'L', ln=1)
+        self.pdf.cell(0, 10, section_info['title'], 0, 1, 'L')
         
         # Add text content
         self.pdf.set_font('Helvetica', '', 10)
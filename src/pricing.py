@@ -0,0 +1,336 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.money import daily_rate_cents, line_total_cents, to_cents_array, to_dollars
+
+DAILY_COLUMN = 'Daily Rate (Inc GST) 0-7 Days'
+WEEKLY_SHORT_COLUMN = 'Weekly Rate (Inc GST) 8-28 Days'
+WEEKLY_LONG_COLUMN = 'Weekly Rate (Inc GST) 28+ Days'
+
+# Rate tiers and the schedule column each one is priced from
+TIERS = {
+    'daily': DAILY_COLUMN,
+    'weekly_short': WEEKLY_SHORT_COLUMN,
+    'weekly_long': WEEKLY_LONG_COLUMN,
+}
+
+# How a forklift is priced when its tonnage is not on the schedule:
+# - round_up: the smallest scheduled tonnage that covers it
+# - interpolate: each tier linearly between the neighbouring tonnages, rounded to the cent
+# Capacities beyond the schedule take the nearest end; ForkliftData(rate_overrides=...)
+# pins individual models to a schedule row.
+RATE_RULES = ('round_up', 'interpolate')
+RATE_RULE = os.environ.get('FORKLIFT_RATE_RULE', 'round_up')
+
+# Used for every tier when the schedule has no forklift rows at all
+DEFAULT_RATES = {'daily': 50.0, 'weekly_short': 280.0, 'weekly_long': 200.0}
+
+# Spellings of fuel types in spec tables and rate descriptions
+FUEL_TYPES = {'diesel': 'Diesel', 'lpg': 'LPG', 'electric': 'Electric', 'battery': 'Electric', 'petrol': 'Petrol'}
+
+# Words that never identify a piece of equipment on their own
+_STOP_WORDS = {
+    'a', 'an', 'and', 'the', 'with', 'for', 'of', 'to', 'x', 'need', 'needs', 'want', 'also',
+    'plus', 'please', 'some', 'one', 'package', 'suit', 'we', 'i', 'would', 'like',
+}
+
+# Words that describe a variant of a machine rather than name one; a request
+# made only of these (plus sizes) never matches a row on its own
+_QUALIFIERS = {
+    'heavy', 'duty', 'light', 'medium', 'large', 'small', 'mini', 'big', 'smooth', 'double', 'single',
+    'drum', 'diamond', 'zero', 'swing', 'trailer', 'reversible', 'remote', 'control', 'upright',
+    'airless', 'articulated', 'padfoot', 'attachment', 'vacuum', 'in', 'to', 'suit',
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens of a description or free-text answer, with plurals folded"""
+    tokens = []
+    for token in re.findall(r'[a-z0-9]+(?:\.[0-9]+[a-z]*)?', str(text).lower()):
+        if token in _STOP_WORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss') and token.isalpha():
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def rate_key(description) -> Tuple[str, Optional[float]]:
+    """
+    Identity of a rate schedule row: its normalized description and tonnage
+
+    Args:
+        description: Equipment description, e.g. "Diesel 2.5t Forklift "
+
+    Returns:
+        Tuple of (lower-case description, tonnage or None)
+    """
+    text = ' '.join(str(description).split()).lower()
+    tonnage = re.search(r'(\d+(?:\.\d+)?)\s*t\b', text)
+    return text, float(tonnage.group(1)) if tonnage else None
+
+
+def forklift_rate_key(description) -> Optional[Tuple[str, float]]:
+    """
+    Fuel type and tonnage of a forklift rate row
+
+    Args:
+        description: Equipment description, e.g. "LPG  2.5t Forklift "
+
+    Returns:
+        Tuple of (fuel type, tonnage), or None for rows that are not forklifts
+    """
+    text, tonnage = rate_key(description)
+    words = text.split()
+    if tonnage is None or 'forklift' not in words:
+        return None
+    fuel = next((FUEL_TYPES[w] for w in words if w in FUEL_TYPES), None)
+    return (fuel, tonnage) if fuel else None
+
+
+def rate_tier(days) -> str:
+    """Name of the rate tier that prices a rental of `days` days"""
+    if days <= 7:
+        return 'daily'
+    if days <= 28:
+        return 'weekly_short'
+    return 'weekly_long'
+
+
+class RateIndex:
+    """
+    The full rate schedule as column arrays, so any number of quote lines
+    can be priced in one vectorized pass.
+    """
+
+    def __init__(self, rates_df):
+        """
+        Build the index from the cleaned rates DataFrame
+
+        Args:
+            rates_df: ForkliftData.rates_df
+        """
+        self.descriptions = [str(d).strip() for d in rates_df['Equipment Description']]
+        self.daily = rates_df[DAILY_COLUMN].to_numpy(dtype=float)
+        self.weekly_short = rates_df[WEEKLY_SHORT_COLUMN].to_numpy(dtype=float)
+        self.weekly_long = rates_df[WEEKLY_LONG_COLUMN].to_numpy(dtype=float)
+        self.priced = ~(np.isnan(self.daily) | np.isnan(self.weekly_short) | np.isnan(self.weekly_long))
+        self.daily_cents = to_cents_array(self.daily)
+        self.weekly_short_cents = to_cents_array(self.weekly_short)
+        self.weekly_long_cents = to_cents_array(self.weekly_long)
+
+        self._tokens = [set(tokenize(d)) for d in self.descriptions]
+        # Tokens that name the equipment: not a qualifier and not a size such as 300mm or 2.5t
+        self._nouns = [
+            {t for t in tokens if t not in _QUALIFIERS and not any(c.isdigit() for c in t)}
+            for tokens in self._tokens
+        ]
+        self._by_description = {d.lower(): i for i, d in enumerate(self.descriptions)}
+
+    def __len__(self):
+        return len(self.descriptions)
+
+    def lookup(self, description: str) -> Optional[int]:
+        """Get the row of an exact (case-insensitive) description"""
+        return self._by_description.get(str(description).strip().lower())
+
+    def search(self, text: str, exclude: str = 'forklift', require_noun: bool = True) -> Optional[int]:
+        """
+        Find the rate row that best matches a free-text equipment request
+
+        Args:
+            text: Free text such as "auger 300mm" or "3.5t excavator"
+            exclude: Requests and rows mentioning this word are skipped
+                (the forklift itself is matched separately)
+            require_noun: Only match rows sharing a word that names the equipment,
+                so "heavy duty" or "large cab" do not match on an adjective
+
+        Returns:
+            Row number, or None if nothing matches well enough
+        """
+        exact = self.lookup(text)
+        if exact is not None:
+            # A row without rates cannot be quoted, even when named exactly
+            return exact if self.priced[exact] else None
+
+        wanted = set(tokenize(text))
+        if not wanted or (exclude and exclude in wanted):
+            return None
+
+        best, best_score = None, 0.0
+        for i, tokens in enumerate(self._tokens):
+            if not self.priced[i] or (exclude and exclude in tokens):
+                continue
+            overlap = len(wanted & tokens)
+            if overlap == 0 or (require_noun and not wanted & self._nouns[i]):
+                continue
+            # Prefer rows that explain most of the request and are mostly covered by it
+            score = overlap / len(wanted) + overlap / len(tokens)
+            if score > best_score:
+                best, best_score = i, score
+
+        # Require at least half of the request to be explained
+        if best is not None and len(wanted & self._tokens[best]) * 2 >= len(wanted):
+            return best
+        return None
+
+    def applied_rates(self, rows, days):
+        """
+        Daily rate for each line given its rate row and rental days
+
+        Args:
+            rows: Array of row numbers
+            days: Array of rental days per line
+
+        Returns:
+            Array of applied daily rates
+        """
+        rows = np.asarray(rows, dtype=int)
+        return to_dollars(daily_rate_cents(self.daily_cents[rows], self.weekly_short_cents[rows],
+                                           self.weekly_long_cents[rows], days))
+
+    def price(self, rows, days, quantities=None) -> Dict:
+        """
+        Price many quote lines in a single pass
+
+        Args:
+            rows: Row number per line
+            days: Rental days per line
+            quantities: Units per line (1 if omitted)
+
+        Returns:
+            Dictionary with 'applied_rates' and 'line_totals' arrays and the 'total',
+            plus exact 'line_totals_cents' and 'total_cents'
+
+        Raises:
+            ValueError: If a row has no rates
+        """
+        rows = np.asarray(rows, dtype=int)
+        if not self.priced[rows].all():
+            raise ValueError(f"Rate rows without rates cannot be priced: "
+                             f"{sorted({self.descriptions[r] for r in rows[~self.priced[rows]]})}")
+        days = np.asarray(days, dtype=np.int64)
+        quantities = np.ones(len(days), dtype=np.int64) if quantities is None else np.asarray(quantities, dtype=np.int64)
+        cents = line_total_cents(self.daily_cents[rows], self.weekly_short_cents[rows],
+                                 self.weekly_long_cents[rows], days, quantities)
+        total_cents = int(cents.sum())
+        return {
+            'applied_rates': self.applied_rates(rows, days),
+            'line_totals': to_dollars(cents),
+            'total': to_dollars(total_cents),
+            'line_totals_cents': cents,
+            'total_cents': total_cents,
+        }
+
+
+class RateCurve:
+    """
+    Piecewise pricing curve per fuel type and rate tier over the scheduled
+    forklift tonnages, so every capacity has one exact rate however the
+    schedule rows are ordered.
+    """
+
+    def __init__(self, rates_df, rule: str = RATE_RULE, overrides: Optional[Dict[str, str]] = None):
+        """
+        Build the curves from the cleaned rates DataFrame
+
+        Args:
+            rates_df: ForkliftData.rates_df
+            rule: One of RATE_RULES, for tonnages between scheduled ones
+            overrides: Optional mapping of model to the description of the
+                schedule row it is always priced from
+
+        Raises:
+            ValueError: For an unknown rule or an override naming no priced row
+        """
+        if rule not in RATE_RULES:
+            raise ValueError(f"Unknown rate rule: {rule} (expected one of {', '.join(RATE_RULES)})")
+        self.rule = rule
+
+        descriptions = [str(d).strip() for d in rates_df['Equipment Description']]
+        cents = np.stack([to_cents_array(rates_df[column].to_numpy(dtype=float)) for column in TIERS.values()])
+        priced = (cents >= 0).all(axis=0)
+
+        # Later rows win for a repeated tonnage, as they do for repeated descriptions
+        points = {}
+        for i, description in enumerate(descriptions):
+            key = forklift_rate_key(description)
+            if key is not None and priced[i]:
+                points.setdefault(key[0], {})[key[1]] = i
+
+        self.curves = {}
+        for fuel, rows in points.items():
+            tonnages = sorted(rows)
+            order = [rows[t] for t in tonnages]
+            self.curves[fuel] = {
+                'tonnage': np.array(tonnages, dtype=float),
+                'cents': cents[:, order],
+                'descriptions': np.array([descriptions[i] for i in order], dtype=object),
+            }
+
+        by_description = {d.lower(): i for i, d in enumerate(descriptions)}
+        self.overrides = {}
+        for model, description in (overrides or {}).items():
+            i = by_description.get(str(description).strip().lower())
+            if i is None or not priced[i]:
+                raise ValueError(f"Rate override for {model}: no priced schedule row '{description}'")
+            self.overrides[model] = (cents[:, i], descriptions[i])
+
+    def curve_for(self, fuel_type) -> Optional[Dict]:
+        """Curve of a fuel type; fuels without scheduled rows use the diesel curve"""
+        return self.curves.get(fuel_type) or self.curves.get('Diesel')
+
+    def evaluate(self, fuel_types, capacities, models=None) -> Dict:
+        """
+        Rates of many forklifts in one vectorized pass per fuel type
+
+        Args:
+            fuel_types: Fuel type per forklift
+            capacities: Capacity in tons per forklift
+            models: Optional model names, to apply overrides
+
+        Returns:
+            Dictionary with int64 'daily_cents', 'weekly_short_cents' and 'weekly_long_cents'
+            arrays (DEFAULT_RATES where nothing prices a forklift), the 'descriptions' of
+            the schedule rows each rate is read from (the row at or above the capacity when
+            interpolating), and a 'priced' mask
+        """
+        fuel_types = np.asarray(fuel_types, dtype=object)
+        capacities = np.asarray(capacities, dtype=float)
+        cents = np.tile(to_cents_array(list(DEFAULT_RATES.values()))[:, None], len(capacities))
+        descriptions = np.full(len(capacities), '', dtype=object)
+        priced = np.zeros(len(capacities), dtype=bool)
+
+        for fuel in dict.fromkeys(fuel_types):
+            curve = self.curve_for(fuel)
+            if curve is None:
+                continue
+            rows = np.flatnonzero(fuel_types == fuel)
+            # Smallest scheduled tonnage at or above the capacity (the largest one beyond it)
+            upper = np.minimum(np.searchsorted(curve['tonnage'], capacities[rows], side='left'),
+                               len(curve['tonnage']) - 1)
+            if self.rule == 'interpolate':
+                for tier in range(len(TIERS)):
+                    values = np.interp(capacities[rows], curve['tonnage'], curve['cents'][tier])
+                    cents[tier, rows] = np.floor(values + 0.5).astype(np.int64)
+            else:
+                cents[:, rows] = curve['cents'][:, upper]
+            descriptions[rows] = curve['descriptions'][upper]
+            priced[rows] = True
+
+        if models is not None and self.overrides:
+            for i, model in enumerate(models):
+                if model in self.overrides:
+                    cents[:, i], descriptions[i] = self.overrides[model]
+                    priced[i] = True
+
+        return {
+            'daily_cents': cents[0],
+            'weekly_short_cents': cents[1],
+            'weekly_long_cents': cents[2],
+            'descriptions': descriptions,
+            'priced': priced,
+        }
@@ -1,6 +1,10 @@
-from typing import Dict
+from typing import Dict, List
 import datetime
 
+from src.availability import to_date
+from src.metrics import metrics
+from src.money import deposit_cents, format_money, gst_cents, to_cents, to_dollars
+
 class QuoteGenerator:
     """
     Generates quotes for forklift rentals
@@ -15,6 +19,7 @@ class QuoteGenerator:
         """
         self.data = forklift_data
     
+    @metrics.timed('quote_generate')
     def generate_quote(self, forklift_match: Dict) -> Dict:
         """
         Generate a quote based on the matched forklift and requirements
@@ -37,7 +42,10 @@ class QuoteGenerator:
         
         # Calculate dates
         today = datetime.date.today()
-        rental_start = today + datetime.timedelta(days=1)  # Default to tomorrow
+        if rental_details.get('start_date'):
+            rental_start = to_date(rental_details['start_date'])
+        else:
+            rental_start = today + datetime.timedelta(days=1)  # Default to tomorrow
         rental_end = rental_start + datetime.timedelta(days=rental_details['days'] - 1)
         
         # Format dates
@@ -46,7 +54,9 @@ class QuoteGenerator:
         
         # Calculate costs
         daily_rate = rental_details['rates']['applied_rate']
-        total_cost = rental_details['rates']['total_cost']
+        line_items = self._price_line_items(forklift, rental_details, forklift_match.get('line_items', []))
+        total_cents = sum(line['line_total_cents'] for line in line_items)
+        deposit = int(deposit_cents(total_cents))
         
         # Create the quote
         quote = {
@@ -56,7 +66,8 @@ class QuoteGenerator:
                 'model': forklift['model'],
                 'capacity': f"{forklift['capacity_tons']} tons",
                 'fuel_type': forklift['fuel_type'],
-                'series': forklift['series']
+                'series': forklift['series'],
+                'quantity': sum(p['quantity'] for p in rental_details.get('unit_periods', [])) or 1
             },
             'rental_period': {
                 'days': rental_details['days'],
@@ -65,21 +76,30 @@ class QuoteGenerator:
             },
             'pricing': {
                 'daily_rate': daily_rate,
-                'total_rental_cost': total_cost,
+                'total_rental_cost': to_dollars(total_cents),
                 'gst_included': True,
-                'deposit_required': total_cost * 0.20,  # 20% deposit
+                'gst_component': to_dollars(int(gst_cents(total_cents))),
+                'deposit_required': to_dollars(deposit),  # 20% deposit
+                'total_rental_cost_cents': total_cents,
+                'deposit_cents': deposit,
             },
             'terms_conditions': self._get_terms_conditions(),
             'recommendations': forklift_match.get('recommendations', ''),
-            'safety_info': forklift_match.get('safety_info', '')
+            'safety_info': forklift_match.get('safety_info', ''),
+            'indoor_outdoor': forklift_match.get('indoor_outdoor', 'both'),
+            'line_items': line_items,
+            'alternatives': forklift_match.get('alternatives', [])
         }
         
         return {
             'success': True,
             'quote': quote,
-            'brochure_excerpt': forklift_match.get('brochure_excerpt', '')
+            'brochure_excerpt': forklift_match.get('brochure_excerpt', ''),
+            'brochure_key': forklift_match.get('brochure_key'),
+            'brochure_truncated': forklift_match.get('brochure_truncated', False)
         }
     
+    @metrics.timed('quote_format')
     def format_quote_for_display(self, quote_result: Dict) -> Dict:
         """
         Format the quote for display in the UI
@@ -110,7 +130,10 @@ class QuoteGenerator:
                     {'label': 'Capacity', 'value': quote['forklift']['capacity']},
                     {'label': 'Fuel Type', 'value': quote['forklift']['fuel_type']},
                     {'label': 'Series', 'value': quote['forklift']['series']}
-                ]
+                ] + (
+                    [{'label': 'Quantity', 'value': f"{quote['forklift']['quantity']} units"}]
+                    if quote['forklift'].get('quantity', 1) > 1 else []
+                )
             },
             'rental_info': {
                 'title': 'Rental Period',
@@ -120,13 +143,24 @@ class QuoteGenerator:
                     {'label': 'Duration', 'value': f"{quote['rental_period']['days']} days"}
                 ]
             },
+            'line_items_info': {
+                'title': 'Quote Lines',
+                # A single forklift needs no breakdown beyond the pricing details
+                'items': [
+                    {
+                        'label': f"{line['quantity']} x {line['description']} ({line['days']} days)",
+                        'value': format_money(line['line_total_cents'])
+                    }
+                    for line in quote.get('line_items', [])
+                ] if len(quote.get('line_items', [])) > 1 else []
+            },
             'pricing_info': {
                 'title': 'Pricing Details',
                 'items': [
                     {'label': 'Daily Rate', 'value': f"${quote['pricing']['daily_rate']:.2f}"},
-                    {'label': 'Total Rental Cost', 'value': f"${quote['pricing']['total_rental_cost']:.2f}"},
+                    {'label': 'Total Rental Cost', 'value': format_money(quote['pricing']['total_rental_cost_cents'])},
                     {'label': 'GST', 'value': 'Included in price'},
-                    {'label': 'Deposit Required', 'value': f"${quote['pricing']['deposit_required']:.2f}"}
+                    {'label': 'Deposit Required', 'value': format_money(quote['pricing']['deposit_cents'])}
                 ]
             },
             'recommendations': {
@@ -143,7 +177,20 @@ class QuoteGenerator:
             },
             'brochure': {
                 'title': 'Forklift Specifications',
-                'text': brochure
+                'text': brochure,
+                'key': quote_result.get('brochure_key'),
+                'truncated': quote_result.get('brochure_truncated', False)
+            },
+            'alternatives': {
+                'title': 'Alternative Options',
+                'items': [
+                    {
+                        'label': alternative['model'],
+                        'value': f"{alternative['capacity_tons']} tons {alternative['fuel_type']}, "
+                                 f"${alternative['total_cost']:.2f} total"
+                    }
+                    for alternative in quote.get('alternatives', [])
+                ]
             }
         }
         
@@ -152,6 +199,59 @@ class QuoteGenerator:
             'formatted_quote': quote_info
         }
     
+    def _price_line_items(self, forklift: Dict, rental_details: Dict, extra_lines: List[Dict]) -> List[Dict]:
+        """
+        Build the priced quote lines: the matched forklift first, then any
+        machines and attachments, priced together in one vectorized pass
+        
+        Args:
+            forklift: Matched forklift details
+            rental_details: Rental days and rates for the forklift
+            extra_lines: Lines from ForkliftMatcher.match_equipment
+            
+        Returns:
+            List of line dictionaries with applied_rate and line_total
+        """
+        description = f"{forklift['model']} {forklift['fuel_type']} Forklift"
+        if rental_details.get('unit_periods'):
+            # Fleet orders were priced per group by the matcher
+            lines = [
+                dict(group, description=description,
+                     line_total_cents=group.get('line_total_cents', to_cents(group['line_total'])))
+                for group in rental_details['unit_periods']
+            ]
+        else:
+            lines = [{
+                'description': description,
+                'quantity': 1,
+                'days': rental_details['days'],
+                'applied_rate': rental_details['rates']['applied_rate'],
+                'line_total': rental_details['rates']['total_cost'],
+                # Matches built elsewhere may only carry the dollar total
+                'line_total_cents': rental_details['rates'].get(
+                    'total_cost_cents', to_cents(rental_details['rates']['total_cost'])
+                )
+            }]
+        if not extra_lines:
+            return lines
+        
+        priced = self.data.get_rate_index().price(
+            [line['rate_row'] for line in extra_lines],
+            [line['days'] for line in extra_lines],
+            [line['quantity'] for line in extra_lines]
+        )
+        for line, rate, cents in zip(extra_lines, priced['applied_rates'].tolist(),
+                                     priced['line_totals_cents'].tolist()):
+            lines.append({
+                'description': line['description'],
+                'quantity': line['quantity'],
+                'days': line['days'],
+                'applied_rate': rate,
+                'line_total': to_dollars(cents),
+                'line_total_cents': cents
+            })
+        return lines
+    
     def _get_terms_conditions(self) -> str:
         """
         Get the terms and conditions for the rental
@@ -0,0 +1,240 @@
+import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.features import covers
+from src.money import daily_rate_cents, line_total_cents, to_dollars
+
+# Penalty (0 = ideal) for each fuel type by usage environment
+FUEL_SUITABILITY = {
+    'indoor': {'Electric': 0.0, 'LPG': 0.2, 'Diesel': 1.0},
+    'outdoor': {'Diesel': 0.0, 'LPG': 0.3, 'Electric': 0.6},
+    'both': {'LPG': 0.0, 'Diesel': 0.3, 'Electric': 0.4},
+}
+
+# Relative weight of each score component
+SCORE_WEIGHTS = {'headroom': 1.0, 'price': 1.0, 'fuel': 0.5}
+
+
+class CandidateTable:
+    """
+    Column arrays describing every model, sorted by capacity and built once
+    per catalog, so ranking an inquiry is a slice plus a partial sort.
+    """
+
+    def __init__(self, forklift_data):
+        """
+        Build the table from the catalog
+
+        Args:
+            forklift_data: Instance of ForkliftData
+        """
+        specs = forklift_data.specs_df.sort_values('capacity_tons').reset_index(drop=True)
+        self.models = specs['model'].to_numpy(dtype=object)
+        self.capacity = specs['capacity_tons'].to_numpy(dtype=float)
+        self.fuel_types = specs['fuel_type'].to_numpy(dtype=object)
+        self.rows = specs
+
+        rates = forklift_data.get_model_rates()
+        order = [rates['index'][model] for model in self.models]
+        self.daily_cents = rates['daily_cents'][order]
+        self.weekly_short_cents = rates['weekly_short_cents'][order]
+        self.weekly_long_cents = rates['weekly_long_cents'][order]
+        self.daily = to_dollars(self.daily_cents)
+        self.weekly_short = to_dollars(self.weekly_short_cents)
+        self.weekly_long = to_dollars(self.weekly_long_cents)
+
+        # Fuel penalty per environment as a column aligned with the models
+        self.fuel_penalty = {
+            environment: np.array([penalties.get(f, 1.0) for f in self.fuel_types])
+            for environment, penalties in FUEL_SUITABILITY.items()
+        }
+
+        # Feature bitset per model, so requirement checks are a bitwise AND
+        self.features = np.array([forklift_data.get_model_features(model) for model in self.models], dtype=np.uint64)
+        
+        self._index = {model: i for i, model in enumerate(self.models)}
+
+    def __len__(self):
+        return len(self.models)
+
+    def __contains__(self, model):
+        return model in self._index
+
+    def index_of(self, model: str) -> int:
+        """Column of a model in the table"""
+        return self._index[model]
+
+    def features_of(self, models) -> np.ndarray:
+        """Feature bitsets of several models"""
+        return self.features[[self._index[model] for model in models]]
+    
+    def rates_for(self, model: str, rental_days: int) -> Dict:
+        """
+        Rates of one model for a rental duration, as ForkliftData.get_rate_for_model
+        returns them, read from the table instead of scanning the schedule
+        
+        Args:
+            model: Model name
+            rental_days: Rental days
+            
+        Returns:
+            Dictionary with the tier rates, applied rate and total (dollars and cents)
+        """
+        i = self._index[model]
+        tiers = (self.daily_cents[i], self.weekly_short_cents[i], self.weekly_long_cents[i])
+        applied_cents = int(daily_rate_cents(*tiers, rental_days))
+        total_cents = int(line_total_cents(*tiers, rental_days))
+        return {
+            "daily": float(self.daily[i]),
+            "weekly_short": float(self.weekly_short[i]),
+            "weekly_long": float(self.weekly_long[i]),
+            "applied_rate": to_dollars(applied_cents),
+            "total_cost": to_dollars(total_cents),
+            "applied_rate_cents": applied_cents,
+            "total_cost_cents": total_cents
+        }
+    
+    def applied_rates(self, rental_days):
+        """
+        Daily rate per model for one or many rental durations
+
+        Args:
+            rental_days: Scalar or array of rental days
+
+        Returns:
+            Array of shape (len(table),) or (len(days), len(table))
+        """
+        days = np.asarray(rental_days, dtype=np.int64)[..., None]
+        return to_dollars(daily_rate_cents(self.daily_cents, self.weekly_short_cents, self.weekly_long_cents, days))
+    
+    def line_totals_cents(self, rental_days, quantities=1):
+        """
+        Exact rental total per model for one or many durations
+        
+        Args:
+            rental_days: Scalar or array of rental days
+            quantities: Units per duration (scalar or array)
+            
+        Returns:
+            int64 cents of shape (len(table),) or (len(days), len(table))
+        """
+        days = np.asarray(rental_days, dtype=np.int64)[..., None]
+        quantities = np.asarray(quantities, dtype=np.int64)[..., None]
+        return line_total_cents(self.daily_cents, self.weekly_short_cents, self.weekly_long_cents, days, quantities)
+
+
+class ForkliftRanker:
+    """
+    Ranks candidate forklifts by capacity headroom, total price, fuel
+    suitability and availability.
+    """
+
+    def __init__(self, table: CandidateTable, availability=None, weights: Optional[Dict] = None):
+        """
+        Initialize the ranker
+
+        Args:
+            table: Precomputed CandidateTable
+            availability: Optional FleetAvailability used to drop booked models
+            weights: Optional overrides for SCORE_WEIGHTS
+        """
+        self.table = table
+        self.availability = availability
+        self.weights = dict(SCORE_WEIGHTS, **(weights or {}))
+
+    def rank(self, required_capacity: float, rental_days: int, indoor_outdoor: str = 'both',
+             k: int = 3, start_date=None, required_features=0) -> List[Dict]:
+        """
+        Rank the top-K models for one inquiry
+
+        Args:
+            required_capacity: Required capacity in tons (including safety margin)
+            rental_days: Number of rental days
+            indoor_outdoor: 'indoor', 'outdoor' or 'both'
+            k: Number of candidates to return
+            start_date: Start date used for availability checks
+            required_features: Feature bitset (see src.features)
+
+        Returns:
+            List of candidate dictionaries, best first
+        """
+        return self.rank_batch([required_capacity], [rental_days], [indoor_outdoor], k, [start_date],
+                               [required_features])[0]
+
+    def rank_batch(self, required_capacities, rental_days, indoor_outdoor, k: int = 3,
+                   start_dates=None, required_features=None) -> List[List[Dict]]:
+        """
+        Rank the top-K models for many inquiries in one vectorized pass
+
+        Args:
+            required_capacities: Required capacity per inquiry
+            rental_days: Rental days per inquiry
+            indoor_outdoor: Environment per inquiry
+            k: Number of candidates per inquiry
+            start_dates: Optional start date per inquiry for availability checks
+            required_features: Optional feature bitset per inquiry; where some adequate
+                model has every feature, models without them are dropped
+
+        Returns:
+            One ranked candidate list per inquiry
+        """
+        table = self.table
+        required = np.asarray(required_capacities, dtype=float)[:, None]
+        days = np.asarray(rental_days, dtype=float)
+        n = len(table)
+        if n == 0 or len(days) == 0:
+            return [[] for _ in range(len(days))]
+
+        # Price and headroom for every (inquiry, model) pair
+        applied = table.applied_rates(days)
+        total = to_dollars(table.line_totals_cents(days))
+        adequate = table.capacity[None, :] >= required
+        if self.availability is not None:
+            adequate &= self._availability_mask(days, start_dates)
+        if required_features is not None:
+            required_bits = np.asarray(required_features, dtype=np.uint64)[:, None]
+            equipped = adequate & covers(table.features[None, :], required_bits)
+            adequate = np.where(equipped.any(axis=1, keepdims=True), equipped, adequate)
+
+        headroom = (table.capacity[None, :] - required) / np.maximum(required, 1e-9)
+        cheapest = np.where(adequate, total, np.inf).min(axis=1, keepdims=True)
+        price = total / np.where(np.isfinite(cheapest), cheapest, 1.0) - 1.0
+        fuel = np.stack([table.fuel_penalty.get(env, table.fuel_penalty['both']) for env in indoor_outdoor])
+
+        scores = (self.weights['headroom'] * headroom
+                  + self.weights['price'] * price
+                  + self.weights['fuel'] * fuel)
+        scores = np.where(adequate, scores, np.inf)
+
+        # Partial sort: only the best k columns per row are ordered
+        k = min(k, n)
+        top = np.argpartition(scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        top = np.take_along_axis(top, np.argsort(top_scores, axis=1), axis=1)
+
+        results = []
+        for i in range(len(days)):
+            ranked = []
+            for j in top[i]:
+                if not np.isfinite(scores[i, j]):
+                    break
+                ranked.append({
+                    'model': table.models[j],
+                    'capacity_tons': float(table.capacity[j]),
+                    'fuel_type': table.fuel_types[j],
+                    'applied_rate': float(applied[i, j]),
+                    'total_cost': float(total[i, j]),
+                    'headroom': float(headroom[i, j]),
+                    'score': float(scores[i, j]),
+                })
+            results.append(ranked)
+        return results
+
+    def _availability_mask(self, days, start_dates):
+        """Boolean (inquiry, model) mask of models with a free unit"""
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        starts = [tomorrow if start_dates is None or start_dates[i] is None else start_dates[i]
+                  for i in range(len(days))]
+        return self.availability.availability_matrix(self.table.models, starts, days)
@@ -0,0 +1,205 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor
+from typing import Dict, Optional
+
+from src.metrics import metrics, StageHistogram
+
+# Minimal quote used to warm worker processes (fonts, FPDF and HTML templates)
+_WARM_UP_QUOTE = {
+    'success': True,
+    'formatted_quote': {
+        'title': 'Forklift Rental Quote #WARMUP',
+        'date': 'Issued: -',
+        'model_info': {'title': 'Forklift Details', 'items': [{'label': 'Model', 'value': '-'}]},
+        'rental_info': {'title': 'Rental Period', 'items': [{'label': 'Duration', 'value': '-'}]},
+        'pricing_info': {'title': 'Pricing Details', 'items': [{'label': 'Daily Rate', 'value': '-'}]},
+        'recommendations': {'title': 'Recommendations', 'text': '-'},
+        'safety_info': {'title': 'Safety Information', 'text': '-'},
+        'terms': {'title': 'Terms & Conditions', 'text': '-'},
+        'brochure': {'title': 'Forklift Specifications', 'text': '-'},
+    }
+}
+
+
+def encode_quote(formatted_quote: Dict) -> bytes:
+    """Serialize a formatted quote into a compact job payload"""
+    return json.dumps(formatted_quote, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _init_worker(low_priority=False):
+    """Preload the renderers in a worker process so the first job is warm"""
+    if low_priority and hasattr(os, 'nice'):
+        os.nice(10)
+    from src.service import render_document
+    render_document(_WARM_UP_QUOTE, 'html')
+    try:
+        render_document(_WARM_UP_QUOTE, 'pdf')
+    except ImportError:
+        pass
+
+
+def _render_job(payload: bytes, fmt: str):
+    """Render one payload in a worker process; returns (document bytes, render seconds)"""
+    from src.service import render_document
+    start = time.perf_counter()
+    document = render_document(json.loads(payload), fmt)
+    if isinstance(document, str):
+        document = document.encode('utf-8')
+    return document, time.perf_counter() - start
+
+
+def _ping():
+    return os.getpid()
+
+
+class RenderPool:
+    """
+    Persistent pool of document rendering processes.
+
+    FPDF rendering is CPU-bound pure Python, so it runs in separate processes
+    instead of the Streamlit/request threads. Interactive and bulk jobs use
+    separate worker lanes so a large bulk run never queues ahead of a user
+    waiting on a single quote; bulk workers also run at lower OS priority.
+    """
+
+    def __init__(self, workers: int = 2, bulk_workers: int = 1, start_method: str = 'spawn'):
+        """
+        Initialize the pool (worker processes start lazily, see warm_up)
+
+        Args:
+            workers: Number of interactive render processes
+            bulk_workers: Number of bulk render processes
+            start_method: multiprocessing start method; 'spawn' is safe with threaded hosts
+        """
+        context = multiprocessing.get_context(start_method)
+        self._lanes = {
+            'interactive': ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker),
+            'bulk': ProcessPoolExecutor(bulk_workers, mp_context=context, initializer=_init_worker,
+                                        initargs=(True,)),
+        }
+        self._sizes = {'interactive': workers, 'bulk': bulk_workers}
+        self._queued = {'interactive': 0, 'bulk': 0}
+        self._completed = {'interactive': 0, 'bulk': 0}
+        self._failed = {'interactive': 0, 'bulk': 0}
+        self._cancelled = {'interactive': 0, 'bulk': 0}
+        self._render_times = {'html': StageHistogram(), 'pdf': StageHistogram()}
+        self._lock = threading.Lock()
+        self.warm = False
+
+    def warm_up(self, timeout: Optional[float] = None):
+        """
+        Start every worker process and wait until they have preloaded the renderers
+
+        Args:
+            timeout: Maximum seconds to wait
+        """
+        futures = []
+        for lane, executor in self._lanes.items():
+            futures.extend(executor.submit(_ping) for _ in range(self._sizes[lane]))
+        for future in futures:
+            future.result(timeout=timeout)
+        self.warm = True
+
+    def submit(self, formatted_quote: Dict, fmt: str = 'pdf', bulk: bool = False) -> Future:
+        """
+        Queue a render job
+
+        Args:
+            formatted_quote: Result of QuoteGenerator.format_quote_for_display
+            fmt: 'pdf' or 'html'
+            bulk: Run on the bulk lane instead of the interactive lane
+
+        Returns:
+            Future resolving to the document bytes (None if the quote was unsuccessful);
+            cancelling it also cancels the job if no worker has started it
+        """
+        lane = 'bulk' if bulk else 'interactive'
+        with self._lock:
+            self._queued[lane] += 1
+
+        result = Future()
+        job = self._lanes[lane].submit(_render_job, encode_quote(formatted_quote), fmt)
+        result.add_done_callback(lambda done: job.cancel() if done.cancelled() else None)
+        job.add_done_callback(lambda done: self._finish(lane, fmt, done, result))
+        return result
+
+    def render(self, formatted_quote: Dict, fmt: str = 'pdf', bulk: bool = False,
+               timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Render a document and wait for the result
+
+        Args:
+            formatted_quote: Result of QuoteGenerator.format_quote_for_display
+            fmt: 'pdf' or 'html'
+            bulk: Run on the bulk lane instead of the interactive lane
+            timeout: Maximum seconds to wait
+
+        Returns:
+            The document bytes
+        """
+        return self.submit(formatted_quote, fmt, bulk).result(timeout=timeout)
+
+    def _finish(self, lane, fmt, done, result):
+        error = None if done.cancelled() else done.exception()
+        with self._lock:
+            self._queued[lane] -= 1
+            if done.cancelled():
+                self._cancelled[lane] += 1
+            elif error is not None:
+                self._failed[lane] += 1
+            else:
+                self._completed[lane] += 1
+
+        if done.cancelled():
+            result.cancel()
+            return
+        if error is None:
+            document, seconds = done.result()
+            with self._lock:
+                self._render_times.setdefault(fmt, StageHistogram()).observe(seconds)
+            if metrics.enabled:
+                metrics.observe(f'render_pool_{fmt}', seconds)
+
+        # The caller may have given up (timeout or cancel) while the job ran
+        if result.cancelled():
+            return
+        try:
+            if error is not None:
+                result.set_exception(error)
+            else:
+                result.set_result(document)
+        except InvalidStateError:
+            pass
+
+    def stats(self) -> Dict:
+        """
+        Get queue and render statistics
+
+        Returns:
+            Dictionary with queue depth and completed, failed and cancelled jobs per lane,
+            and render times
+        """
+        with self._lock:
+            return {
+                'warm': self.warm,
+                'workers': dict(self._sizes),
+                'queue_depth': dict(self._queued),
+                'completed': dict(self._completed),
+                'failed': dict(self._failed),
+                'cancelled': dict(self._cancelled),
+                'render_time': {fmt: h.to_dict() for fmt, h in self._render_times.items()},
+            }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop all worker processes
+
+        Args:
+            wait: Whether to wait for queued jobs to finish
+        """
+        for executor in self._lanes.values():
+            executor.shutdown(wait=wait)
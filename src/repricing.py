@@ -0,0 +1,266 @@
+import itertools
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.matcher import ForkliftMatcher
+from src.money import to_dollars
+from src.pricing import TIERS, rate_key, rate_tier
+from src.quote import QuoteGenerator
+
+
+def _same_rate(old, new) -> bool:
+    old_missing = old is None or (isinstance(old, float) and math.isnan(old))
+    new_missing = new is None or (isinstance(new, float) and math.isnan(new))
+    if old_missing or new_missing:
+        return old_missing and new_missing
+    return math.isclose(float(old), float(new), rel_tol=0, abs_tol=1e-9)
+
+
+def diff_rate_schedules(old_rates, new_rates) -> Dict:
+    """
+    Compare two rate schedules row by row
+
+    Args:
+        old_rates: Previous ForkliftData.rates_df
+        new_rates: Reloaded ForkliftData.rates_df
+
+    Returns:
+        Dictionary with 'changed' rows (each with the changed tiers and old/new rates),
+        and the keys of 'added' and 'removed' rows
+    """
+    old_rows = {rate_key(r['Equipment Description']): r for r in old_rates.to_dict('records')}
+    new_rows = {rate_key(r['Equipment Description']): r for r in new_rates.to_dict('records')}
+
+    changed = []
+    for key in old_rows.keys() & new_rows.keys():
+        old, new = old_rows[key], new_rows[key]
+        tiers = [tier for tier, column in TIERS.items() if not _same_rate(old.get(column), new.get(column))]
+        if tiers:
+            changed.append({
+                'key': key,
+                'description': str(new['Equipment Description']).strip(),
+                'tiers': tiers,
+                'old': {tier: old.get(TIERS[tier]) for tier in tiers},
+                'new': {tier: new.get(TIERS[tier]) for tier in tiers},
+            })
+
+    return {
+        'changed': sorted(changed, key=lambda row: row['key'][0]),
+        'added': sorted(new_rows.keys() - old_rows.keys(), key=lambda key: key[0]),
+        'removed': sorted(old_rows.keys() - new_rows.keys(), key=lambda key: key[0]),
+    }
+
+
+def changed_model_tiers(old_table, new_table) -> Dict[str, List[str]]:
+    """
+    Find which forklift models resolve to different rates after a schedule change
+
+    Models are compared through their resolved candidate table rates, so a
+    model whose rate curve segment was added or removed is caught as well. A
+    model present in only one of the tables has every tier changed.
+
+    Args:
+        old_table: CandidateTable built from the previous schedule
+        new_table: CandidateTable built from the reloaded schedule
+
+    Returns:
+        Mapping of model to the list of changed tiers
+    """
+    old_models, new_models = set(old_table.models), set(new_table.models)
+    changed = {model: list(TIERS) for model in sorted(old_models ^ new_models)}
+    common = [model for model in old_table.models if model in new_models]
+    old_rows = [old_table.index_of(model) for model in common]
+    new_rows = [new_table.index_of(model) for model in common]
+    for tier in TIERS:
+        old = getattr(old_table, tier)[old_rows]
+        new = getattr(new_table, tier)[new_rows]
+        differs = ~(np.isclose(old, new) | (np.isnan(old) & np.isnan(new)))
+        for model in np.asarray(common, dtype=object)[differs]:
+            changed.setdefault(model, []).append(tier)
+    return changed
+
+
+class OpenQuoteBook:
+    """
+    Register of open (not yet accepted or expired) quotes, indexed by the
+    rate tiers each one depends on, so a schedule change only re-prices the
+    quotes that reference a changed model or equipment row.
+    """
+
+    def __init__(self, forklift_data, matcher=None, quote_generator=None):
+        """
+        Initialize the book
+
+        Args:
+            forklift_data: Shared ForkliftData instance
+            matcher: Optional ForkliftMatcher (created over forklift_data if omitted)
+            quote_generator: Optional QuoteGenerator (created over forklift_data if omitted)
+        """
+        self.data = forklift_data
+        self.matcher = matcher or ForkliftMatcher(forklift_data)
+        self.quote_generator = quote_generator or QuoteGenerator(forklift_data)
+        self.quotes = {}       # quote_id -> {'requirements', 'match', 'quote_result', 'dependencies'}
+        self._dependents = {}  # (kind, key, tier) -> {quote_id}
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self.quotes)
+
+    def open(self, requirements: Dict) -> Dict:
+        """
+        Quote an inquiry and keep it open for re-pricing
+
+        Args:
+            requirements: Requirements as produced by ConversationManager
+
+        Returns:
+            The generate_quote result, with 'quote_id' added when successful
+        """
+        forklift_match = self.matcher.match_forklift(requirements)
+        quote_result = self.quote_generator.generate_quote(forklift_match)
+        if not quote_result.get('success', False):
+            return quote_result
+
+        quote_id = next(self._ids)
+        self._store(quote_id, dict(requirements), forklift_match, quote_result)
+        return dict(quote_result, quote_id=quote_id)
+
+    def close(self, quote_id: int) -> bool:
+        """
+        Remove a quote from the book (accepted, declined or expired)
+
+        Args:
+            quote_id: ID returned by open()
+
+        Returns:
+            True if the quote was open
+        """
+        entry = self.quotes.pop(quote_id, None)
+        if entry is None:
+            return False
+        self._unindex(quote_id, entry['dependencies'])
+        return True
+
+    def get(self, quote_id: int) -> Optional[Dict]:
+        """Get the current generate_quote result of an open quote"""
+        entry = self.quotes.get(quote_id)
+        return entry['quote_result'] if entry else None
+
+    def impacted(self, diff: Dict) -> Set[int]:
+        """
+        Find the open quotes that depend on a changed rate
+
+        Args:
+            diff: Result of ForkliftData.reload_rates (or diff_rate_schedules plus 'models')
+
+        Returns:
+            Set of quote IDs
+        """
+        impacted = set()
+        for model, tiers in diff.get('models', {}).items():
+            for tier in tiers:
+                impacted |= self._dependents.get(('model', model, tier), set())
+        for row in diff.get('changed', []):
+            for tier in row['tiers']:
+                impacted |= self._dependents.get(('rate', row['key'], tier), set())
+        for key in diff.get('removed', []):
+            for tier in TIERS:
+                impacted |= self._dependents.get(('rate', key, tier), set())
+        return impacted
+
+    def reprice(self, diff: Dict) -> Dict:
+        """
+        Recompute only the open quotes affected by a rate schedule change
+
+        Each quote keeps its matched model and rental dates and is priced
+        again from the new rates; it is not matched again.
+
+        Args:
+            diff: Result of ForkliftData.reload_rates
+
+        Returns:
+            Report with the number of quotes checked and re-priced, and one
+            delta entry per re-priced quote (old and new total and the difference)
+        """
+        deltas = []
+        for quote_id in sorted(self.impacted(diff)):
+            entry = self.quotes[quote_id]
+            old_quote = entry['quote_result']['quote']
+            forklift_match = self._repriced_match(entry['requirements'], entry['match'])
+            quote_result = self.quote_generator.generate_quote(forklift_match)
+            if not quote_result.get('success', False):
+                deltas.append({'quote_id': quote_id, 'model': old_quote['forklift']['model'],
+                               'old_total': old_quote['pricing']['total_rental_cost'], 'new_total': None,
+                               'delta': None, 'message': quote_result.get('message', '')})
+                continue
+
+            self._unindex(quote_id, entry['dependencies'])
+            self._store(quote_id, entry['requirements'], forklift_match, quote_result)
+            # Deltas are taken in cents so they add up exactly across many quotes
+            old_cents = old_quote['pricing']['total_rental_cost_cents']
+            new_cents = quote_result['quote']['pricing']['total_rental_cost_cents']
+            deltas.append({
+                'quote_id': quote_id,
+                'model': quote_result['quote']['forklift']['model'],
+                'old_total': to_dollars(old_cents),
+                'new_total': to_dollars(new_cents),
+                'delta': to_dollars(new_cents - old_cents),
+                'delta_cents': new_cents - old_cents,
+            })
+
+        return {
+            'open_quotes': len(self.quotes),
+            'repriced': len(deltas),
+            'total_delta': to_dollars(sum(d['delta_cents'] for d in deltas if d['delta'] is not None)),
+            'deltas': deltas,
+        }
+
+    def _repriced_match(self, requirements: Dict, forklift_match: Dict) -> Dict:
+        """The stored match with its model's rental and equipment lines priced from the current rates"""
+        model = forklift_match['forklift']['model']
+        if model not in self.data.get_candidate_table():
+            return {'success': False, 'message': f"The {model} is no longer in the rate schedule."}
+
+        # Keep the quoted start date rather than letting the default (tomorrow) move it
+        terms = dict(requirements, start_date=forklift_match['rental_details']['start_date'])
+        return dict(
+            forklift_match,
+            rental_details=self.matcher.price_rental(model, terms),
+            line_items=self.matcher.match_equipment(terms, forklift_match['rental_details']['days']),
+        )
+
+    def _store(self, quote_id, requirements, forklift_match, quote_result):
+        dependencies = self._dependencies(quote_result['quote'])
+        self.quotes[quote_id] = {
+            'requirements': requirements,
+            'match': forklift_match,
+            'quote_result': quote_result,
+            'dependencies': dependencies,
+        }
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(quote_id)
+
+    def _unindex(self, quote_id, dependencies):
+        for dependency in dependencies:
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(quote_id)
+                if not dependents:
+                    del self._dependents[dependency]
+
+    def _dependencies(self, quote: Dict) -> Set[Tuple]:
+        """Rate tiers a quote is priced from: its forklift model and any equipment rows"""
+        forklift = quote['forklift']
+        forklift_line = f"{forklift['model']} {forklift['fuel_type']} Forklift"
+        dependencies = set()
+        for line in quote.get('line_items', []):
+            tier = rate_tier(line['days'])
+            if line['description'] == forklift_line:
+                dependencies.add(('model', forklift['model'], tier))
+            else:
+                dependencies.add(('rate', rate_key(line['description']), tier))
+        if not dependencies:
+            dependencies.add(('model', forklift['model'], rate_tier(quote['rental_period']['days'])))
+        return dependencies
@@ -0,0 +1,253 @@
+import itertools
+import time
+from typing import Dict, List, Optional, Set
+
+from src.html_pdf_generator import PDFGenerator as HTMLGenerator, render_sections
+from src.matcher import ForkliftMatcher
+from src.metrics import metrics
+from src.quote import QuoteGenerator
+
+# Parts of a match derived from each requirement field. 'model' re-runs the
+# whole match; the others recompute one part for the model already chosen.
+# Fields the matcher does not read (lift_height, location) map to nothing.
+FIELD_STAGES = {
+    'load_weight': {'model'},
+    'special_requirements': {'model'},
+    'items': {'line_items'},
+    'rental_period': {'pricing', 'line_items', 'alternatives'},
+    'unit_periods': {'pricing', 'alternatives'},
+    'start_date': {'pricing', 'alternatives'},
+    'indoor_outdoor': {'recommend', 'alternatives'},
+    'lift_height': set(),
+    'height_requirement': set(),
+    'location': set(),
+}
+
+# With a fleet calendar the rental dates decide which models are free
+AVAILABILITY_FIELDS = {'rental_period', 'unit_periods', 'start_date'}
+
+
+class QuoteReviser:
+    """
+    Revises quotes when a requirement changes, recomputing only the parts
+    that depend on the changed fields.
+
+    Each quote keeps its revision chain. A revision stores the requirements,
+    match, quote and the rendered HTML fragment of every document section, so
+    the next revision re-renders only the sections whose content changed.
+    """
+
+    def __init__(self, forklift_data, matcher=None, quote_generator=None):
+        """
+        Initialize the reviser
+
+        Args:
+            forklift_data: Shared ForkliftData instance
+            matcher: Optional ForkliftMatcher (created over forklift_data if omitted)
+            quote_generator: Optional QuoteGenerator (created over forklift_data if omitted)
+        """
+        self.data = forklift_data
+        self.matcher = matcher or ForkliftMatcher(forklift_data)
+        self.quote_generator = quote_generator or QuoteGenerator(forklift_data)
+        self.chains = {}  # quote_id -> [revision, ...]
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self.chains)
+
+    def open(self, requirements: Dict) -> Dict:
+        """
+        Quote an inquiry as revision 0 of a new chain
+
+        Args:
+            requirements: Requirements as produced by ConversationManager
+
+        Returns:
+            The revision (see revise), or a failure dictionary with 'success' False
+        """
+        start = time.perf_counter()
+        match = self.matcher.match_forklift(requirements)
+        if not match.get('success', False):
+            return {'success': False, 'message': match.get('message', 'No suitable forklift found.')}
+
+        quote_id = next(self._ids)
+        revision = self._build(quote_id, 0, dict(requirements), {}, {'model'}, match, None, start)
+        self.chains[quote_id] = [revision]
+        return revision
+
+    @metrics.timed('quote_revise')
+    def revise(self, quote_id: int, changes: Dict) -> Dict:
+        """
+        Apply changed requirement fields to the latest revision of a quote
+
+        Args:
+            quote_id: Chain ID from open()
+            changes: Requirement fields to replace (a None value removes the field)
+
+        Returns:
+            The new revision, a dictionary with 'success', 'quote_id', 'revision',
+            'parent', 'changes', 'stages' (parts recomputed), 'requirements',
+            'match', 'quote_result', 'formatted_quote', 'fragments',
+            'changed_sections' (sections re-rendered) and 'elapsed' seconds;
+            or a failure dictionary with 'success' False, leaving the chain unchanged
+        """
+        start = time.perf_counter()
+        chain = self.chains.get(quote_id)
+        if chain is None:
+            return {'success': False, 'message': f"Unknown quote {quote_id}."}
+        parent = chain[-1]
+
+        requirements = dict(parent['requirements'])
+        changed = {}
+        for field, value in changes.items():
+            if requirements.get(field) == value:
+                continue
+            changed[field] = value
+            if value is None:
+                requirements.pop(field, None)
+            else:
+                requirements[field] = value
+
+        # Keep a fleet order consistent as the conversation does: a new single
+        # period replaces the per-unit periods, and the periods set the longest one
+        if 'rental_period' in changed and 'unit_periods' not in changes and requirements.get('unit_periods'):
+            changed['unit_periods'] = None
+            requirements.pop('unit_periods')
+        elif changed.get('unit_periods') and 'rental_period' not in changes:
+            longest = max(p['days'] for p in requirements['unit_periods'])
+            if requirements.get('rental_period') != longest:
+                changed['rental_period'] = requirements['rental_period'] = longest
+
+        stages = self.stages_for(changed)
+        match = self._rematch(parent['match'], requirements, stages)
+        if not match.get('success', False):
+            return {'success': False, 'message': match.get('message', 'No suitable forklift found.')}
+
+        revision = self._build(quote_id, len(chain), requirements, changed, stages, match, parent, start)
+        chain.append(revision)
+        return revision
+
+    def update(self, quote_id: int, requirements: Dict) -> Dict:
+        """
+        Revise a quote to match a full set of requirements, e.g. after an
+        answer was edited; only the fields that differ from the latest
+        revision are treated as changes
+
+        Args:
+            quote_id: Chain ID from open()
+            requirements: Current requirements
+
+        Returns:
+            The new revision or a failure dictionary (see revise)
+        """
+        latest = self.latest(quote_id)
+        if latest is None:
+            return {'success': False, 'message': f"Unknown quote {quote_id}."}
+        previous = latest['requirements']
+        changes = {
+            field: requirements.get(field)
+            for field in dict.fromkeys(list(previous) + list(requirements))
+            if previous.get(field) != requirements.get(field)
+        }
+        return self.revise(quote_id, changes)
+
+    def stages_for(self, fields) -> Set[str]:
+        """
+        Parts of a match to recompute when fields change
+
+        Args:
+            fields: Changed requirement field names
+
+        Returns:
+            Set of stage names; {'model'} means a full re-match
+        """
+        stages = set()
+        for field in fields:
+            if self.matcher.availability is not None and field in AVAILABILITY_FIELDS:
+                return {'model'}
+            # Unknown fields may feed anything, so they re-run the match
+            field_stages = FIELD_STAGES.get(field, {'model'})
+            if 'model' in field_stages:
+                return {'model'}
+            stages |= field_stages
+        return stages
+
+    def history(self, quote_id: int) -> List[Dict]:
+        """Revisions of a quote, oldest first"""
+        return list(self.chains.get(quote_id, []))
+
+    def latest(self, quote_id: int) -> Optional[Dict]:
+        """Latest revision of a quote"""
+        chain = self.chains.get(quote_id)
+        return chain[-1] if chain else None
+
+    def discard(self, quote_id: int):
+        """Drop a quote's revision chain and its cached fragments"""
+        self.chains.pop(quote_id, None)
+
+    def get_html(self, quote_id: int, revision: Optional[int] = None) -> Optional[str]:
+        """
+        Assemble the HTML document of a revision from its cached fragments
+
+        Args:
+            quote_id: Chain ID
+            revision: Revision number (defaults to the latest)
+
+        Returns:
+            HTML string, or None if the quote or revision is unknown
+        """
+        chain = self.chains.get(quote_id)
+        if not chain:
+            return None
+        entry = chain[-1] if revision is None else (chain[revision] if 0 <= revision < len(chain) else None)
+        if entry is None:
+            return None
+        formatted = {'success': True, 'formatted_quote': entry['formatted_quote']}
+        return HTMLGenerator(formatted).get_html_string(entry['fragments'])
+
+    def _rematch(self, match: Dict, requirements: Dict, stages: Set[str]) -> Dict:
+        """Recompute the given stages of a match for new requirements"""
+        if 'model' in stages:
+            return self.matcher.match_forklift(requirements)
+
+        match = dict(match)
+        model = match['forklift']['model']
+        if 'pricing' in stages:
+            match['rental_details'] = self.matcher.price_rental(model, requirements)
+        if 'line_items' in stages:
+            rental_days = self.matcher.rental_terms(requirements)[0]
+            match['line_items'] = self.matcher.match_equipment(requirements, rental_days)
+        if 'recommend' in stages:
+            match.update(self.matcher.recommend(model, requirements))
+        if 'alternatives' in stages:
+            match['alternatives'] = self.matcher.rank_alternatives(model, requirements)
+        return match
+
+    def _build(self, quote_id, number, requirements, changes, stages, match, parent, start) -> Dict:
+        """Quote, format and render a revision, reusing the parent's unchanged sections"""
+        quote_result = self.quote_generator.generate_quote(match)
+        if number:
+            quote = dict(quote_result['quote'])
+            quote['quote_number'] = f"{quote['quote_number']}-R{number}"
+            quote_result = dict(quote_result, quote=quote)
+        formatted_quote = self.quote_generator.format_quote_for_display(quote_result)['formatted_quote']
+        fragments, changed_sections = render_sections(
+            formatted_quote,
+            parent['formatted_quote'] if parent else None,
+            parent['fragments'] if parent else None
+        )
+        return {
+            'success': True,
+            'quote_id': quote_id,
+            'revision': number,
+            'parent': parent['revision'] if parent else None,
+            'changes': changes,
+            'stages': sorted(stages),
+            'requirements': requirements,
+            'match': match,
+            'quote_result': quote_result,
+            'formatted_quote': formatted_quote,
+            'fragments': fragments,
+            'changed_sections': changed_sections,
+            'elapsed': time.perf_counter() - start,
+        }
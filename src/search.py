@@ -0,0 +1,206 @@
+import math
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.pricing import tokenize
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_MILLIMETRES = re.compile(r'(\d{1,3}(?:,\d{3})+|\d+)\s*mm\b')
+_KILOGRAMS = re.compile(r'(\d{1,3}(?:,\d{3})+|\d+)\s*kg\b')
+
+
+def analyze(text: str) -> List[str]:
+    """
+    Search terms of a document or query
+
+    Adds unit-normalized terms so "6m lift" matches "lift height 6,050 mm"
+    and "3500kg" matches "3,500 kg".
+
+    Args:
+        text: Free text
+
+    Returns:
+        List of terms (with repeats, for term frequencies)
+    """
+    text = str(text)
+    terms = tokenize(text.replace('-', ' '))
+    for value in _MILLIMETRES.findall(text):
+        terms.append(f"{round(int(value.replace(',', '')) / 1000)}m")
+    for value in _KILOGRAMS.findall(text):
+        terms.append(f"{int(value.replace(',', ''))}kg")
+    return terms
+
+
+class SearchIndex:
+    """
+    Inverted index with BM25 ranking.
+
+    Postings are kept as dictionaries so documents can be added, replaced
+    and removed in place; each term's postings are compiled to numpy arrays
+    on first use after a change, so a query is a handful of array adds over
+    the matching documents plus a partial sort.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._postings = {}     # term -> {slot: term frequency}
+        self._compiled = {}     # term -> (slots, BM25 weights)
+        self._kind_masks = {}   # kind -> boolean array over slots
+        self._slots = {}        # doc_id -> slot
+        self._doc_ids = []      # slot -> doc_id (None when freed)
+        self._meta = []         # slot -> metadata dict
+        self._terms = []        # slot -> set of terms
+        self._lengths = []      # slot -> document length
+        self._free = []
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._slots
+
+    def add(self, doc_id: str, text: str, meta: Optional[Dict] = None, terms: Optional[Dict[str, int]] = None):
+        """
+        Add or replace a document
+
+        Args:
+            doc_id: Unique document ID
+            text: Text to index
+            meta: Metadata returned with search hits
+            terms: Extra already-analyzed terms with their counts, e.g. a brochure summary's
+        """
+        if doc_id in self._slots:
+            self.remove(doc_id)
+
+        terms = analyze(text) + [term for term, count in (terms or {}).items() for _ in range(count)]
+        if self._free:
+            slot = self._free.pop()
+            self._doc_ids[slot], self._meta[slot] = doc_id, dict(meta or {})
+            self._terms[slot], self._lengths[slot] = set(terms), len(terms)
+        else:
+            slot = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+            self._meta.append(dict(meta or {}))
+            self._terms.append(set(terms))
+            self._lengths.append(len(terms))
+        self._slots[doc_id] = slot
+        self._total_length += len(terms)
+
+        for term in terms:
+            postings = self._postings.setdefault(term, {})
+            postings[slot] = postings.get(slot, 0) + 1
+        # Document count and average length changed, so every weight is stale
+        self._compiled.clear()
+        self._kind_masks.clear()
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        Remove a document
+
+        Args:
+            doc_id: Document ID
+
+        Returns:
+            True if the document was indexed
+        """
+        slot = self._slots.pop(doc_id, None)
+        if slot is None:
+            return False
+        for term in self._terms[slot]:
+            postings = self._postings[term]
+            del postings[slot]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths[slot]
+        self._doc_ids[slot], self._meta[slot], self._terms[slot], self._lengths[slot] = None, None, set(), 0
+        self._free.append(slot)
+        self._compiled.clear()
+        self._kind_masks.clear()
+        return True
+
+    def ids(self, kind: Optional[str] = None) -> List[str]:
+        """List indexed document IDs, optionally of one kind"""
+        return [doc_id for doc_id, slot in self._slots.items()
+                if kind is None or self._meta[slot].get('kind') == kind]
+
+    def _compile(self, term):
+        compiled = self._compiled.get(term)
+        if compiled is None:
+            postings = self._postings[term]
+            slots = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            tf = np.fromiter(postings.values(), dtype=float, count=len(postings))
+            lengths = np.asarray(self._lengths, dtype=float)[slots]
+            n = len(self._slots)
+            average = self._total_length / n if n else 1.0
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            weights = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths / average))
+            compiled = self._compiled[term] = (slots, weights)
+        return compiled
+
+    def _kind_mask(self, kind):
+        mask = self._kind_masks.get(kind)
+        if mask is None:
+            mask = self._kind_masks[kind] = np.array(
+                [meta is not None and meta.get('kind') == kind for meta in self._meta], dtype=bool
+            )
+        return mask
+
+    def search(self, query: str, k: int = 10, kind: Optional[str] = None) -> List[Dict]:
+        """
+        Rank documents for a free-text query
+
+        Args:
+            query: Query text, e.g. "oil-cooled brakes 6m lift weight scale"
+            k: Maximum number of hits
+            kind: Only return documents whose metadata 'kind' matches
+
+        Returns:
+            Hits as metadata dictionaries with 'id' and 'score', best first
+        """
+        terms = [t for t in dict.fromkeys(analyze(query)) if t in self._postings]
+        if not terms or k <= 0:
+            return []
+
+        scores = np.zeros(len(self._doc_ids))
+        for term in terms:
+            slots, weights = self._compile(term)
+            scores[slots] += weights
+
+        if kind is not None:
+            scores[~self._kind_mask(kind)] = 0.0
+        candidates = np.flatnonzero(scores)
+        if len(candidates) == 0:
+            return []
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        # Best score first; ties keep index order so results are deterministic
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+
+        return [dict(self._meta[s], id=self._doc_ids[s], score=float(scores[s])) for s in candidates]
+
+
+def model_document(forklift: Dict, brochure: str = '', rate_description: str = '') -> str:
+    """
+    Searchable text for one catalog model
+
+    Args:
+        forklift: Spec row as a dictionary
+        brochure: Brochure text describing the model
+        rate_description: Description of the rate schedule row that prices it
+
+    Returns:
+        Document text
+    """
+    tons = forklift['capacity_tons']
+    fields = [
+        forklift['model'], forklift.get('fuel_type', ''), forklift.get('series', ''),
+        f"{tons}t", f"{tons} ton", f"{forklift.get('capacity_kg', round(tons * 1000))} kg", 'forklift',
+        rate_description, brochure,
+    ]
+    return '\n'.join(str(field) for field in fields if field)
@@ -0,0 +1,147 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from src.data_loader import ForkliftData
+from src.html_pdf_generator import PDFGenerator as HTMLGenerator
+from src.matcher import ForkliftMatcher
+from src.metrics import metrics
+from src.quote import QuoteGenerator
+
+
+def render_document(formatted_quote: Dict, fmt: str = 'html'):
+    """
+    Render a formatted quote to a document (runs on a worker thread)
+
+    Args:
+        formatted_quote: Result of QuoteGenerator.format_quote_for_display
+        fmt: 'html' for an HTML string or 'pdf' for PDF bytes
+
+    Returns:
+        The rendered document, or None if the quote was not successful
+    """
+    if fmt == 'pdf':
+        # Imported lazily so the service works without fpdf when only HTML is used
+        from src.pdf_generator import PDFGenerator
+        return PDFGenerator(formatted_quote).get_pdf_bytes()
+    return HTMLGenerator(formatted_quote).get_html_string()
+
+
+class QuoteService:
+    """
+    Asyncio facade over the quote pipeline.
+
+    Matching and quoting are cheap and run inline on the event loop. Document
+    rendering is offloaded to a bounded executor so a slow PDF never blocks
+    other inquiries. Requests beyond max_pending are rejected immediately
+    (backpressure), every request has a timeout, and cancelling the awaiting
+    task cancels render work that has not started yet.
+    """
+
+    def __init__(self, forklift_data=None, render_workers: int = 4, max_pending: int = 64,
+                 timeout: float = 10.0, render_executor=None, render_pool=None):
+        """
+        Initialize the service
+
+        Args:
+            forklift_data: Shared ForkliftData instance (loaded from data/ if omitted)
+            render_workers: Number of render threads when no executor is given
+            max_pending: Maximum number of requests in flight before new ones are rejected
+            timeout: Default per-request timeout in seconds
+            render_executor: Optional executor for rendering
+            render_pool: Optional RenderPool; when given, documents render in its worker processes
+        """
+        self.data = forklift_data if forklift_data is not None else ForkliftData()
+        self.matcher = ForkliftMatcher(self.data)
+        self.quote_generator = QuoteGenerator(self.data)
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._owns_executor = render_executor is None
+        self.render_executor = render_executor or ThreadPoolExecutor(
+            max_workers=render_workers, thread_name_prefix='quote-render'
+        )
+        self.render_pool = render_pool
+        self.pending = 0
+
+    async def quote(self, requirements: Dict, render: Optional[str] = None,
+                    timeout: Optional[float] = None) -> Dict:
+        """
+        Match, quote and optionally render a document for one inquiry
+
+        Args:
+            requirements: Requirements as produced by ConversationManager
+            render: None, 'html' or 'pdf'
+            timeout: Per-request timeout in seconds (defaults to the service timeout)
+
+        Returns:
+            Formatted quote dictionary; with render set, the document is under 'document'.
+            On overload or timeout, {'success': False, 'message': ...}
+        """
+        if self.pending >= self.max_pending:
+            return {'success': False, 'message': 'Service is busy. Please try again shortly.', 'retry': True}
+
+        self.pending += 1
+        try:
+            return await asyncio.wait_for(
+                self._quote(requirements, render),
+                timeout=self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            return {'success': False, 'message': 'Quote request timed out.', 'retry': True}
+        finally:
+            self.pending -= 1
+
+    async def render(self, formatted_quote: Dict, fmt: str = 'html',
+                     timeout: Optional[float] = None) -> Dict:
+        """
+        Render an already formatted quote without blocking the event loop
+
+        Args:
+            formatted_quote: Result of QuoteGenerator.format_quote_for_display
+            fmt: 'html' or 'pdf'
+            timeout: Per-request timeout in seconds (defaults to the service timeout)
+
+        Returns:
+            {'success': True, 'document': ...} or {'success': False, 'message': ...}
+        """
+        try:
+            document = await asyncio.wait_for(
+                self._render(formatted_quote, fmt),
+                timeout=self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            return {'success': False, 'message': 'Document rendering timed out.', 'retry': True}
+
+        if document is None:
+            return {'success': False, 'message': 'Unable to render document.'}
+        return {'success': True, 'format': fmt, 'document': document}
+
+    async def _quote(self, requirements, render):
+        with metrics.span('service_quote'):
+            forklift_match = self.matcher.match_forklift(requirements)
+            quote_result = self.quote_generator.generate_quote(forklift_match)
+            formatted_quote = self.quote_generator.format_quote_for_display(quote_result)
+
+        if render and formatted_quote.get('success', False):
+            formatted_quote = dict(formatted_quote, format=render,
+                                   document=await self._render(formatted_quote, render))
+        return formatted_quote
+
+    async def _render(self, formatted_quote, fmt):
+        if self.render_pool is not None:
+            document = await asyncio.wrap_future(self.render_pool.submit(formatted_quote, fmt))
+            return document.decode('utf-8') if fmt == 'html' and document is not None else document
+        
+        loop = asyncio.get_running_loop()
+        # Cancelling this await cancels the executor job if it has not started
+        return await loop.run_in_executor(self.render_executor, render_document, formatted_quote, fmt)
+
+    def close(self, wait: bool = True):
+        """
+        Shut down the render executor if the service created it
+
+        Args:
+            wait: Whether to wait for running renders to finish
+        """
+        if self._owns_executor:
+            self.render_executor.shutdown(wait=wait)
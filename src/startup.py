@@ -0,0 +1,373 @@
+import argparse
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Modules a Streamlit worker imports before it can serve a session
+APP_IMPORTS = [
+    'numpy', 'pandas', 'streamlit',
+    'src.data_loader', 'src.matcher', 'src.quote', 'src.conversation',
+    'src.revisions', 'src.html_pdf_generator', 'src.ui_components',
+]
+
+# Wall-clock budget for importing APP_IMPORTS in a fresh interpreter
+IMPORT_BUDGET_MS = float(os.environ.get('FORKLIFT_IMPORT_BUDGET_MS', 3000))
+
+# Inquiry quoted during warm-up so every pipeline stage has run once
+SAMPLE_REQUIREMENTS = {
+    'load_weight': 2.5,
+    'rental_period': 10,
+    'indoor_outdoor': 'both',
+    'lift_height': 4.0,
+    'special_requirements': 'side shift',
+}
+
+# Port of the readiness endpoint started by `serve` (the container healthcheck probes it)
+READY_PORT = int(os.environ.get('FORKLIFT_READY_PORT', 8503))
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)')
+
+_shared = None
+_shared_lock = threading.Lock()
+# (host, port) of the Streamlit server started by `serve`; /ready waits for it to listen
+_app_address = None
+
+
+def profile_imports(modules: Optional[List[str]] = None, python: Optional[str] = None) -> Dict:
+    """
+    Measure import times in a fresh interpreter with python -X importtime
+
+    Args:
+        modules: Modules to import (defaults to APP_IMPORTS)
+        python: Interpreter to run (defaults to the current one)
+
+    Returns:
+        Dictionary with 'total_ms' (wall clock for all imports), 'requested'
+        (cumulative ms per requested module, in import order; a module already
+        imported by an earlier one costs 0) and 'slowest' (the 15 modules with
+        the highest self time)
+    """
+    modules = modules or APP_IMPORTS
+    code = (
+        "import time; start = time.perf_counter()\n"
+        + ''.join(f"import {module}\n" for module in modules)
+        + "print((time.perf_counter() - start) * 1000)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run(
+        [python or sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, cwd=root, check=True
+    )
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            entries.append({
+                'module': match.group(4),
+                'self_ms': int(match.group(1)) / 1000,
+                'cumulative_ms': int(match.group(2)) / 1000,
+                # importtime indents nested imports by two spaces per level
+                'depth': (len(match.group(3)) - 1) // 2,
+            })
+    cumulative = {e['module']: e['cumulative_ms'] for e in entries if e['depth'] == 0}
+
+    return {
+        'total_ms': float(completed.stdout.strip().splitlines()[-1]),
+        'requested': [{'module': m, 'cumulative_ms': cumulative.get(m, 0.0)} for m in modules],
+        'slowest': sorted(entries, key=lambda e: e['self_ms'], reverse=True)[:15],
+    }
+
+
+def check_import_budget(budget_ms: float = IMPORT_BUDGET_MS, modules: Optional[List[str]] = None) -> Dict:
+    """
+    Check the application's import time against a budget
+
+    Args:
+        budget_ms: Allowed wall-clock milliseconds
+        modules: Modules to import (defaults to APP_IMPORTS)
+
+    Returns:
+        The profile_imports report with 'budget_ms' and 'ok' added
+    """
+    report = profile_imports(modules)
+    report['budget_ms'] = budget_ms
+    report['ok'] = report['total_ms'] <= budget_ms
+    return report
+
+
+def warm_up(data_dir='data', render_pool=None, snapshot=None, cache_entries: int = 4096) -> Dict:
+    """
+    Build everything a first request would otherwise pay for: the catalog,
+    rate and ranking tables, search index, brochure excerpts and the HTML
+    templates, by quoting a sample inquiry end to end
+
+    Args:
+        data_dir: Catalog directory
+        render_pool: Optional RenderPool whose worker processes are started too
+        snapshot: Optional saved MatchCache snapshot (path) of hot requirement
+            tuples to match into the cache before serving
+        cache_entries: Size of the shared match cache
+
+    Returns:
+        Dictionary with the shared 'forklift_data', 'matcher', 'quote_generator',
+        'match_cache' and 'render_pool', and 'timings' in milliseconds per step
+    """
+    from src.data_loader import ForkliftData
+    from src.match_cache import MatchCache
+    from src.matcher import ForkliftMatcher
+    from src.quote import QuoteGenerator
+    from src.revisions import QuoteReviser
+
+    timings = {}
+
+    def step(name, build):
+        start = time.perf_counter()
+        value = build()
+        timings[name] = (time.perf_counter() - start) * 1000
+        return value
+
+    forklift_data = step('catalog', lambda: ForkliftData(data_dir))
+    step('rate_index', forklift_data.get_rate_index)
+    step('candidate_table', forklift_data.get_candidate_table)
+    match_cache = MatchCache(cache_entries)
+    matcher = ForkliftMatcher(forklift_data, cache=match_cache)
+    quote_generator = QuoteGenerator(forklift_data)
+
+    def sample_quote():
+        reviser = QuoteReviser(forklift_data, matcher, quote_generator)
+        revision = reviser.open(SAMPLE_REQUIREMENTS)
+        if revision.get('success', False):
+            reviser.get_html(revision['quote_id'])
+
+    step('sample_quote', sample_quote)
+    if snapshot:
+        step('cache_snapshot', lambda: match_cache.prepopulate(matcher, snapshot))
+    if render_pool is not None:
+        step('render_pool', render_pool.warm_up)
+
+    return {
+        'forklift_data': forklift_data,
+        'matcher': matcher,
+        'quote_generator': quote_generator,
+        'match_cache': match_cache,
+        'render_pool': render_pool,
+        'timings': timings,
+    }
+
+
+def readiness_report(state: Optional[Dict], app_address: Optional[Tuple[str, int]] = None) -> Dict:
+    """
+    Describe how ready a process is to serve warm requests
+
+    Args:
+        state: warm_up result, or None while warm-up is still running
+        app_address: Optional (host, port) of the app server, which must be
+            accepting connections too
+
+    Returns:
+        Dictionary with 'ready', the catalog version and size, the build state
+        of each index, render pool warmth, match cache fill and warm-up timings
+        (plus 'app_listening' when app_address is given)
+    """
+    if state is None:
+        return {'ready': False, 'status': 'warming'}
+
+    data = state['forklift_data']
+    render_pool = state.get('render_pool')
+    match_cache = state.get('match_cache')
+    indexes = data.indexes_built()
+    report = {
+        'catalog_version': data.catalog_version,
+        'catalog': {'models': len(data.specs_df), 'rate_rows': len(data.rates_df)},
+        'indexes': indexes,
+        'render_pool': None if render_pool is None else {
+            'warm': render_pool.warm, 'workers': render_pool.stats()['workers']
+        },
+        'cache': match_cache.stats() if match_cache is not None else None,
+        'warmup_ms': state.get('timings', {}),
+    }
+    report['ready'] = all(indexes.values()) and (render_pool is None or render_pool.warm)
+    if app_address is not None:
+        report['app_listening'] = _listening(*app_address)
+        report['ready'] = report['ready'] and report['app_listening']
+    report['status'] = 'ready' if report['ready'] else 'warming'
+    return report
+
+
+def shared_state(data_dir='data') -> Dict:
+    """
+    Process-wide warmed catalog and pipeline objects, shared by every session
+
+    Built on the first call; `serve` makes that call before the server starts.
+    FORKLIFT_CACHE_SNAPSHOT names a saved match cache snapshot to replay and
+    FORKLIFT_RENDER_WORKERS starts a warm RenderPool with that many workers.
+
+    Args:
+        data_dir: Catalog directory (only used by the first call)
+
+    Returns:
+        The warm_up result
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            render_pool = None
+            workers = int(os.environ.get('FORKLIFT_RENDER_WORKERS', 0))
+            if workers > 0:
+                from src.render_pool import RenderPool
+                render_pool = RenderPool(workers)
+            snapshot = os.environ.get('FORKLIFT_CACHE_SNAPSHOT')
+            _shared = warm_up(data_dir, render_pool, snapshot if snapshot and os.path.exists(snapshot) else None)
+        return _shared
+
+
+def _listening(host: str, port: int) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def streamlit_address(streamlit_args=()) -> Tuple[str, int]:
+    """
+    Address to probe the Streamlit server on, from `streamlit run` options
+
+    Args:
+        streamlit_args: Options such as ['--server.port=8501', '--server.address=0.0.0.0']
+
+    Returns:
+        Tuple of host and port (loopback when Streamlit binds every interface)
+    """
+    options = {}
+    args = list(streamlit_args)
+    for i, arg in enumerate(args):
+        if arg.startswith('--server.'):
+            name, _, value = arg[2:].partition('=')
+            options[name] = value if value or i + 1 >= len(args) else args[i + 1]
+    host = options.get('server.address') or '127.0.0.1'
+    if host in ('0.0.0.0', '::'):
+        host = '127.0.0.1'
+    return host, int(options.get('server.port') or 8501)
+
+
+class _ReadinessHandler(BaseHTTPRequestHandler):
+    """Serves /ready (200 once warm, 503 before), /health and /cache/snapshot"""
+
+    def do_GET(self):
+        report = readiness_report(_shared, _app_address if _shared is not None else None)
+        if self.path == '/ready':
+            self._send_json(200 if report['ready'] else 503, report)
+        elif self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif self.path.startswith('/cache/snapshot'):
+            cache = _shared.get('match_cache') if _shared else None
+            self._send_json(200, {'entries': cache.snapshot() if cache is not None else []})
+        else:
+            self.send_error(404)
+
+    def _send_json(self, status, response):
+        body = json.dumps(response, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep probes out of the application output
+        pass
+
+
+def start_readiness_server(port: int = READY_PORT, host: str = '0.0.0.0') -> ThreadingHTTPServer:
+    """
+    Start the readiness endpoint in a background thread
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        host: Interface to bind to
+
+    Returns:
+        The running HTTP server
+    """
+    server = ThreadingHTTPServer((host, port), _ReadinessHandler)
+    threading.Thread(target=server.serve_forever, name='forklift-readiness', daemon=True).start()
+    return server
+
+
+def serve(script='app.py', streamlit_args=(), data_dir='data'):
+    """
+    Warm this process, then run the Streamlit server in it
+
+    The readiness endpoint starts first and answers 503 until the catalog,
+    indexes, templates and cache snapshot are built and the Streamlit server,
+    started after that, accepts connections. App sessions reuse the warm
+    objects through shared_state().
+
+    Args:
+        script: Streamlit app script
+        streamlit_args: Extra `streamlit run` options, e.g. ['--server.port=8501']
+        data_dir: Catalog directory
+    """
+    global _app_address
+    _app_address = streamlit_address(streamlit_args)
+    start_readiness_server()
+    state = shared_state(data_dir)
+    print("Warm-up complete: " + ', '.join(f"{name} {ms:.0f} ms" for name, ms in state['timings'].items()))
+
+    from streamlit.web import cli
+    cli.main(['run', script, *streamlit_args], prog_name='streamlit')
+
+
+def main(argv=None):
+    """Profile imports, check the import budget, warm up or serve"""
+    parser = argparse.ArgumentParser(description="Startup warm-up and import-time budget")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    imports = commands.add_parser('imports', help="Profile application imports in a fresh interpreter")
+    imports.add_argument('--budget-ms', type=float, default=None,
+                         help=f"Exit with status 1 when imports take longer (default budget {IMPORT_BUDGET_MS:.0f})")
+
+    warm = commands.add_parser('warm', help="Run the warm-up and report step timings")
+    warm.add_argument('--data-dir', default='data')
+    warm.add_argument('--snapshot', default=None, help="Saved match cache snapshot to replay")
+
+    run = commands.add_parser('serve', help="Warm up, then start the Streamlit app in this process")
+    run.add_argument('script', nargs='?', default='app.py')
+    run.add_argument('--data-dir', default='data')
+
+    args, extra = parser.parse_known_args(argv)
+    if args.command == 'serve':
+        serve(args.script, extra, args.data_dir)
+        return 0
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    if args.command == 'warm':
+        for name, ms in warm_up(args.data_dir, snapshot=args.snapshot)['timings'].items():
+            print(f"{name:<16} {ms:8.1f} ms")
+        return 0
+
+    report = check_import_budget(args.budget_ms if args.budget_ms is not None else IMPORT_BUDGET_MS)
+    for entry in report['requested']:
+        print(f"{entry['module']:<28} {entry['cumulative_ms']:8.1f} ms")
+    print("\nSlowest modules (self time):")
+    for entry in report['slowest']:
+        print(f"{entry['module']:<52} {entry['self_ms']:8.1f} ms")
+    print(f"\nTotal {report['total_ms']:.0f} ms, budget {report['budget_ms']:.0f} ms: "
+          f"{'OK' if report['ok'] else 'OVER BUDGET'}")
+    return 0 if report['ok'] else 1
+
+
+if __name__ == '__main__':
+    # Run through the importable module so app sessions see the same shared state
+    from src.startup import main as startup_main
+    sys.exit(startup_main())
@@ -1,13 +1,21 @@
 import streamlit as st
 import os
-import base64
+import io
 from pathlib import Path
 
+from src.archive import document_name
+from src.bulk import BulkQuoteJob
+from src.html_pdf_generator import PDFGenerator
+
 class UIComponents:
     """
     Reusable UI components for the Streamlit interface
     """
     
+    # Most recent messages always shown; older ones are paged on request
+    HISTORY_WINDOW = 12
+    HISTORY_PAGE_SIZE = 20
+    
     @staticmethod
     def load_css():
         """Load CSS styles from the css/main.css file"""
@@ -34,22 +42,20 @@ class UIComponents:
         )
     
     @staticmethod
-    def display_conversation(conversation_manager):
+    def display_conversation(conversation_manager, history):
         """
         Display the conversation interface
         
         Args:
             conversation_manager: Instance of ConversationManager
+            history: ChatHistory of the inquiry
             
         Returns:
             User's answer to the current question, or None if no answer provided
         """
-        # Initialize session state for conversation
-        if 'messages' not in st.session_state:
-            st.session_state.messages = []
-            
-            # Add initial message
-            st.session_state.messages.append({
+        # Start a new inquiry's history with the greeting and first question
+        if not history:
+            history.append({
                 "role": "assistant",
                 "content": "Hello! I'll help you find the right forklift for your needs. Let's start with a few questions."
             })
@@ -63,15 +69,13 @@ class UIComponents:
                 options_text = ', '.join(current_question['options'])
                 question_text += f" ({options_text})"
                 
-            st.session_state.messages.append({
+            history.append({
                 "role": "assistant",
                 "content": question_text
             })
         
         # Display conversation history
-        for message in st.session_state.messages:
-            message_class = "assistant-message" if message["role"] == "assistant" else "user-message"
-            st.markdown(f'<div class="chat-message {message_class}">{message["content"]}</div>', unsafe_allow_html=True)
+        UIComponents.display_history(history)
         
         # Get user input if conversation isn't complete
         if not conversation_manager.is_complete():
@@ -79,13 +83,13 @@ class UIComponents:
             
             if user_input:
                 # Add user message to chat history
-                st.session_state.messages.append({"role": "user", "content": user_input})
+                history.append({"role": "user", "content": user_input})
                 
                 # Process the answer
                 is_valid, feedback = conversation_manager.process_answer(user_input)
                 
                 # Add assistant's response to chat history
-                st.session_state.messages.append({"role": "assistant", "content": feedback})
+                history.append({"role": "assistant", "content": feedback})
                 
                 # Force a page refresh to update the display
                 st.rerun()
@@ -95,37 +99,69 @@ class UIComponents:
         return None
     
     @staticmethod
-    def create_download_link_from_html(html_content, file_name):
+    def display_history(history):
         """
-        Create a download link for HTML content
+        Display the recent messages and, on request, one page of older ones
+        
+        Each part is a single markdown element, so a rerun costs the same
+        however long the session has run.
         
         Args:
-            html_content: HTML content as a string
-            file_name: File name for download
-            
-        Returns:
-            Download link markup
+            history: ChatHistory of the inquiry
         """
-        b64 = base64.b64encode(html_content.encode('utf-8')).decode('utf-8')
+        window = UIComponents.HISTORY_WINDOW
+        page_size = UIComponents.HISTORY_PAGE_SIZE
+        pages = history.page_count(page_size, exclude_recent=window)
         
-        # Create standard download link
-        href = f'data:text/html;charset=utf-8;base64,{b64}'
-        download_link = f'<a href="{href}" download="{file_name}" target="_blank"><button style="background-color: #4CAF50; color: white; padding: 12px 20px; border: none; border-radius: 4px; cursor: pointer; font-size: 16px;">Download Quote as HTML</button></a>'
+        if pages and st.checkbox(f"Show {len(history) - window} earlier messages", key="show-history"):
+            page = pages
+            if pages > 1:
+                page = int(st.number_input("Page (1 is the oldest)", min_value=1, max_value=pages,
+                                           value=pages, key="history-page"))
+            start, stop = history.page_range(page, page_size, exclude_recent=window)
+            st.markdown(history.render_html(start, stop), unsafe_allow_html=True)
         
-        download_html = f"""
-            <div style="text-align: center; margin: 20px 0;">
-                {download_link}
-            </div>
+        st.markdown(history.render_html(len(history) - window), unsafe_allow_html=True)
+    
+    @staticmethod
+    def display_answer_editor(conversation_manager):
         """
-        return download_html
+        Display a form for changing one earlier answer
+        
+        Args:
+            conversation_manager: Instance of ConversationManager
+            
+        Returns:
+            Tuple of (question ID, new answer) when submitted, otherwise None
+        """
+        answered = conversation_manager.answered()
+        if not answered:
+            return None
+        
+        with st.expander("Change an answer"):
+            # Outside the form so the current answer follows the selection
+            question_id = st.selectbox(
+                "Question",
+                [q['id'] for q in answered],
+                format_func=lambda qid: next(q['question'] for q in answered if q['id'] == qid)
+            )
+            st.caption(f"Current answer: {conversation_manager.get_answer(question_id)}")
+            with st.form("edit-answer", clear_on_submit=True):
+                answer = st.text_input("New answer")
+                if st.form_submit_button("Update") and answer:
+                    return question_id, answer
+        return None
     
     @staticmethod
-    def display_quote(quote_info):
+    def display_quote(quote_info, get_html=None):
         """
         Display the generated quote
         
         Args:
             quote_info: Dictionary with formatted quote information
+            get_html: Optional callable returning the quote document's HTML
+                (e.g. assembled from cached fragments); rendered from
+                quote_info when omitted
         """
         if not quote_info.get('success', False):
             st.markdown(
@@ -160,12 +196,26 @@ class UIComponents:
         st.table(rental_data)
         st.markdown('</div>', unsafe_allow_html=True)
         
+        # Display the line item breakdown for multi-item quotes
+        line_items = formatted_quote.get('line_items_info', {})
+        if line_items.get('items'):
+            st.markdown(f'<div class="quote-section"><h3>{line_items["title"]}</h3>', unsafe_allow_html=True)
+            st.table({item['label']: item['value'] for item in line_items['items']})
+            st.markdown('</div>', unsafe_allow_html=True)
+        
         # Display pricing information
         st.markdown(f'<div class="quote-section"><h3>{formatted_quote["pricing_info"]["title"]}</h3>', unsafe_allow_html=True)
         pricing_data = {item['label']: item['value'] for item in formatted_quote['pricing_info']['items']}
         st.table(pricing_data)
         st.markdown('</div>', unsafe_allow_html=True)
         
+        # Display alternative models, if any were ranked
+        alternatives = formatted_quote.get('alternatives', {})
+        if alternatives.get('items'):
+            st.markdown(f'<div class="quote-section"><h3>{alternatives["title"]}</h3>', unsafe_allow_html=True)
+            st.table({item['label']: item['value'] for item in alternatives['items']})
+            st.markdown('</div>', unsafe_allow_html=True)
+        
         # Display recommendations
         st.markdown(
             f"""
@@ -191,6 +241,12 @@ class UIComponents:
         # Display brochure information in an expandable section
         with st.expander("View Forklift Specifications"):
             st.markdown(formatted_quote['brochure']['text'])
+            # The quote only carries an excerpt; the full brochure is read from the cache when asked for
+            brochure_key = formatted_quote['brochure'].get('key')
+            forklift_data = st.session_state.get('forklift_data')
+            if formatted_quote['brochure'].get('truncated') and brochure_key and forklift_data is not None:
+                if st.button("Load full brochure", key=f"brochure-{brochure_key}"):
+                    st.markdown(forklift_data.get_brochure_text(brochure_key))
         
         # Display terms and conditions in an expandable section
         with st.expander("View Terms & Conditions"):
@@ -199,42 +255,123 @@ class UIComponents:
         # Add a button to save the quote as HTML
         st.markdown('</div>', unsafe_allow_html=True)
         
-        # Store the quote info in session state for HTML generation
-        if 'current_quote' not in st.session_state:
-            st.session_state.current_quote = quote_info
-        
-        if st.button("Generate Quote Document"):
-            with st.spinner("Generating document..."):
-                try:
-                    # Import the HTML generator
-                    from src.html_pdf_generator import PDFGenerator
-                    
-                    # Create generator
-                    generator = PDFGenerator(st.session_state.current_quote)
-                    
-                    # Get HTML content
-                    html_content = generator.get_html_string()
-                    
-                    if html_content:
-                        # Create a download link
-                        quote_number = formatted_quote['title'].split('#')[-1].strip() if '#' in formatted_quote['title'] else 'quote'
-                        file_name = f"Forklift_Rental_Quote_{quote_number}.html"
-                        
-                        download_html = UIComponents.create_download_link_from_html(html_content, file_name)
-                        st.markdown(download_html, unsafe_allow_html=True)
-                        
-                        # Add a note about how to convert to PDF
-                        st.info("After downloading the HTML file, you can open it in any web browser and use the browser's print function to save it as a PDF.")
-                    else:
-                        st.error("Failed to generate document. Please try again.")
-                except Exception as e:
-                    st.error(f"Error generating document: {str(e)}")
+        # Rendered when the button is clicked and sent as a file rather than a data URI
+        st.download_button(
+            "Download Quote as HTML",
+            get_html if get_html is not None else PDFGenerator(quote_info).get_html_string,
+            file_name=document_name(quote_info, 'html'), mime="text/html"
+        )
+        st.caption("Open the downloaded file in any web browser and use its print function to save it as a PDF.")
     
     @staticmethod
     def display_restart_button():
         """Display a button to restart the conversation"""
         return st.button("Start a New Inquiry")
     
+    @staticmethod
+    def display_inquiry_switcher(inquiries):
+        """
+        Display the open inquiries as a row of choices and a button to start another
+        
+        Args:
+            inquiries: InquiryBook of the session
+            
+        Returns:
+            ID of the inquiry to show, or None when a new inquiry was requested
+        """
+        choices, new = st.columns([5, 1])
+        with new:
+            if UIComponents.display_restart_button():
+                return None
+        
+        open_inquiries = inquiries.inquiries()
+        if len(open_inquiries) < 2:
+            return inquiries.active['id']
+        
+        labels = {inquiry['id']: inquiry['label'] for inquiry in open_inquiries}
+        # The book decides the selection, so a newly started inquiry shows as chosen;
+        # a click switches through the callback before the script reruns
+        st.session_state['active-inquiry'] = inquiries.active['id']
+        with choices:
+            st.radio(
+                "Open inquiries", list(labels), key="active-inquiry",
+                format_func=lambda inquiry_id: labels[inquiry_id],
+                on_change=lambda: inquiries.switch(st.session_state['active-inquiry']),
+                horizontal=True, label_visibility="collapsed"
+            )
+        return inquiries.active['id']
+    
+    @staticmethod
+    def display_bulk_upload(matcher, quote_generator, render_pool=None):
+        """
+        Display the spreadsheet upload panel for bulk quoting
+        
+        The file is quoted by a BulkQuoteJob in a background thread; only the
+        progress bar refreshes while it runs, so the rest of the app stays usable.
+        
+        Args:
+            matcher: Shared ForkliftMatcher
+            quote_generator: Shared QuoteGenerator
+            render_pool: Optional RenderPool the ZIP documents are rendered on
+        """
+        st.subheader("Bulk Quote")
+        uploaded = st.file_uploader(
+            "CSV or XLSX list of equipment needs", type=['csv', 'xlsx'], key="bulk-upload",
+            help="One line per requirement, with columns such as weight, days, environment, "
+                 "lift height, notes, qty, start date and reference."
+        )
+        job = st.session_state.get('bulk_job')
+        running = job is not None and not job.done
+        
+        if uploaded is not None and st.button("Quote all lines", disabled=running):
+            # Copy the upload so the job does not share the widget's file handle
+            job = BulkQuoteJob(io.BytesIO(uploaded.getvalue()), uploaded.name, matcher, quote_generator).start()
+            st.session_state.bulk_job = job
+            running = True
+        
+        if job is None:
+            return
+        if running:
+            UIComponents._display_bulk_progress()
+            return
+        
+        progress = job.progress()
+        if progress['error']:
+            st.error(f"Could not read {job.name}: {progress['error']}")
+        st.success(f"Quoted {progress['quoted']} of {progress['processed']} lines in {progress['elapsed']:.1f}s")
+        if progress['failed']:
+            st.caption(f"{progress['failed']} lines could not be quoted; see the summary for the reasons.")
+        
+        stem = Path(job.name).stem
+        # Documents are built only when a download is clicked
+        if progress['quoted']:
+            st.download_button("Download all quotes (HTML)", job.combined_html,
+                               file_name=f"Forklift_Rental_Quotes_{stem}.html", mime="text/html")
+            fmt = st.radio("Documents in the ZIP", ['html', 'pdf'], format_func=str.upper,
+                           horizontal=True, key="bulk-archive-format")
+            st.download_button(f"Download one {fmt.upper()} per quote (ZIP)",
+                               lambda: b''.join(job.archive(fmt, render_pool)),
+                               file_name=f"Forklift_Rental_Quotes_{stem}.zip", mime="application/zip")
+        st.download_button("Download summary (CSV)", job.summary_csv,
+                           file_name=f"Forklift_Rental_Quotes_{stem}.csv", mime="text/csv")
+    
+    @staticmethod
+    @st.fragment(run_every=1.0)
+    def _display_bulk_progress():
+        """Progress of the running bulk job, refreshed on its own every second"""
+        job = st.session_state.get('bulk_job')
+        if job is None:
+            return
+        progress = job.progress()
+        if progress['done']:
+            # Redraw the whole panel with the downloads
+            st.rerun()
+        
+        total = f" of about {progress['total']}" if progress['total'] else ""
+        st.progress(progress['fraction'], text=f"Quoted {progress['processed']}{total} lines")
+        if st.button("Cancel"):
+            job.cancel()
+    
     @staticmethod
     def display_loading_state(text="Processing your request..."):
         """
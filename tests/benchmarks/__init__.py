@@ -0,0 +1,2 @@
+# This file is intentionally empty.
+# It's used to mark the benchmarks directory as a Python package.
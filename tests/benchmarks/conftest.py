@@ -0,0 +1,87 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Benchmarks need the pytest-benchmark plugin (see requirements-dev.txt)
+pytest.importorskip('pytest_benchmark')
+
+# Add the project root to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.data_loader import ForkliftData
+from src.matcher import ForkliftMatcher
+from src.quote import QuoteGenerator
+
+# Number of synthetic inquiries in the end-to-end benchmark
+BENCH_INQUIRIES = int(os.environ.get('BENCH_INQUIRIES', '200'))
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def pytest_collection_modifyitems(config, items):
+    """Deselect the benchmarks unless pytest runs with --benchmark-only (as run_benchmarks.sh does)"""
+    if config.getoption('benchmark_only'):
+        return
+    kept, benchmarks = [], []
+    for item in items:
+        (benchmarks if str(item.fspath).startswith(BENCH_DIR + os.sep) else kept).append(item)
+    if benchmarks:
+        config.hook.pytest_deselected(items=benchmarks)
+        items[:] = kept
+
+
+def synthetic_requirements(count, seed=1234):
+    """
+    Build a reproducible list of requirement dictionaries
+
+    Args:
+        count: Number of inquiries to generate
+        seed: Random seed so every run benchmarks the same workload
+
+    Returns:
+        List of requirement dictionaries as produced by ConversationManager
+    """
+    rng = random.Random(seed)
+    requirements = []
+    for _ in range(count):
+        requirements.append({
+            'load_weight': round(rng.uniform(1.0, 7.5), 1),
+            'rental_period': rng.choice([1, 3, 5, 7, 10, 14, 21, 28, 30, 60, 90]),
+            'indoor_outdoor': rng.choice(['indoor', 'outdoor', 'both']),
+            'lift_height': round(rng.uniform(2.0, 6.0), 1),
+            'special_requirements': rng.choice(['none', 'side shift', 'weight scale']),
+        })
+    return requirements
+
+
+@pytest.fixture(scope='session')
+def forklift_data():
+    return ForkliftData()
+
+
+@pytest.fixture(scope='session')
+def matcher(forklift_data):
+    return ForkliftMatcher(forklift_data)
+
+
+@pytest.fixture(scope='session')
+def quote_generator(forklift_data):
+    return QuoteGenerator(forklift_data)
+
+
+@pytest.fixture(scope='session')
+def requirements():
+    return {'load_weight': '3 tons', 'rental_period': 14, 'indoor_outdoor': 'outdoor'}
+
+
+@pytest.fixture(scope='session')
+def formatted_quote(matcher, quote_generator, requirements):
+    quote_result = quote_generator.generate_quote(matcher.match_forklift(requirements))
+    return quote_generator.format_quote_for_display(quote_result)
+
+
+@pytest.fixture(scope='session')
+def inquiries():
+    return synthetic_requirements(BENCH_INQUIRIES)
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from src.data_loader import ForkliftData
+from src.html_pdf_generator import PDFGenerator as HTMLGenerator
+
+
+def test_catalog_load(benchmark):
+    """Benchmark building the catalog from the data directory"""
+    data = benchmark(ForkliftData)
+    assert len(data.specs_df) > 0
+
+
+def test_get_forklift_by_capacity(benchmark, forklift_data):
+    """Benchmark the capacity lookup"""
+    forklift = benchmark(forklift_data.get_forklift_by_capacity, 3.6)
+    assert forklift['model'] == 'D40s-5'
+
+
+def test_get_rate_for_model(benchmark, forklift_data):
+    """Benchmark the rate lookup"""
+    rates = benchmark(forklift_data.get_rate_for_model, 'D40s-5', 14)
+    assert rates['total_cost'] > 0
+
+
+def test_match_forklift(benchmark, matcher, requirements):
+    """Benchmark matching requirements to a model"""
+    match = benchmark(matcher.match_forklift, requirements)
+    assert match['success']
+
+
+def test_generate_quote(benchmark, matcher, quote_generator, requirements):
+    """Benchmark building the quote from a match"""
+    match = matcher.match_forklift(requirements)
+    quote_result = benchmark(quote_generator.generate_quote, match)
+    assert quote_result['success']
+
+
+def test_format_quote_for_display(benchmark, matcher, quote_generator, requirements):
+    """Benchmark formatting a quote into display sections"""
+    quote_result = quote_generator.generate_quote(matcher.match_forklift(requirements))
+    formatted = benchmark(quote_generator.format_quote_for_display, quote_result)
+    assert formatted['success']
+
+
+def test_render_html(benchmark, formatted_quote):
+    """Benchmark rendering the HTML quote document"""
+    html_content = benchmark(lambda: HTMLGenerator(formatted_quote).get_html_string())
+    assert '<html>' in html_content
+
+
+def test_render_pdf(benchmark, formatted_quote):
+    """Benchmark rendering the FPDF quote document"""
+    pdf_generator = pytest.importorskip('src.pdf_generator')
+
+    def render():
+        path = pdf_generator.PDFGenerator(formatted_quote).generate_pdf()
+        os.remove(path)
+        return path
+
+    assert benchmark(render)
+
+
+def test_end_to_end_inquiries(benchmark, matcher, quote_generator, inquiries):
+    """Benchmark match -> quote -> format -> HTML for a synthetic batch of inquiries"""
+    def run():
+        rendered = 0
+        for requirements in inquiries:
+            quote_result = quote_generator.generate_quote(matcher.match_forklift(requirements))
+            formatted = quote_generator.format_quote_for_display(quote_result)
+            if HTMLGenerator(formatted).get_html_string():
+                rendered += 1
+        return rendered
+
+    assert benchmark.pedantic(run, rounds=3, iterations=1) > 0
+
+
+def test_rank_forklifts_batch(benchmark, matcher, inquiries):
+    """Benchmark vectorized top-K ranking for the synthetic inquiries"""
+    ranked = benchmark(matcher.rank_forklifts_batch, inquiries, 3)
+    assert len(ranked) == len(inquiries)
@@ -0,0 +1,222 @@
+import unittest
+import sys
+import os
+import contextlib
+import http.client
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+import zipfile
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api import QuoteAPI, create_server
+from src.data_loader import ForkliftData
+from src.match_cache import MatchCache
+
+class TestQuoteAPI(unittest.TestCase):
+    """Test cases for the JSON quote API"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared catalog"""
+        cls.data = ForkliftData()
+
+    def setUp(self):
+        """Set up the test environment"""
+        self.api = QuoteAPI(self.data)
+
+    def test_quote(self):
+        """Test quoting directly from requirements"""
+        status, response = self.api.handle('POST', '/quote', {
+            'requirements': {'load_weight': 3.0, 'rental_period': 7, 'indoor_outdoor': 'outdoor'},
+            'render': True
+        })
+
+        self.assertEqual(status, 200)
+        self.assertTrue(response['success'], "Quote should succeed")
+        self.assertIn('D40s-5', response['formatted_quote']['title'], "Should quote the matched model")
+        self.assertIn('<html>', response['html'], "Should include the rendered document")
+
+    def test_conversation_flow(self):
+        """Test answering all questions through a conversation"""
+        status, started = self.api.handle('POST', '/conversations', None)
+        self.assertEqual(status, 201)
+        self.assertIn('weight', started['question'])
+
+        path = f"/conversations/{started['id']}/answers"
+        status, response = self.api.handle('POST', path, {'answer': 'heavy'})
+        self.assertFalse(response['valid'], "Invalid answer should be rejected")
+
+        for answer in ['3 tons', '7 days', 'outdoor', '3 meters', 'none']:
+            status, response = self.api.handle('POST', path, {'answer': answer})
+            self.assertTrue(response['valid'], f"Answer '{answer}' should be valid")
+
+        self.assertTrue(response['complete'], "Conversation should be complete")
+        self.assertTrue(response['quote']['success'], "Completed conversation should include a quote")
+
+        status, response = self.api.handle('POST', path, {'answer': 'again'})
+        self.assertEqual(status, 404, "Completed conversations should be released")
+
+    def test_conversation_eviction(self):
+        """Test that the oldest conversations are dropped beyond the limit"""
+        api = QuoteAPI(self.data, max_conversations=2)
+        first = api.start_conversation()['id']
+        api.start_conversation()
+        api.start_conversation()
+
+        status, _ = api.answer(first, '3 tons')
+        self.assertEqual(status, 404, "Oldest conversation should be evicted")
+
+    def test_readiness_and_cache_snapshot(self):
+        """Test the readiness report and the hot requirement snapshot"""
+        api = QuoteAPI(self.data, match_cache=MatchCache())
+        api.data.get_rate_index()
+        api.data.get_candidate_table()
+        requirements = {'load_weight': 3.0, 'rental_period': 7, 'indoor_outdoor': 'outdoor'}
+        api.quote(requirements)
+        api.quote(requirements)
+
+        status, report = api.handle('GET', '/ready', None)
+        self.assertEqual(status, 200)
+        self.assertTrue(report['ready'])
+        self.assertEqual(report['catalog_version'], self.data.catalog_version)
+        self.assertEqual(report['cache']['entries'], 1)
+        self.assertEqual(report['cache']['hits'], 1)
+
+        status, snapshot = api.handle('GET', '/cache/snapshot', None)
+        self.assertEqual(snapshot['entries'], [{'requirements': requirements, 'hits': 1}])
+
+    def test_archive(self):
+        """Test quoting many inquiries into a streamed ZIP"""
+        status, chunks = self.api.handle('POST', '/quotes/archive', {
+            'requirements': [{'load_weight': 3.0, 'rental_period': 7}, {'load_weight': 5.0, 'rental_period': 14}]
+        })
+
+        self.assertEqual(status, 200)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+        self.assertEqual(len(archive.namelist()), 2)
+
+        status, response = self.api.handle('POST', '/quotes/archive', {'requirements': []})
+        self.assertEqual(status, 400)
+        status, response = self.api.handle('POST', '/quotes/archive', {
+            'requirements': [{'load_weight': 3.0}], 'format': 'docx'
+        })
+        self.assertEqual(status, 400)
+
+    def test_archive_rejects_bad_entries(self):
+        """Test that every entry is checked before the archive starts streaming"""
+        for bad in ('3 tons', {'load_weight': 3.0, 'rental_period': 'a week'},
+                    {'load_weight': 3.0, 'start_date': 'soon'},
+                    {'load_weight': 3.0, 'unit_periods': [{'quantity': 2}]}):
+            status, response = self.api.handle('POST', '/quotes/archive', {
+                'requirements': [{'load_weight': 3.0, 'rental_period': 7}, bad]
+            })
+            self.assertEqual(status, 400, f"{bad!r} should be rejected")
+            self.assertIn('requirements[1]', response['message'])
+
+    def test_archive_failure_over_http(self):
+        """Test that a failed render never reaches the client as a valid ZIP"""
+        format_quote = self.api.quote_generator.format_quote_for_display
+        calls = []
+
+        def failing(quote_result):
+            calls.append(quote_result)
+            if len(calls) == 2:
+                raise RuntimeError("render failed")
+            return format_quote(quote_result)
+
+        self.api.quote_generator.format_quote_for_display = failing
+        server = create_server(self.api, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{server.server_address[1]}/quotes/archive",
+                data=json.dumps({'requirements': [{'load_weight': w, 'rental_period': 5}
+                                                  for w in (2.0, 3.0, 4.0)]}).encode('utf-8'),
+                headers={'Content-Type': 'application/json'},
+                method='POST'
+            )
+            with self.assertRaises((OSError, http.client.HTTPException, zipfile.BadZipFile)):
+                with urllib.request.urlopen(request) as response:
+                    zipfile.ZipFile(io.BytesIO(response.read()))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_malformed_requests(self):
+        """Test that malformed bodies get a 400 and internal failures a JSON 500"""
+        status, response = self.api.handle('POST', '/quote', {'requirements': ['3 tons']})
+        self.assertEqual(status, 400)
+        self.assertFalse(response['success'])
+        status, response = self.api.handle('POST', '/quote', {'requirements': {'load_weight': 3.0,
+                                                                               'rental_period': '2 weeks'}})
+        self.assertEqual(status, 400)
+        status, response = self.api.handle('POST', '/quote', [{'load_weight': 3.0}])
+        self.assertEqual(status, 400)
+        for item in ({'quantity': -2}, {'days': -5}, {'quantity': 'two'}):
+            status, response = self.api.handle('POST', '/quote', {'requirements': {
+                'load_weight': 3.0, 'items': [dict(item, description='EXCAVATOR - 3.5T')]
+            }})
+            self.assertEqual(status, 400, f"{item} should be rejected")
+
+        def broken(match):
+            raise KeyError('rates')
+
+        self.api.quote_generator.generate_quote = broken
+        with contextlib.redirect_stderr(io.StringIO()):
+            status, response = self.api.handle('POST', '/quote', {'requirements': {'load_weight': 3.0}})
+        self.assertEqual(status, 500)
+        self.assertFalse(response['success'])
+
+    def test_unknown_route(self):
+        """Test that unknown routes return 404"""
+        status, response = self.api.handle('GET', '/nope', None)
+        self.assertEqual(status, 404)
+        self.assertFalse(response['success'])
+
+    def test_http_server(self):
+        """Test the API over HTTP"""
+        server = create_server(self.api, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/quote"
+            request = urllib.request.Request(
+                url,
+                data=json.dumps({'requirements': {'load_weight': 5.0, 'rental_period': 14}}).encode('utf-8'),
+                headers={'Content-Type': 'application/json'},
+                method='POST'
+            )
+            with urllib.request.urlopen(request) as response:
+                body = json.loads(response.read())
+            self.assertTrue(body['success'], "Quote should succeed over HTTP")
+
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{server.server_address[1]}/quotes/archive",
+                data=json.dumps({'requirements': [{'load_weight': 2.0, 'rental_period': 5}]}).encode('utf-8'),
+                headers={'Content-Type': 'application/json'},
+                method='POST'
+            )
+            with urllib.request.urlopen(request) as response:
+                self.assertEqual(response.headers['Content-Type'], 'application/zip')
+                archive = zipfile.ZipFile(io.BytesIO(response.read()))
+            self.assertEqual(len(archive.namelist()), 1, "The archive should stream over HTTP")
+
+            request = urllib.request.Request(
+                url, data=b'[1, 2]', headers={'Content-Type': 'application/json'}, method='POST'
+            )
+            with self.assertRaises(urllib.error.HTTPError) as caught:
+                urllib.request.urlopen(request)
+            self.assertEqual(caught.exception.code, 400)
+            self.assertFalse(json.loads(caught.exception.read())['success'])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import importlib.util
+import io
+import json
+import sys
+import os
+import tempfile
+import zipfile
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.archive import document_name, main, stream_archive, write_archive
+from src.data_loader import ForkliftData
+from src.matcher import ForkliftMatcher
+from src.quote import QuoteGenerator
+from src.render_pool import RenderPool
+
+FPDF_AVAILABLE = importlib.util.find_spec('fpdf') is not None
+
+class TestArchive(unittest.TestCase):
+    """Test cases for streaming ZIP archives of quote documents"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Quote a few inquiries to archive"""
+        data = ForkliftData()
+        matcher = ForkliftMatcher(data)
+        quote_generator = QuoteGenerator(data)
+        cls.quotes = [
+            quote_generator.format_quote_for_display(quote_generator.generate_quote(matcher.match_forklift(r)))
+            for r in (
+                {'load_weight': 2.0, 'rental_period': 5, 'indoor_outdoor': 'indoor'},
+                {'load_weight': 5.0, 'rental_period': 14, 'indoor_outdoor': 'outdoor'},
+                {'load_weight': 50.0, 'rental_period': 5, 'indoor_outdoor': 'both'},
+                {'load_weight': 2.0, 'rental_period': 5, 'indoor_outdoor': 'indoor'},
+            )
+        ]
+
+    def test_archive_streams_one_entry_per_quote(self):
+        """Test that documents are written as they are rendered and the archive is valid"""
+        chunks = list(stream_archive(self.quotes, 'html'))
+
+        # One chunk per document plus the central directory
+        self.assertEqual(len(chunks), 4)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+        self.assertIsNone(archive.testzip())
+        names = archive.namelist()
+        self.assertEqual(len(names), 3, "The unmatched inquiry should be skipped")
+        self.assertEqual(names[0], document_name(self.quotes[0], 'html'))
+        self.assertTrue(names[2].endswith('_2.html'), "Repeated names should get a suffix")
+        self.assertIn(b'<html>', archive.read(names[1]))
+
+    def test_write_archive(self):
+        """Test writing an archive to a file object"""
+        target = io.BytesIO()
+        size = write_archive(iter(self.quotes), target, 'html')
+
+        self.assertEqual(size, len(target.getvalue()))
+        self.assertEqual(len(zipfile.ZipFile(target).namelist()), 3)
+
+    def test_empty_archive(self):
+        """Test that an archive without quotes is still a valid ZIP"""
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(stream_archive([], 'html'))))
+        self.assertEqual(archive.namelist(), [])
+
+        with self.assertRaises(ValueError):
+            list(stream_archive(self.quotes, 'docx'))
+
+    @unittest.skipIf(not FPDF_AVAILABLE, "fpdf is not installed")
+    def test_archive_renders_on_pool(self):
+        """Test rendering the documents on a render pool's bulk lane"""
+        pool = RenderPool(workers=1, bulk_workers=2)
+        try:
+            data = b''.join(stream_archive(self.quotes, 'pdf', render_pool=pool, window=2))
+        finally:
+            pool.shutdown()
+
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        self.assertEqual(len(archive.namelist()), 3)
+        self.assertTrue(archive.read(archive.namelist()[0]).startswith(b'%PDF'))
+        self.assertEqual(pool.stats()['completed']['bulk'], 3)
+
+    def test_cli_from_requirements(self):
+        """Test the command line with a JSON list of requirements"""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'requirements.json')
+            with open(source, 'w') as f:
+                json.dump([{'load_weight': 3.0, 'rental_period': 7}, {'load_weight': 4.0, 'rental_period': 30}], f)
+            output = os.path.join(directory, 'quotes.zip')
+
+            self.assertEqual(main([output, '--from', source]), 0)
+            self.assertEqual(len(zipfile.ZipFile(output).namelist()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
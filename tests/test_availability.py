@@ -0,0 +1,185 @@
+import unittest
+import sys
+import os
+import datetime
+import random
+import time
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.availability import FleetAvailability, UnitSchedule
+from src.data_loader import ForkliftData
+from src.matcher import ForkliftMatcher
+from src.quote import QuoteGenerator
+
+class TestFleetAvailability(unittest.TestCase):
+    """Test cases for the fleet availability engine"""
+
+    def setUp(self):
+        """Set up the test environment"""
+        self.start = datetime.date(2030, 1, 1)
+        self.fleet = FleetAvailability.from_counts({'D40s-5': 2, 'D45s-5': 1})
+
+    def test_unit_schedule_overlaps(self):
+        """Test half-open interval overlap checks"""
+        schedule = UnitSchedule()
+        self.assertTrue(schedule.insert(10, 20, 1))
+        self.assertTrue(schedule.insert(30, 40, 2))
+
+        self.assertTrue(schedule.overlaps(15, 16), "Inside an interval should overlap")
+        self.assertTrue(schedule.overlaps(5, 11), "Crossing the start should overlap")
+        self.assertFalse(schedule.overlaps(20, 30), "The gap between intervals should be free")
+        self.assertFalse(schedule.overlaps(0, 10), "Ending at a start should not overlap")
+        self.assertFalse(schedule.insert(19, 31, 3), "Overlapping insert should be rejected")
+
+    def test_unit_schedule_first_free(self):
+        """Test finding the first gap long enough for a rental"""
+        schedule = UnitSchedule()
+        schedule.insert(10, 20, 1)
+        schedule.insert(22, 30, 2)
+
+        self.assertEqual(schedule.first_free(0, 5), 0, "Free before the first booking")
+        self.assertEqual(schedule.first_free(8, 5), 30, "Gap of 2 days is too short for 5")
+        self.assertEqual(schedule.first_free(8, 2), 8, "Two free days before the first booking")
+        self.assertEqual(schedule.first_free(9, 2), 20, "Gap of 2 days fits 2")
+
+    def test_book_uses_free_units(self):
+        """Test that bookings fill free units and then fail"""
+        first = self.fleet.book('D40s-5', self.start, 7)
+        second = self.fleet.book('D40s-5', self.start, 7)
+        third = self.fleet.book('D40s-5', self.start, 7)
+
+        self.assertTrue(first['success'] and second['success'])
+        self.assertNotEqual(first['unit_id'], second['unit_id'], "Should use different units")
+        self.assertFalse(third['success'], "Third booking should fail with two units")
+        self.assertEqual(self.fleet.count_free('D40s-5', self.start, 7), 0)
+        self.assertEqual(self.fleet.count_free('D40s-5', self.start + datetime.timedelta(days=7), 7), 2)
+
+    def test_maintenance_and_cancel(self):
+        """Test maintenance windows block units and cancellations free them"""
+        result = self.fleet.add_maintenance('D45s-5#1', self.start, 3)
+        self.assertTrue(result['success'])
+        self.assertFalse(self.fleet.is_available('D45s-5', self.start, 1))
+
+        self.assertTrue(self.fleet.cancel(result['booking_id']))
+        self.assertTrue(self.fleet.is_available('D45s-5', self.start, 1))
+        self.assertFalse(self.fleet.cancel(result['booking_id']), "Double cancel should report False")
+
+    def test_first_free_slot(self):
+        """Test the earliest slot across units of a model"""
+        self.fleet.book('D40s-5', self.start, 10, unit_id='D40s-5#1')
+        self.fleet.book('D40s-5', self.start, 5, unit_id='D40s-5#2')
+
+        slot = self.fleet.first_free_slot('D40s-5', 7, self.start)
+        self.assertEqual(slot, (self.start + datetime.timedelta(days=5), 'D40s-5#2'))
+        self.assertIsNone(self.fleet.first_free_slot('D90s-5', 7, self.start), "Untracked model has no slot")
+
+    def test_model_index_matches_units(self):
+        """Test model-level queries against a scan of every unit's schedule"""
+        fleet = FleetAvailability.from_counts({'D40s-5': 4})
+        fleet.is_available('D40s-5', self.start, 1)  # Build the index first so every change updates it
+        rng = random.Random(1)
+        booking_ids = []
+        for i in range(400):
+            start = self.start + datetime.timedelta(days=rng.randint(0, 365))
+            unit_id = f"D40s-5#{rng.randint(1, 5)}" if i % 2 else None
+            if i == 200:
+                fleet.add_unit('D40s-5')
+            result = fleet.book('D40s-5', start, rng.randint(1, 20), unit_id=unit_id)
+            if result['success']:
+                booking_ids.append(result['booking_id'])
+            if i % 5 == 0 and booking_ids:
+                self.assertTrue(fleet.cancel(booking_ids.pop(rng.randrange(len(booking_ids)))))
+
+        units = fleet.units_by_model['D40s-5']
+        for _ in range(300):
+            start = self.start + datetime.timedelta(days=rng.randint(-10, 400))
+            days = rng.randint(1, 30)
+            ordinal = start.toordinal()
+            free = [u for u in units if not fleet.schedules[u].overlaps(ordinal, ordinal + days)]
+            self.assertEqual(fleet.free_units('D40s-5', start, days), free)
+            self.assertEqual(fleet.is_available('D40s-5', start, days), bool(free))
+            self.assertEqual(fleet.availability_matrix(['D40s-5'], [start], [days])[0, 0], bool(free))
+            self.assertEqual(list(fleet.free_run_lengths('D40s-5', start)),
+                             [fleet.schedules[u].free_run(ordinal) for u in units])
+
+            slot_start, slot_unit = fleet.first_free_slot('D40s-5', days, start)
+            self.assertEqual(slot_start.toordinal(), min(fleet.schedules[u].first_free(ordinal, days) for u in units))
+            self.assertFalse(fleet.schedules[slot_unit].overlaps(slot_start.toordinal(), slot_start.toordinal() + days))
+
+    def test_availability_matrix(self):
+        """Test the batched availability matrix against single lookups"""
+        rng = random.Random(2)
+        for _ in range(60):
+            self.fleet.book(rng.choice(['D40s-5', 'D45s-5']),
+                            self.start + datetime.timedelta(days=rng.randint(0, 60)), rng.randint(1, 10))
+
+        models = ['D40s-5', 'D45s-5', 'D60s-5']
+        starts = [self.start + datetime.timedelta(days=rng.randint(-5, 70)) for _ in range(40)]
+        days = [rng.randint(1, 15) for _ in starts]
+        starts += starts[:5]
+        days += days[:5]
+        mask = self.fleet.availability_matrix(models, starts, days)
+
+        self.assertEqual(mask.shape, (len(starts), len(models)))
+        for i, (start, rental_days) in enumerate(zip(starts, days)):
+            self.assertEqual(list(mask[i]), [self.fleet.is_available(m, start, rental_days) for m in models])
+
+    def test_rejected_booking_keeps_ids(self):
+        """Test that a rejected booking does not use up a booking ID"""
+        first = self.fleet.book('D45s-5', self.start, 7)
+        self.assertFalse(self.fleet.book('D45s-5', self.start, 7)['success'])
+        self.assertFalse(self.fleet.book('D45s-5', self.start, 7, unit_id='D45s-5#1')['success'])
+        self.assertEqual(self.fleet.book('D40s-5', self.start, 7)['booking_id'], first['booking_id'] + 1)
+
+    def test_many_bookings(self):
+        """Test that bookings and queries stay fast with tens of thousands of bookings"""
+        fleet = FleetAvailability.from_counts({'D40s-5': 300})
+        rng = random.Random(0)
+        booked = 0
+        begin = time.perf_counter()
+        while booked < 20000:
+            # No unit_id: the engine picks the unit, interleaved with model-level queries
+            start = self.start + datetime.timedelta(days=rng.randint(0, 3650))
+            booked += fleet.book('D40s-5', start, rng.randint(1, 30))['success']
+            fleet.is_available('D40s-5', start, 14)
+            fleet.first_free_slot('D40s-5', 14, start)
+        self.assertLess(time.perf_counter() - begin, 20.0, "20,000 bookings with queries should stay fast")
+
+        begin = time.perf_counter()
+        for offset in range(100):
+            fleet.count_free('D40s-5', self.start + datetime.timedelta(days=offset * 30), 14)
+            fleet.first_free_slot('D40s-5', 14, self.start + datetime.timedelta(days=offset * 30))
+        self.assertLess(time.perf_counter() - begin, 1.0, "200 queries over 20,000 bookings should be fast")
+
+    def test_matcher_offers_only_available_models(self):
+        """Test that matching skips fully booked models"""
+        data = ForkliftData()
+        matcher = ForkliftMatcher(data, availability=self.fleet)
+        requirements = {'load_weight': 3.0, 'rental_period': 7, 'start_date': self.start}
+
+        self.assertEqual(matcher.match_forklift(requirements)['forklift']['model'], 'D40s-5')
+
+        self.fleet.book('D40s-5', self.start, 7)
+        self.fleet.book('D40s-5', self.start, 7)
+        match = matcher.match_forklift(requirements)
+        self.assertEqual(match['forklift']['model'], 'D45s-5', "Should fall back to the next free model")
+        self.assertEqual(match['rental_details']['start_date'], '2030-01-01')
+
+        self.fleet.book('D45s-5', self.start, 7)
+        match = matcher.match_forklift(requirements)
+        self.assertFalse(match['success'], "Should fail when every adequate model is booked")
+        self.assertIn("08 January 2030", match['message'], "Should mention the earliest availability")
+
+    def test_quote_uses_start_date(self):
+        """Test that quotes use the matched start date"""
+        data = ForkliftData()
+        match = ForkliftMatcher(data).match_forklift({'load_weight': 3.0, 'rental_period': 7, 'start_date': '2030-01-01'})
+        quote = QuoteGenerator(data).generate_quote(match)['quote']
+
+        self.assertEqual(quote['rental_period']['start_date'], '01 January 2030')
+        self.assertEqual(quote['rental_period']['end_date'], '07 January 2030')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import brochures
+from src.brochures import BrochureStore, excerpt, map_models_to_brochures
+from src.data_loader import ForkliftData
+from src.matcher import ForkliftMatcher
+
+def write_pdf(path, lines):
+    """Write a one-page PDF with the given text lines"""
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font('Arial', '', 12)
+    for line in lines:
+        pdf.cell(0, 10, line, 0, 1)
+    pdf.output(path)
+
+class TestBrochureMapping(unittest.TestCase):
+    """Test cases for the model to brochure mapping"""
+
+    def test_builtin_mapping(self):
+        """Test that the built-in brochures cover their model ranges"""
+        data = ForkliftData()
+        self.assertEqual(data.get_brochure_key('D35s-5'), 'D35-D55')
+        self.assertEqual(data.get_brochure_key('D55C-5'), 'D35-D55')
+        self.assertEqual(data.get_brochure_key('D90s-5'), 'D60-D90')
+        self.assertIn('6.0 to 9.0 ton', data.get_brochure_content('D70s-5'))
+        self.assertEqual(data.get_brochure_content('X1'), "Brochure not available for this model.")
+
+    def test_text_mentions_win(self):
+        """Test that a brochure naming a model beats a range brochure"""
+        mapping = map_models_to_brochures(
+            ['D40s-5', 'D45s-5', 'G25'],
+            {'D35-D55': 'range brochure', 'special': 'Covers the D45s-5 only'}
+        )
+        self.assertEqual(mapping, {'D40s-5': 'D35-D55', 'D45s-5': 'special'})
+
+    def test_excerpt(self):
+        """Test cutting excerpts at paragraph boundaries"""
+        text = "A" * 900 + "\n\n" + "B" * 900
+        self.assertEqual(excerpt(text, 1500), "A" * 900)
+        self.assertEqual(excerpt("short"), "short")
+
+@unittest.skipIf(not brochures.PYPDF_AVAILABLE, "pypdf is not installed")
+class TestBrochureStore(unittest.TestCase):
+    """Test cases for incremental brochure PDF extraction"""
+
+    def setUp(self):
+        """Set up a scratch data directory with one brochure"""
+        self.tmp = tempfile.mkdtemp()
+        self.pdf = os.path.join(self.tmp, 'G20-G30.pdf')
+        write_pdf(self.pdf, ["LPG forklifts G-Series", "Models G25 and G30"])
+
+    def tearDown(self):
+        """Remove the scratch data directory"""
+        shutil.rmtree(self.tmp)
+
+    def test_incremental_refresh(self):
+        """Test that only new or changed content is extracted"""
+        store = BrochureStore(self.tmp, workers=1)
+        self.assertEqual(store.refresh()['extracted'], ['G20-G30.pdf'])
+        self.assertIn('G-Series', store.read('G20-G30'))
+
+        # Unchanged files are skipped on a fresh store from the manifest alone
+        self.assertEqual(BrochureStore(self.tmp).refresh()['unchanged'], 1)
+
+        # Identical content under another name reuses the cached text
+        shutil.copy(self.pdf, os.path.join(self.tmp, 'copy.pdf'))
+        report = store.refresh()
+        self.assertEqual((report['extracted'], report['reused']), ([], ['copy.pdf']))
+
+        # Changed content is extracted again; removed files leave the manifest
+        write_pdf(self.pdf, ["Electric forklifts"])
+        os.remove(os.path.join(self.tmp, 'copy.pdf'))
+        report = store.refresh()
+        self.assertEqual((report['extracted'], report['removed']), (['G20-G30.pdf'], ['copy.pdf']))
+        self.assertIn('Electric', store.read('G20-G30'))
+        self.assertEqual(sorted(os.listdir(os.path.join(self.tmp, '.brochure_cache', 'text'))),
+                         [store.keys()['G20-G30'] + '.json', store.keys()['G20-G30'] + '.txt'])
+
+    def test_catalog_uses_pdf_brochures(self):
+        """Test that extracted brochures map onto catalog models"""
+        with open(os.path.join(self.tmp, 'specs.csv'), 'w') as f:
+            f.write("model,capacity_tons,fuel_type\nG25,2.5,LPG\nG30,3.0,LPG\n")
+        data = ForkliftData(self.tmp)
+        self.assertEqual(data.get_brochure_key('G25'), 'G20-G30')
+        self.assertIn('G-Series', data.get_brochure_excerpt('G30'))
+
+    def test_full_text_read_on_demand(self):
+        """Test that loading and matching use the summary and only the full brochure reads the text"""
+        write_pdf(self.pdf, ["LPG forklifts G-Series, models G25 and G30"] + ["Specification line"] * 120)
+        with open(os.path.join(self.tmp, 'specs.csv'), 'w') as f:
+            f.write("model,capacity_tons,fuel_type\nG25,2.5,LPG\nG30,3.0,LPG\n")
+        BrochureStore(self.tmp, workers=1).refresh()
+
+        reads = []
+        original = BrochureStore.read
+        BrochureStore.read = lambda store, key: reads.append(key) or original(store, key)
+        try:
+            data = ForkliftData(self.tmp)
+            match = ForkliftMatcher(data).match_forklift({'load_weight': 2.0, 'rental_period': 5})
+            self.assertEqual(reads, [], "Loading and matching should not read the full text")
+
+            self.assertEqual(match['brochure_key'], 'G20-G30')
+            self.assertTrue(match['brochure_truncated'])
+            self.assertGreater(len(data.get_brochure_text('G20-G30')), len(match['brochure_excerpt']))
+            self.assertEqual(reads, ['G20-G30'])
+        finally:
+            BrochureStore.read = original
+
+if __name__ == '__main__':
+    unittest.main()
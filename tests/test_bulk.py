@@ -0,0 +1,132 @@
+import unittest
+import csv
+import importlib.util
+import io
+import sys
+import os
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.bulk import BulkQuoteJob, count_rows, line_requirements, map_columns, read_lines
+from src.data_loader import ForkliftData
+from src.matcher import ForkliftMatcher
+from src.quote import QuoteGenerator
+
+OPENPYXL_AVAILABLE = importlib.util.find_spec('openpyxl') is not None
+
+ROWS = [
+    ['Reference', 'Weight (kg)', 'Days', 'Environment', 'Lift height', 'Notes', 'Qty', 'Start date'],
+    ['PO-1', '2000', '5', 'Indoor', '4m', '', '', ''],
+    ['PO-2', '3000', '14', 'outdoor', '', 'side shift', '3', '2030-03-02'],
+    ['', '', '', '', '', '', '', ''],
+    ['PO-3', '2500', '7', 'garage', '', '', '', ''],
+    ['PO-4', '20000', '7', 'both', '', '', '', ''],
+]
+
+
+def spreadsheet(rows=ROWS):
+    """CSV upload as bytes"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return io.BytesIO(buffer.getvalue().encode('utf-8'))
+
+class TestBulk(unittest.TestCase):
+    """Test cases for bulk quoting from spreadsheets"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Share the catalog across tests"""
+        cls.data = ForkliftData()
+        cls.matcher = ForkliftMatcher(cls.data)
+        cls.quote_generator = QuoteGenerator(cls.data)
+
+    def test_map_columns(self):
+        """Test header aliases, units and the required columns"""
+        columns = map_columns(ROWS[0])
+        self.assertEqual(columns[1], ('load_weight', 'kg'))
+        self.assertEqual(columns[2], ('rental_period', 'days'))
+        self.assertEqual(columns[0], ('reference', None))
+
+        with self.assertRaises(ValueError):
+            map_columns(['Weight', 'Notes'])
+
+    def test_read_lines_streams_chunks(self):
+        """Test that lines come in chunks with spreadsheet row numbers and units applied"""
+        chunks = list(read_lines(spreadsheet(), 'lines.csv', chunk_rows=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2])
+        first = chunks[0][0]
+        self.assertEqual(first['line'], 2)
+        self.assertEqual(first['reference'], 'PO-1')
+        self.assertEqual(first['answers']['load_weight'], '2000 kg')
+        self.assertEqual(first['answers']['rental_period'], '5 days')
+        # The blank row is skipped but keeps the numbering
+        self.assertEqual(chunks[1][0]['line'], 5)
+        self.assertEqual(count_rows(spreadsheet(), 'lines.csv'), 5)
+
+    def test_line_requirements(self):
+        """Test that a quantity becomes a fleet order and dates are kept"""
+        requirements, errors = line_requirements({
+            'load_weight': '3000 kg', 'rental_period': '14 days', 'indoor_outdoor': 'outdoor',
+            'quantity': '3', 'start_date': '2030-03-02 00:00:00'
+        })
+
+        self.assertEqual(errors, [])
+        self.assertEqual(requirements['unit_periods'], [{'quantity': 3, 'days': 14}])
+        self.assertEqual(requirements['start_date'], '2030-03-02')
+
+        _, errors = line_requirements({'load_weight': '3 tons', 'rental_period': '5', 'indoor_outdoor': 'both',
+                                       'start_date': 'next week'})
+        self.assertEqual(len(errors), 1)
+
+    def test_job_quotes_every_line(self):
+        """Test a background job end to end"""
+        job = BulkQuoteJob(spreadsheet(), 'lines.csv', self.matcher, self.quote_generator).start()
+        self.assertTrue(job.wait(30))
+
+        progress = job.progress()
+        self.assertIsNone(progress['error'])
+        self.assertEqual((progress['processed'], progress['quoted'], progress['failed']), (4, 2, 2))
+        self.assertEqual(progress['fraction'], 1.0)
+
+        results = {r['reference']: r for r in job.results}
+        self.assertEqual(results['PO-2']['formatted_quote']['title'].split('-')[-1], 'L3')
+        self.assertIn('indoor, outdoor, both', results['PO-3']['message'])
+        self.assertIn('No suitable forklift', results['PO-4']['message'])
+
+        document = job.combined_html()
+        self.assertEqual(document.count('<html'), 1)
+        self.assertEqual(document.count('page-break-before'), 1)
+
+        summary = list(csv.reader(io.StringIO(job.summary_csv())))
+        self.assertEqual(len(summary), 5)
+        self.assertEqual(summary[1][2], 'quoted')
+        self.assertEqual(summary[3][2], 'failed')
+
+    def test_job_reports_unreadable_file(self):
+        """Test that a file without the required columns ends the job with an error"""
+        job = BulkQuoteJob(spreadsheet([['Notes'], ['hello']]), 'lines.csv', self.matcher, self.quote_generator)
+        job.run()
+
+        self.assertTrue(job.done)
+        self.assertIn('Missing column', job.progress()['error'])
+
+    @unittest.skipIf(not OPENPYXL_AVAILABLE, "openpyxl is not installed")
+    def test_xlsx_upload(self):
+        """Test that XLSX files are read like CSV files"""
+        import openpyxl
+        workbook = openpyxl.Workbook()
+        for row in ROWS:
+            workbook.active.append([float(cell) if cell.isdigit() else cell for cell in row])
+        upload = io.BytesIO()
+        workbook.save(upload)
+
+        job = BulkQuoteJob(upload, 'lines.xlsx', self.matcher, self.quote_generator)
+        job.run()
+
+        self.assertEqual(job.progress()['quoted'], 2)
+        self.assertEqual(job.results[0]['requirements']['load_weight'], 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
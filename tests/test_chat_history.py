@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.chat_history import ChatHistory
+
+class TestChatHistory(unittest.TestCase):
+    """Test cases for the compact chat history"""
+
+    def setUp(self):
+        """Fill a history with alternating turns"""
+        self.history = ChatHistory()
+        for i in range(45):
+            self.history.append({'role': 'assistant' if i % 2 == 0 else 'user', 'content': f"message {i}"})
+
+    def test_reads_like_a_message_list(self):
+        """Test indexing, slicing and iteration"""
+        self.assertEqual(len(self.history), 45)
+        self.assertEqual(self.history[1], {'role': 'user', 'content': 'message 1'})
+        self.assertEqual(self.history[-1]['content'], 'message 44')
+        self.assertEqual([m['content'] for m in self.history[-2:]], ['message 43', 'message 44'])
+        self.assertEqual(len(list(self.history)), 45)
+
+    def test_pages_exclude_recent_window(self):
+        """Test paging over the messages older than the recent window"""
+        self.assertEqual(self.history.page_count(10, exclude_recent=12), 4)
+        self.assertEqual(self.history.page_range(1, 10, exclude_recent=12), (0, 10))
+        self.assertEqual(self.history.page_range(4, 10, exclude_recent=12), (30, 33))
+        self.assertEqual(ChatHistory().page_count(10, exclude_recent=12), 0)
+
+    def test_render_range(self):
+        """Test that only the requested range is rendered"""
+        markup = self.history.render_html(len(self.history) - 2)
+
+        self.assertEqual(markup.count('chat-message'), 2)
+        self.assertIn('<div class="chat-message user-message">message 43</div>', markup)
+        self.assertIn('assistant-message">message 44', markup)
+
+    def test_content_escaped(self):
+        """Test that typed markup is shown as text"""
+        self.history.append({'role': 'user', 'content': '<b>3 tons</b>'})
+        self.assertIn('&lt;b&gt;3 tons&lt;/b&gt;', self.history.render_html(45))
+
+if __name__ == '__main__':
+    unittest.main()
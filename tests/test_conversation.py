@@ -166,6 +166,71 @@ class TestConversationManager(unittest.TestCase):
             3.048,
             "Should normalize '10 feet' to 3.048"
         )
+    
+    def answer_all(self):
+        """Answer every question in order"""
+        for answer in ["3 tons", "5 days", "indoor", "4 meters", "side shift"]:
+            self.conversation.process_answer(answer)
+    
+    def test_edit_answer(self):
+        """Test changing an earlier answer without re-asking the others"""
+        self.answer_all()
+        self.assertTrue(self.conversation.is_complete())
+        
+        is_valid, feedback = self.conversation.edit_answer('lift_height', "6 meters")
+        
+        self.assertTrue(is_valid, "Edited answer should be valid")
+        self.assertIn("Updated", feedback)
+        requirements = self.conversation.get_requirements()
+        self.assertEqual(requirements['lift_height'], 6.0)
+        self.assertEqual(requirements['load_weight'], 3.0, "Other answers should be kept")
+        self.assertEqual(self.conversation.get_answer('lift_height'), "6 meters")
+        self.assertTrue(self.conversation.is_complete(), "Editing should not restart the conversation")
+    
+    def test_edit_answer_rejected(self):
+        """Test that invalid, unknown and unanswered edits change nothing"""
+        self.conversation.process_answer("3 tons")
+        
+        self.assertFalse(self.conversation.edit_answer('load_weight', "heavy")[0])
+        self.assertFalse(self.conversation.edit_answer('colour', "red")[0])
+        self.assertFalse(self.conversation.edit_answer('rental_period', "5 days")[0])
+        self.assertEqual(self.conversation.get_requirements(), {'load_weight': 3.0})
+        self.assertEqual([q['id'] for q in self.conversation.answered()], ['load_weight'])
+    
+    def test_edit_rental_period_updates_fleet_order(self):
+        """Test that editing the rental period replaces the unit periods"""
+        self.answer_all()
+        self.conversation.edit_answer('rental_period', "2 for 2 weeks and 1 for 3 months")
+        self.assertEqual(self.conversation.get_requirements()['rental_period'], 90)
+        self.assertEqual(len(self.conversation.get_requirements()['unit_periods']), 2)
+        
+        self.conversation.edit_answer('rental_period', "10 days")
+        self.assertEqual(self.conversation.get_requirements()['rental_period'], 10)
+        self.assertNotIn('unit_periods', self.conversation.get_requirements())
+    
+    def test_answer_all(self):
+        """Test answering every question at once, as a spreadsheet line does"""
+        errors = self.conversation.answer_all({
+            'load_weight': '2500 kg', 'rental_period': '2 weeks', 'indoor_outdoor': 'Outdoor',
+            'lift_height': '', 'special_requirements': 'side shift'
+        })
+        
+        self.assertEqual(errors, [])
+        self.assertTrue(self.conversation.is_complete())
+        requirements = self.conversation.get_requirements()
+        self.assertEqual(requirements['load_weight'], 2.5)
+        self.assertEqual(requirements['rental_period'], 14)
+        self.assertEqual(requirements['indoor_outdoor'], 'outdoor')
+        self.assertNotIn('lift_height', requirements)
+    
+    def test_answer_all_reports_errors(self):
+        """Test that missing and invalid answers are reported"""
+        errors = self.conversation.answer_all({'load_weight': '2 tons', 'indoor_outdoor': 'garage'})
+        
+        self.assertEqual(len(errors), 2)
+        self.assertIn("How long", errors[0])
+        self.assertIn("indoor, outdoor, both", errors[1])
+        self.assertFalse(self.conversation.is_complete())
 
 if __name__ == '__main__':
     unittest.main()
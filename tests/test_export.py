@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_loader import ForkliftData
+from src.matcher import ForkliftMatcher
+from src.quote import QuoteGenerator
+from src import export
+
+@unittest.skipIf(export.pa is None, "pyarrow is not installed")
+class TestQuoteExport(unittest.TestCase):
+    """Test cases for the columnar quote exporter"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Quote a few inquiries once"""
+        data = ForkliftData()
+        matcher = ForkliftMatcher(data)
+        quote_generator = QuoteGenerator(data)
+        cls.quotes = [
+            quote_generator.generate_quote(matcher.match_forklift({
+                'load_weight': weight, 'rental_period': days, 'indoor_outdoor': environment,
+                'special_requirements': 'none', 'start_date': '2030-01-07',
+            }))
+            for weight, days, environment in [(1.5, 3, 'indoor'), (2.5, 14, 'outdoor'), (4, 60, 'both')]
+        ]
+
+    def setUp(self):
+        """Set up a temporary export directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        """Clean up the export directory"""
+        self.tmp.cleanup()
+
+    def test_parquet_roundtrip(self):
+        """Test that flattened quotes read back with the expected values"""
+        export.export_quotes(self.quotes * 10, self.directory, batch_size=8)
+        table = export.read_quotes(self.directory)
+        self.assertEqual(table.num_rows, 30)
+
+        first = table.slice(0, 1).to_pylist()[0]
+        quote = self.quotes[0]['quote']
+        self.assertEqual(first['model'], quote['forklift']['model'])
+        self.assertEqual(first['environment'], 'indoor')
+        self.assertEqual(first['start_date'].isoformat(), '2030-01-07')
+        self.assertEqual(first['days'], 3)
+        self.assertAlmostEqual(first['total_rental_cost'], quote['pricing']['total_rental_cost'])
+
+    def test_row_groups_and_dictionary_encoding(self):
+        """Test row-group sizing and dictionary-encoded string columns"""
+        import pyarrow.parquet as pq
+        path = export.export_quotes(self.quotes * 10, self.directory, batch_size=10)
+        metadata = pq.ParquetFile(path).metadata
+        self.assertEqual(metadata.num_row_groups, 3)
+        self.assertTrue(pq.ParquetFile(path).schema_arrow.field('model').type.equals(
+            export.quote_schema().field('model').type))
+
+    def test_append_adds_part_files(self):
+        """Test that a second export appends without rewriting the first file"""
+        first = export.export_quotes(self.quotes, self.directory, fmt='arrow')
+        size = os.path.getsize(first)
+        second = export.export_quotes(self.quotes, self.directory, fmt='arrow')
+        self.assertNotEqual(first, second)
+        self.assertEqual(os.path.getsize(first), size)
+        self.assertEqual(export.read_quotes(self.directory, fmt='arrow').num_rows, 6)
+
+    def test_unsuccessful_quotes_skipped(self):
+        """Test that failed quotes are not exported"""
+        path = export.export_quotes([{'success': False, 'message': 'x'}], self.directory)
+        self.assertIsNone(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_loader import ForkliftData
+from src.features import FEATURE_BITS, covers, feature_names, parse_features
+from src.matcher import ForkliftMatcher
+
+class TestFeatureMatching(unittest.TestCase):
+    """Test cases for feature bitsets in matching and ranking"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared catalog"""
+        cls.data = ForkliftData()
+
+    def setUp(self):
+        """Set up the test environment"""
+        self.matcher = ForkliftMatcher(self.data)
+        self.requirements = {'load_weight': 2, 'rental_period': 5, 'indoor_outdoor': 'outdoor',
+                             'start_date': '2030-01-07'}
+
+    def test_parse_features(self):
+        """Test parsing free text into the vocabulary"""
+        mask = parse_features("Side-shift, non marking tyres and a weighing scale please")
+        self.assertEqual(feature_names(mask), ['side_shift', 'weight_scale', 'non_marking_tyres'])
+        self.assertEqual(parse_features("none"), 0)
+        self.assertEqual(parse_features(None), 0)
+
+    def test_covers(self):
+        """Test the bitwise requirement check over many models and inquiries"""
+        models = np.array([FEATURE_BITS['side_shift'], FEATURE_BITS['side_shift'] | FEATURE_BITS['cab'], 0],
+                          dtype=np.uint64)
+        required = np.array([[FEATURE_BITS['side_shift']], [FEATURE_BITS['cab']]], dtype=np.uint64)
+        np.testing.assert_array_equal(covers(models[None, :], required),
+                                      [[True, True, False], [False, True, False]])
+
+    def test_catalog_features(self):
+        """Test per-model bitsets built from the brochures"""
+        table = self.data.get_candidate_table()
+        self.assertIn('weight_scale', feature_names(table.features[table.index_of('D60s-5')]))
+        self.assertNotIn('weight_scale', feature_names(table.features[table.index_of('D35s-5')]))
+
+    def test_match_prefers_equipped_model(self):
+        """Test that a required feature moves the match to an equipped model"""
+        plain = self.matcher.match_forklift(dict(self.requirements, special_requirements='none'))
+        self.assertEqual(plain['forklift']['model'], 'D35s-5')
+
+        scale = self.matcher.match_forklift(dict(self.requirements, special_requirements='weight scale'))
+        self.assertEqual(scale['forklift']['model'], 'D60s-5')
+        self.assertEqual(scale['features'], {'requested': ['weight_scale'], 'missing': []})
+
+    def test_unavailable_feature_reported(self):
+        """Test falling back to the capacity match when no model has the feature"""
+        match = self.matcher.match_forklift(dict(self.requirements, special_requirements='side shift'))
+        self.assertEqual(match['forklift']['model'], 'D35s-5')
+        self.assertEqual(match['features']['missing'], ['side_shift'])
+        self.assertIn('side shift', match['recommendations'])
+
+    def test_batch_ranking_filters_features(self):
+        """Test that batch ranking applies the feature filter per inquiry"""
+        batch = self.matcher.rank_forklifts_batch([
+            dict(self.requirements, special_requirements='weight scale'),
+            dict(self.requirements, special_requirements='none'),
+        ], k=3)
+        self.assertTrue(all(c['capacity_tons'] >= 6.0 for c in batch[0]))
+        self.assertEqual(batch[1][0]['model'], self.matcher.rank_forklifts(self.requirements, k=1)[0]['model'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import datetime
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.availability import FleetAvailability
+from src.conversation import ConversationManager
+from src.data_loader import ForkliftData
+from src.matcher import ForkliftMatcher
+from src.quote import QuoteGenerator
+
+class TestFleetQuotes(unittest.TestCase):
+    """Test cases for fleet orders with quantities and staggered periods"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared catalog"""
+        cls.data = ForkliftData()
+
+    def setUp(self):
+        """Set up the test environment"""
+        self.start = datetime.date(2030, 1, 7)
+        self.requirements = {
+            'load_weight': 2.0,
+            'indoor_outdoor': 'indoor',
+            'special_requirements': 'none',
+            'location': 'Sydney',
+            'start_date': self.start.isoformat(),
+        }
+
+    def test_parse_unit_periods(self):
+        """Test parsing a fleet order from the rental period answer"""
+        manager = ConversationManager()
+        self.assertEqual(
+            manager._parse_unit_periods("3 for 2 weeks and 3 units for 3 months"),
+            [{'quantity': 3, 'days': 14}, {'quantity': 3, 'days': 90}]
+        )
+        self.assertEqual(manager._parse_unit_periods("2 weeks"), [])
+
+    def test_conversation_records_unit_periods(self):
+        """Test that the conversation stores the groups and the longest period"""
+        manager = ConversationManager()
+        manager.process_answer("2 tons")
+        manager.process_answer("3 for 2 weeks and 3 for 3 months")
+        requirements = manager.get_requirements()
+        self.assertEqual(requirements['rental_period'], 90)
+        self.assertEqual(len(requirements['unit_periods']), 2)
+
+    def test_can_supply(self):
+        """Test the bulk availability check against free runs"""
+        fleet = FleetAvailability.from_counts({'M': 3})
+        fleet.book('M', self.start + datetime.timedelta(days=20), 10, unit_id='M#1')
+        order = [{'quantity': 1, 'days': 14}, {'quantity': 2, 'days': 90}]
+        self.assertTrue(fleet.can_supply('M', self.start, order))
+        fleet.book('M', self.start + datetime.timedelta(days=30), 10, unit_id='M#2')
+        self.assertFalse(fleet.can_supply('M', self.start, order))
+        self.assertFalse(fleet.can_supply('M', self.start, [{'quantity': 4, 'days': 1}]))
+
+    def test_fleet_quote_totals(self):
+        """Test that every group is priced as its own quote line"""
+        unit_periods = [{'quantity': 3, 'days': 14}, {'quantity': 2, 'days': 90}]
+        requirements = dict(self.requirements, rental_period=90, unit_periods=unit_periods)
+        match = ForkliftMatcher(self.data).match_forklift(requirements)
+        self.assertTrue(match['success'])
+
+        model = match['forklift']['model']
+        rates = [self.data.get_rate_for_model(model, p['days'])['total_cost'] * p['quantity']
+                 for p in unit_periods]
+
+        quote = QuoteGenerator(self.data).generate_quote(match)['quote']
+        self.assertEqual(quote['forklift']['quantity'], 5)
+        forklift_lines = [line for line in quote['line_items'] if line['description'].startswith(model)]
+        self.assertEqual([line['quantity'] for line in forklift_lines], [3, 2])
+        self.assertAlmostEqual(quote['pricing']['total_rental_cost'], sum(rates), places=2)
+
+    def test_fleet_requires_enough_units(self):
+        """Test that a fleet order skips models without enough free units"""
+        smallest = ForkliftMatcher(self.data).match_forklift(self.requirements)['forklift']['model']
+        fleet = FleetAvailability.from_counts({smallest: 1})
+        requirements = dict(self.requirements, rental_period=14,
+                            unit_periods=[{'quantity': 2, 'days': 14}])
+        match = ForkliftMatcher(self.data, availability=fleet).match_forklift(requirements)
+        if match['success']:
+            self.assertNotEqual(match['forklift']['model'], smallest)
+
+if __name__ == '__main__':
+    unittest.main()
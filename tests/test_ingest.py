@@ -0,0 +1,135 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+import pandas as pd
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_loader import ForkliftData
+from src.ingest import CatalogIngestor, normalize_rates, normalize_specs, register_reader, READERS
+
+class TestCatalogIngestion(unittest.TestCase):
+    """Test cases for multi-source catalog ingestion"""
+
+    def setUp(self):
+        """Set up a scratch data directory"""
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the scratch data directory"""
+        shutil.rmtree(self.tmp)
+
+    def write(self, name, content):
+        """Write a source file under the data directory"""
+        path = os.path.join(self.tmp, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_normalize_specs(self):
+        """Test mapping spec headers and deriving capacity units"""
+        specs = normalize_specs(pd.DataFrame({
+            'Model Number': ['E20', 'G30'], 'Capacity (kg)': [2000, 3000], 'Fuel': ['battery', 'lpg'],
+        }))
+        self.assertEqual(specs['model'].tolist(), ['E20', 'G30'])
+        self.assertEqual(specs['capacity_tons'].tolist(), [2.0, 3.0])
+        self.assertEqual(specs['fuel_type'].tolist(), ['Electric', 'LPG'])
+        self.assertIsNone(normalize_specs(pd.DataFrame({'name': ['x']})))
+
+    def test_normalize_rates(self):
+        """Test cleaning money columns under alias headers"""
+        rates = normalize_rates(pd.DataFrame({
+            'Description': ['Scissor Lift'], 'Daily': ['$ 1,100.00'], 'Weekly Short': ['300'], 'Weekly Long': [200],
+        }))
+        self.assertEqual(rates.iloc[0, 1:].tolist(), [1100.0, 300.0, 200.0])
+
+    def test_mixed_sources_merge(self):
+        """Test CSV, JSON and text sources merge into one catalog"""
+        self.write('dealers/a.csv', "model,capacity_tons,fuel_type,series\nE20,2.0,Electric,E-Series\n")
+        self.write('dealers/b.json', json.dumps({
+            'specs': [{'model': 'G30', 'capacity_kg': 3000, 'fuel': 'LPG'}],
+            'rates': [{'Equipment Description': 'Diesel 2t Forklift', 'daily': 40, 'weekly_short': 200,
+                       'weekly_long': 150}],
+        }))
+        self.write('brochures/E20.txt', "Electric 2 ton counterbalance")
+
+        data = ForkliftData(self.tmp)
+        self.assertIn('E20', data.specs_df['model'].tolist())
+        self.assertIn('G30', data.specs_df['model'].tolist())
+        self.assertIn('D35s-5', data.specs_df['model'].tolist())
+        self.assertEqual(data.rates_df['Equipment Description'].tolist(), ['Diesel 2t Forklift'])
+        self.assertEqual(data.get_brochure_content('E20'), "Electric 2 ton counterbalance")
+        self.assertEqual(len(data.catalog_report['sources']), 3)
+
+    def test_text_brochures_only_from_brochure_dir(self):
+        """Test that notes outside brochures/ are not ingested as brochures"""
+        self.write('brochures/E20.md', "Electric 2 ton counterbalance")
+        self.write('README.md', "How to update the rate schedule")
+        self.write('dealers/notes.txt', "Call back on Monday")
+
+        catalog = CatalogIngestor(self.tmp).load()
+        self.assertEqual(list(catalog['brochures']), ['E20'])
+        self.assertEqual([s['source'] for s in catalog['report']['sources']], [os.path.join('brochures', 'E20.md')])
+
+    def test_reload_rates_reads_rate_sources(self):
+        """Test that reloading rates parses only the sources that can hold rates"""
+        self.write('specs.csv', "model,capacity_tons\nE20,2.0\n")
+        self.write('rates.csv', "Equipment Description,daily,weekly_short,weekly_long\nDiesel 2t Forklift,40,200,150\n")
+        self.write('brochures/E20.txt', "Electric 2 ton counterbalance")
+        data = ForkliftData(self.tmp)
+
+        parsed = []
+        parse = data._ingestor._parse
+        data._ingestor._parse = lambda path: parsed.append(path.name) or parse(path)
+        self.write('rates.csv', "Equipment Description,daily,weekly_short,weekly_long\nDiesel 2t Forklift,45,200,150\n")
+        diff = data.reload_rates()
+
+        self.assertEqual(parsed, ['rates.csv'])
+        self.assertEqual(diff['changed'][0]['tiers'], ['daily'])
+
+    def test_duplicates(self):
+        """Test duplicate policies across files"""
+        self.write('a.csv', "model,capacity_tons\nX1,1.0\n")
+        self.write('b.csv', "model,capacity_tons\nX1,1.5\n")
+
+        last = CatalogIngestor(self.tmp).load()
+        self.assertEqual(last['specs']['capacity_tons'].tolist(), [1.5])
+        self.assertEqual(last['report']['duplicates']['specs'], [{'key': 'X1', 'sources': ['a.csv', 'b.csv']}])
+        self.assertEqual(CatalogIngestor(self.tmp, on_duplicate='first').load()['specs']['capacity_tons'].tolist(), [1.0])
+        with self.assertRaises(ValueError):
+            CatalogIngestor(self.tmp, on_duplicate='error').load()
+
+    def test_bad_source_reported(self):
+        """Test that an unreadable source is reported and skipped"""
+        self.write('broken.json', "{not json")
+        self.write('ok.csv', "model,capacity_tons\nX1,1.0\n")
+        catalog = CatalogIngestor(self.tmp).load()
+        self.assertEqual(len(catalog['specs']), 1)
+        self.assertEqual(catalog['report']['errors'][0]['source'], 'broken.json')
+
+    def test_register_reader(self):
+        """Test plugging in a reader for a new format"""
+        self.write('extra.tsv', "model\tcapacity_tons\nT1\t2.5\n")
+        register_reader('.tsv', lambda path: {'tables': [pd.read_csv(path, sep='\t')]})
+        try:
+            self.assertEqual(CatalogIngestor(self.tmp).load()['specs']['model'].tolist(), ['T1'])
+        finally:
+            READERS.pop('.tsv')
+
+    def test_many_sources(self):
+        """Test loading thousands of models across dozens of files in parallel"""
+        for f in range(40):
+            rows = '\n'.join(f"M{f}-{i},{1 + i % 9}.0,Diesel" for i in range(100))
+            self.write(f"specs/dealer{f:02d}.csv", "model,capacity_tons,fuel_type\n" + rows + "\n")
+        catalog = CatalogIngestor(self.tmp, workers=4, budget=30.0).load()
+        self.assertEqual(len(catalog['specs']), 4000)
+        self.assertFalse(catalog['report']['over_budget'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_loader import ForkliftData
+from src.inquiries import InquiryBook
+from src.revisions import QuoteReviser
+
+class TestInquiries(unittest.TestCase):
+    """Test cases for the inquiries open in a session"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Share the catalog across tests"""
+        cls.data = ForkliftData()
+
+    def setUp(self):
+        """Open a book over a fresh reviser"""
+        self.reviser = QuoteReviser(self.data)
+        self.book = InquiryBook(self.reviser, max_inquiries=3)
+
+    def answer_all(self, inquiry, weight):
+        """Complete an inquiry's conversation and quote it"""
+        conversation = inquiry['conversation']
+        for answer in (weight, '5', 'indoor', '4 meters', 'none'):
+            conversation.process_answer(answer)
+        revision = self.reviser.open(conversation.get_requirements())
+        self.book.record(inquiry, revision)
+        return revision
+
+    def test_inquiries_keep_separate_state(self):
+        """Test that each inquiry has its own conversation, history and quote"""
+        first = self.book.new()
+        second = self.book.new()
+        first['messages'].append({'role': 'user', 'content': 'hello'})
+        self.answer_all(first, '2 tons')
+
+        self.assertIsNot(first['conversation'], second['conversation'])
+        self.assertEqual(len(second['messages']), 0)
+        self.assertFalse(second['conversation'].is_complete())
+        self.assertIsNone(second['quote_info'])
+        self.assertTrue(first['quote_info']['success'])
+        self.assertIn(':', first['label'])
+
+    def test_switching_does_not_requote(self):
+        """Test that switching back shows the stored quote without a new revision"""
+        first = self.book.new()
+        self.answer_all(first, '2 tons')
+        quote_info = first['quote_info']
+        self.book.new()
+
+        self.assertIs(self.book.switch(first['id']), first)
+        self.assertEqual(self.book.active_id, first['id'])
+        self.assertIs(first['quote_info'], quote_info)
+        self.assertEqual(len(self.reviser.history(first['quote_id'])), 1)
+        self.assertIsNone(self.book.switch(99))
+        self.assertEqual(self.book.active_id, first['id'])
+
+    def test_inquiries_share_the_reviser(self):
+        """Test that quotes of every inquiry go through the same reviser and fragment cache"""
+        first, second = self.book.new(), self.book.new()
+        self.answer_all(first, '2 tons')
+        self.answer_all(second, '5 tons')
+
+        self.assertEqual(len(self.reviser), 2)
+        self.assertNotEqual(first['quote_id'], second['quote_id'])
+        html = self.book.get_html(second)
+        self.assertIn('<html', html)
+        self.assertEqual(html, self.reviser.get_html(second['quote_id']))
+
+    def test_least_recently_viewed_inquiry_is_evicted(self):
+        """Test the bound on open inquiries and that eviction drops the revision chain"""
+        first = self.book.new()
+        self.answer_all(first, '2 tons')
+        second = self.book.new()
+        self.book.new()
+        self.book.switch(first['id'])
+        self.book.new()
+
+        self.assertEqual(len(self.book), 3)
+        self.assertNotIn(second['id'], self.book)
+        self.assertIn(first['id'], self.book)
+        self.assertEqual(self.book.evicted, 1)
+
+        self.book.new()
+        self.book.new()
+        self.assertNotIn(first['id'], self.book)
+        self.assertEqual(len(self.reviser), 0)
+
+    def test_closing_active_inquiry_falls_back(self):
+        """Test that closing the active inquiry activates the last viewed one"""
+        first = self.book.new()
+        second = self.book.new()
+        self.book.switch(first['id'])
+        self.book.close(first['id'])
+
+        self.assertEqual(self.book.active_id, second['id'])
+        self.book.close(second['id'])
+        self.assertIsNone(self.book.active_id)
+        self.assertEqual(self.book.active['id'], 3)
+        self.assertEqual([inquiry['id'] for inquiry in self.book.inquiries()], [3])
+
+if __name__ == '__main__':
+    unittest.main()
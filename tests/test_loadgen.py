@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.conversation import ConversationManager
+from src.loadgen import AnswerStreamGenerator, InProcessTarget, percentile, run_load
+
+class TestLoadGenerator(unittest.TestCase):
+    """Test cases for the synthetic load generator"""
+
+    def test_answer_streams_complete_conversations(self):
+        """Test that every generated stream completes a conversation"""
+        generator = AnswerStreamGenerator(seed=7, invalid_rate=0.5)
+        for _ in range(50):
+            conversation = ConversationManager()
+            for answer in generator.conversation():
+                conversation.process_answer(answer)
+            self.assertTrue(conversation.is_complete(), "Generated answers should complete the conversation")
+
+    def test_answer_streams_include_retries(self):
+        """Test that invalid answers are injected and retried"""
+        generator = AnswerStreamGenerator(seed=1, invalid_rate=1.0)
+        answers = generator.conversation()
+        self.assertEqual(len(answers), 9, "Each of the four validated questions should get one retry")
+
+    def test_answer_streams_reproducible(self):
+        """Test that a seed reproduces the same workload"""
+        first = AnswerStreamGenerator(seed=3).conversation()
+        second = AnswerStreamGenerator(seed=3).conversation()
+        self.assertEqual(first, second, "Same seed should generate the same answers")
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_run_load_inprocess(self):
+        """Test a small in-process load run"""
+        report = run_load(InProcessTarget(), conversations=20, concurrency=4, seed=2)
+
+        self.assertEqual(report['completed'], 20, "All conversations should complete")
+        self.assertEqual(report['errors'], 0, "No conversation should fail")
+        self.assertGreater(report['conversations_per_s'], 0)
+        self.assertGreaterEqual(report['turn_latency']['p99_ms'], report['turn_latency']['p50_ms'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.availability import FleetAvailability
+from src.data_loader import ForkliftData
+from src.match_cache import MatchCache
+from src.matcher import ForkliftMatcher
+
+class TestMatchCache(unittest.TestCase):
+    """Test cases for the match cache and its snapshots"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Share the catalog across tests"""
+        cls.data = ForkliftData()
+
+    def setUp(self):
+        """Create a cached matcher"""
+        self.cache = MatchCache(max_entries=3)
+        self.matcher = ForkliftMatcher(self.data, cache=self.cache)
+        self.requirements = {'load_weight': 2.5, 'rental_period': 5, 'indoor_outdoor': 'indoor'}
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove snapshot files"""
+        shutil.rmtree(self.tmp)
+
+    def test_hit_returns_same_match(self):
+        """Test that a repeated inquiry is served from the cache"""
+        first = self.matcher.match_forklift(self.requirements)
+        second = self.matcher.match_forklift(dict(self.requirements, lift_height=6.0))
+
+        self.assertEqual(first, second, "Fields the matcher ignores should not change the key")
+        self.assertIsNot(first, second, "Callers should get their own copy")
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+        first['forklift']['model'] = 'edited'
+        first['alternatives'].clear()
+        third = self.matcher.match_forklift(self.requirements)
+        self.assertEqual(third, second, "Editing a returned match should not change the cached one")
+
+    def test_key_includes_catalog_version(self):
+        """Test that a new catalog version misses"""
+        self.assertNotEqual(MatchCache.key(self.requirements, 'a'), MatchCache.key(self.requirements, 'b'))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used match is evicted"""
+        for days in (1, 2, 3):
+            self.matcher.match_forklift(dict(self.requirements, rental_period=days))
+        self.matcher.match_forklift(dict(self.requirements, rental_period=1))
+        self.matcher.match_forklift(dict(self.requirements, rental_period=4))
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['entries'], 3)
+        self.assertEqual(stats['fill'], 1.0)
+        kept = [entry['requirements']['rental_period'] for entry in self.cache.snapshot()]
+        self.assertNotIn(2, kept)
+
+    def test_snapshot_prepopulates_new_cache(self):
+        """Test replaying the hottest tuples into a fresh cache"""
+        hot = dict(self.requirements, rental_period=14)
+        for _ in range(3):
+            self.matcher.match_forklift(hot)
+        self.matcher.match_forklift(self.requirements)
+        path = os.path.join(self.tmp, 'snapshot.json')
+        self.cache.save_snapshot(path, top=1)
+
+        cache = MatchCache()
+        matcher = ForkliftMatcher(self.data, cache=cache)
+        self.assertEqual(cache.prepopulate(matcher, path), 1)
+
+        matcher.match_forklift(hot)
+        self.assertEqual(cache.stats()['hits'], 1, "The hot tuple should already be cached")
+        self.assertEqual(cache.stats()['prepopulated'], 1)
+
+    def test_not_used_with_fleet_calendar(self):
+        """Test that availability-dependent matches bypass the cache"""
+        availability = FleetAvailability.from_counts({model: 1 for model in self.data.specs_df['model']})
+        matcher = ForkliftMatcher(self.data, availability, cache=self.cache)
+        matcher.match_forklift(self.requirements)
+        self.assertEqual(len(self.cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -106,6 +106,29 @@ class TestMatcher(unittest.TestCase):
         self.assertIn("Operator Sensing System", safety_info, "Safety info should mention OSS")
         self.assertIn("certified", safety_info, "Safety info should mention certification requirements")
         self.assertIn("safety checks", safety_info, "Safety info should mention safety checks")
+    
+    def test_match_batch_matches_each_inquiry(self):
+        """Test that batch matching gives the same result as matching one by one"""
+        requirements_list = [
+            {'load_weight': '2 tons', 'rental_period': 5, 'indoor_outdoor': 'indoor'},
+            {'load_weight': '3000 kg', 'rental_period': 30, 'indoor_outdoor': 'outdoor',
+             'special_requirements': 'side shift, 2 x auger 300mm'},
+            {'load_weight': 20, 'rental_period': 5, 'indoor_outdoor': 'both'},
+            {'load_weight': 3, 'rental_period': 90, 'indoor_outdoor': 'both',
+             'unit_periods': [{'quantity': 3, 'days': 14}, {'quantity': 2, 'days': 90}]},
+            {'load_weight': '2 tons', 'rental_period': 5, 'indoor_outdoor': 'indoor'},
+        ]
+        
+        batch = self.matcher.match_batch(requirements_list)
+        
+        self.assertEqual(batch, [self.matcher.match_forklift(r) for r in requirements_list])
+        self.assertFalse(batch[2]['success'])
+        # Repeated requirements are matched once but returned as separate dictionaries
+        self.assertIsNot(batch[0], batch[4])
+        batch[0]['forklift']['model'] = 'EDITED'
+        batch[0]['rental_details']['rental_days'] = -1
+        self.assertEqual(batch[4], self.matcher.match_forklift(requirements_list[4]))
+        self.assertEqual(self.matcher.match_batch([]), [])
 
 if __name__ == '__main__':
     unittest.main()
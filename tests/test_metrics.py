@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import json
+import urllib.request
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.metrics import Metrics, metrics, start_metrics_server
+from src.data_loader import ForkliftData
+from src.matcher import ForkliftMatcher
+from src.quote import QuoteGenerator
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the stage latency instrumentation"""
+
+    def setUp(self):
+        """Set up the test environment"""
+        self.metrics = Metrics(enabled=True)
+
+    def tearDown(self):
+        """Restore the process-wide registry"""
+        metrics.disable()
+        metrics.reset()
+
+    def test_disabled_records_nothing(self):
+        """Test that a disabled registry ignores spans and timed calls"""
+        registry = Metrics(enabled=False)
+
+        @registry.timed('stage')
+        def work():
+            return 42
+
+        with registry.span('block'):
+            pass
+
+        self.assertEqual(work(), 42, "Timed function should still return its value")
+        self.assertEqual(registry.snapshot(), {}, "Nothing should be recorded while disabled")
+
+    def test_span_and_timed_record(self):
+        """Test that spans and timed functions record one observation each"""
+        @self.metrics.timed('stage')
+        def work():
+            return 'done'
+
+        work()
+        work()
+        with self.metrics.span('block'):
+            pass
+
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot['stage']['count'], 2, "Should record each call")
+        self.assertEqual(snapshot['block']['count'], 1, "Should record the span")
+
+    def test_timed_records_on_exception(self):
+        """Test that failing calls are still timed"""
+        @self.metrics.timed('failing')
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            fail()
+        self.assertEqual(self.metrics.snapshot()['failing']['count'], 1, "Failed call should be recorded")
+
+    def test_render_prometheus(self):
+        """Test the Prometheus text exposition output"""
+        self.metrics.observe('match', 0.002)
+        self.metrics.observe('match', 10.0)
+        text = self.metrics.render_prometheus()
+
+        self.assertIn('# TYPE forklift_stage_duration_seconds histogram', text)
+        self.assertIn('forklift_stage_duration_seconds_bucket{stage="match",le="0.0025"} 1', text)
+        self.assertIn('forklift_stage_duration_seconds_bucket{stage="match",le="+Inf"} 2', text)
+        self.assertIn('forklift_stage_duration_seconds_count{stage="match"} 2', text)
+
+    def test_json_log(self):
+        """Test that JSON log lines are emitted per observation"""
+        self.metrics.enable(json_log=True)
+        with self.assertLogs('forklift.metrics', level='INFO') as logs:
+            self.metrics.observe('render_html', 0.01)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['stage'], 'render_html')
+        self.assertEqual(record['duration_ms'], 10.0)
+
+    def test_pipeline_stages_instrumented(self):
+        """Test that the quote pipeline reports each stage"""
+        metrics.enable()
+        data = ForkliftData()
+        matcher = ForkliftMatcher(data)
+        quote_generator = QuoteGenerator(data)
+
+        match = matcher.match_forklift({'load_weight': '3 tons', 'rental_period': 7, 'indoor_outdoor': 'outdoor'})
+        quote_generator.format_quote_for_display(quote_generator.generate_quote(match))
+
+        snapshot = metrics.snapshot()
+        for stage in ['catalog_load', 'capacity_lookup', 'rate_lookup', 'match', 'quote_generate', 'quote_format']:
+            self.assertIn(stage, snapshot, f"Stage '{stage}' should be recorded")
+
+    def test_metrics_server(self):
+        """Test that the local endpoint serves the exposition text"""
+        metrics.enable()
+        metrics.observe('match', 0.001)
+        server = start_metrics_server(port=0)
+        port = server.server_address[1]
+
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics') as response:
+            body = response.read().decode('utf-8')
+        self.assertIn('stage="match"', body, "Endpoint should expose recorded stages")
+        self.assertIs(start_metrics_server(port=0), server, "Server should only be started once")
+
+if __name__ == '__main__':
+    unittest.main()
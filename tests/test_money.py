@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_loader import ForkliftData
+from src.money import (daily_rate_cents, deposit_cents, format_money, gst_cents, line_total_cents,
+                       to_cents, to_cents_array)
+
+class TestMoney(unittest.TestCase):
+    """Test cases for the integer-cents money layer"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared catalog"""
+        cls.data = ForkliftData()
+
+    def test_conversions(self):
+        """Test converting and formatting amounts"""
+        self.assertEqual(to_cents("$ 1,234.505"), 123451)
+        self.assertEqual(to_cents(0.1 + 0.2), 30)
+        np.testing.assert_array_equal(to_cents_array([44.0, 0.29, np.nan]), [4400, 29, -1])
+        self.assertEqual(format_money(123405), "$1234.05")
+
+    def test_tier_rounding(self):
+        """Test the rounding rule of each tier"""
+        # Daily tier is exact
+        self.assertEqual(int(line_total_cents(4400, 24500, 14000, 3)), 13200)
+        # Weekly tiers round once per line: 100.00/week for 10 days = 142.857... -> 142.86
+        self.assertEqual(int(line_total_cents(0, 10000, 0, 10)), 14286)
+        self.assertEqual(int(daily_rate_cents(0, 10000, 0, 10)), 1429)
+        # Quantities multiply the rounded line
+        self.assertEqual(int(line_total_cents(0, 10000, 0, 10, 3)), 42858)
+        self.assertEqual(int(deposit_cents(14286)), 2857)
+        self.assertEqual(int(gst_cents(14286)), 1299)
+
+    def test_single_and_batch_paths_identical(self):
+        """Test that scalar lookups and the vectorized table give the same cents"""
+        table = self.data.get_candidate_table()
+        days = np.array([1, 3, 7, 8, 10, 13, 27, 28, 29, 45, 90, 365])
+        batch = table.line_totals_cents(days)
+        for model in table.models:
+            single = [self.data.get_rate_for_model(model, int(d))['total_cost_cents'] for d in days]
+            np.testing.assert_array_equal(batch[:, table.index_of(model)], single)
+
+    def test_quote_totals_exact(self):
+        """Test quote totals and deposits are whole cents"""
+        from src.matcher import ForkliftMatcher
+        from src.quote import QuoteGenerator
+        match = ForkliftMatcher(self.data).match_forklift({
+            'load_weight': 2, 'rental_period': 11, 'special_requirements': 'auger 300mm for 5 days',
+            'start_date': '2030-01-07',
+        })
+        pricing = QuoteGenerator(self.data).generate_quote(match)['quote']['pricing']
+        self.assertEqual(round(pricing['total_rental_cost'] * 100), pricing['total_rental_cost_cents'])
+        self.assertEqual(pricing['deposit_cents'], int(deposit_cents(pricing['total_rental_cost_cents'])))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+import unittest
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_loader import ForkliftData
+from src.html_pdf_generator import PDFGenerator as HTMLGenerator
+from src.matcher import ForkliftMatcher
+from src.money import line_total_cents
+from src.pricing import RateCurve, forklift_rate_key, tokenize
+from src.quote import QuoteGenerator
+
+class TestMultiItemPricing(unittest.TestCase):
+    """Test cases for multi-item quotes priced over the rate index"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared catalog"""
+        cls.data = ForkliftData()
+
+    def setUp(self):
+        """Set up the test environment"""
+        self.rate_index = self.data.get_rate_index()
+        self.matcher = ForkliftMatcher(self.data)
+        self.quote_generator = QuoteGenerator(self.data)
+
+    def test_tokenize(self):
+        """Test tokenizing descriptions and requests"""
+        self.assertEqual(tokenize("2 x Excavators 3.5T"), ['2', 'excavator', '3.5t'])
+
+    def test_search(self):
+        """Test resolving free text to rate rows"""
+        expectations = {
+            'auger 300mm': 'EXCAVATOR - AUGER 300MM',
+            'post hole attachment': 'EXCAVATOR - POST HOLE ATTACHMENT',
+            '3.5t excavator': 'EXCAVATOR - 3.5T',
+            'mini excavator': 'EXCAVATOR MINI - 1.8T WITH TRAILER',
+        }
+        for text, description in expectations.items():
+            self.assertEqual(self.rate_index.descriptions[self.rate_index.search(text)], description)
+
+        for text in ['side shift', 'none', 'weight scale', 'diesel forklift', 'transport']:
+            self.assertIsNone(self.rate_index.search(text), f"'{text}' should not match a rate row")
+
+    def test_search_needs_equipment_noun(self):
+        """Test that adjectives and sizes alone do not match a rate row"""
+        for text in ['heavy duty', 'need a large cab', 'drum handler', 'light', 'small', '3.5t']:
+            self.assertIsNone(self.rate_index.search(text), f"'{text}' should not match a rate row")
+
+        requirements = {'special_requirements': 'heavy duty, need a large cab and drum handler, light'}
+        self.assertEqual(self.matcher.match_equipment(requirements, 5), [])
+
+        # Explicit items may still name a row by any of its words
+        lines = self.matcher.match_equipment({'items': [{'description': 'double drum'}]}, 5)
+        self.assertEqual([line['description'] for line in lines], ['ROLLER SMOOTH - 2.5T DOUBLE DRUM'])
+
+    def test_items_need_positive_quantities(self):
+        """Test that item lines without a positive whole quantity and duration are not priced"""
+        for item in ({'quantity': -2}, {'days': -5}, {'quantity': 0}, {'quantity': 'two'}, {'days': 1.5}):
+            lines = self.matcher.match_equipment({'items': [dict(item, description='EXCAVATOR - 3.5T')]}, 5)
+            self.assertEqual(lines, [], f"{item} should not be priced")
+
+        lines = self.matcher.match_equipment({'items': [{'description': 'EXCAVATOR - 3.5T', 'quantity': '2',
+                                                         'days': 3.0}]}, 5)
+        self.assertEqual((lines[0]['quantity'], lines[0]['days']), (2, 3))
+
+    def test_unpriced_rows_not_quoted(self):
+        """Test that a row without rates is never priced from the missing-rate sentinel"""
+        row = self.rate_index.lookup('LIGHT VEHICLE TRANSPORT')
+        self.assertFalse(self.rate_index.priced[row])
+        self.assertIsNone(self.rate_index.search('LIGHT VEHICLE TRANSPORT'))
+        self.assertEqual(self.matcher.match_equipment({'items': [{'description': 'light vehicle transport'}]}, 5), [])
+        with self.assertRaises(ValueError):
+            self.rate_index.price([row], [5])
+        with self.assertRaises(ValueError):
+            line_total_cents(-1, 100, 100, [3])
+
+    def test_price_matches_scalar_rates(self):
+        """Test that vectorized pricing applies the same tiers as the scalar path"""
+        row = self.rate_index.lookup('EXCAVATOR - 3.5T')
+        priced = self.rate_index.price([row, row, row], [5, 14, 60], [1, 2, 1])
+
+        self.assertEqual(priced['line_totals'][0], 280.0 * 5, "0-7 days uses the daily rate")
+        self.assertAlmostEqual(priced['line_totals'][1], 1610.0 / 7 * 14 * 2, places=6)
+        self.assertAlmostEqual(priced['line_totals'][2], 1260.0 / 7 * 60, places=6)
+        self.assertAlmostEqual(priced['total'], sum(priced['line_totals']), places=6)
+
+    def test_match_equipment_from_text(self):
+        """Test parsing machines and attachments from special requirements"""
+        lines = self.matcher.match_equipment(
+            {'special_requirements': '2 x auger 300mm, post hole attachment for 3 days and side shift'}, 14
+        )
+
+        self.assertEqual([line['description'] for line in lines],
+                         ['EXCAVATOR - AUGER 300MM', 'EXCAVATOR - POST HOLE ATTACHMENT'])
+        self.assertEqual((lines[0]['quantity'], lines[0]['days']), (2, 14))
+        self.assertEqual((lines[1]['quantity'], lines[1]['days']), (1, 3))
+
+    def test_multi_item_quote(self):
+        """Test that quotes carry priced lines and a combined total"""
+        match = self.matcher.match_forklift({
+            'load_weight': 3.0,
+            'rental_period': 7,
+            'special_requirements': '3.5t excavator',
+            'items': [{'description': 'EXCAVATOR - AUGER 300MM', 'quantity': 2}]
+        })
+        quote = self.quote_generator.generate_quote(match)['quote']
+
+        self.assertEqual(len(quote['line_items']), 3, "Forklift plus two extra lines")
+        self.assertEqual(quote['line_items'][0]['line_total'], match['rental_details']['rates']['total_cost'])
+        expected_total = match['rental_details']['rates']['total_cost'] + 280.0 * 7 + 10.0 * 7 * 2
+        self.assertAlmostEqual(quote['pricing']['total_rental_cost'], expected_total, places=6)
+        self.assertAlmostEqual(quote['pricing']['deposit_required'], expected_total * 0.20, places=6)
+
+        formatted = self.quote_generator.format_quote_for_display({'success': True, 'quote': quote, 'brochure_excerpt': ''})
+        items = formatted['formatted_quote']['line_items_info']['items']
+        self.assertEqual(len(items), 3)
+        self.assertIn('2 x EXCAVATOR - AUGER 300MM (7 days)', [item['label'] for item in items])
+
+        html_content = HTMLGenerator(formatted).get_html_string()
+        self.assertIn('Quote Lines', html_content, "HTML should include the line items section")
+
+    def test_single_forklift_has_no_breakdown(self):
+        """Test that single-forklift quotes keep their original layout"""
+        match = self.matcher.match_forklift({'load_weight': 3.0, 'rental_period': 7})
+        formatted = self.quote_generator.format_quote_for_display(self.quote_generator.generate_quote(match))
+        self.assertEqual(formatted['formatted_quote']['line_items_info']['items'], [])
+
+    def test_fifty_line_quote(self):
+        """Test that a 50-line site quote is priced in one pass"""
+        row = self.rate_index.lookup('EXCAVATOR - 3.5T')
+        items = [{'description': self.rate_index.descriptions[row], 'quantity': 1, 'days': d} for d in range(1, 51)]
+        match = self.matcher.match_forklift({'load_weight': 3.0, 'rental_period': 7, 'items': items})
+        quote = self.quote_generator.generate_quote(match)['quote']
+
+        self.assertEqual(len(quote['line_items']), 51)
+        expected = self.rate_index.price([row] * 50, list(range(1, 51)))['total'] + match['rental_details']['rates']['total_cost']
+        self.assertAlmostEqual(quote['pricing']['total_rental_cost'], expected, places=6)
+
+class TestRateCurve(unittest.TestCase):
+    """Test cases for pricing forklift tonnages from the rate curve"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared catalog"""
+        cls.data = ForkliftData()
+
+    def test_forklift_rate_key(self):
+        """Test reading fuel type and tonnage from forklift rows"""
+        self.assertEqual(forklift_rate_key("LPG  2.5t Forklift "), ('LPG', 2.5))
+        self.assertEqual(forklift_rate_key("Diesel 16t Forklift"), ('Diesel', 16.0))
+        self.assertIsNone(forklift_rate_key("EXCAVATOR - 3.5T"))
+
+    def test_round_up(self):
+        """Test that unscheduled tonnages take the next scheduled tonnage up"""
+        rates = self.data.get_model_rates()
+        for model, description in [('D90s-5', 'Diesel 16t Forklift'), ('D60s-5', 'Diesel 7t Forklift'),
+                                   ('D35s-5', 'Diesel 4t Forklift'), ('D40s-5', 'Diesel 4t Forklift')]:
+            self.assertEqual(rates['descriptions'][rates['index'][model]], description)
+        self.assertEqual(self.data.get_rate_for_model('D90s-5', 1)['daily'], 280.0)
+
+    def test_row_order_does_not_matter(self):
+        """Test that a shuffled schedule gives the same rates"""
+        capacities = [0.5, 2.5, 3.5, 6.0, 9.0, 40.0]
+        fuels = ['Diesel', 'LPG', 'Diesel', 'LPG', 'Diesel', 'Electric']
+        expected = RateCurve(self.data.rates_df).evaluate(fuels, capacities)
+        shuffled = RateCurve(self.data.rates_df.sample(frac=1, random_state=7)).evaluate(fuels, capacities)
+        for key in ('daily_cents', 'weekly_short_cents', 'weekly_long_cents', 'descriptions'):
+            self.assertEqual(list(shuffled[key]), list(expected[key]))
+
+        # Below and beyond the schedule the nearest end is used; other fuels use the diesel curve
+        self.assertEqual(list(expected['descriptions'][[0, 5]]), ['Diesel 2.5t Forklift', 'Diesel 32t Forklift'])
+        self.assertEqual(expected['daily_cents'][3], 22000)
+
+    def test_interpolate(self):
+        """Test interpolating each tier between neighbouring tonnages"""
+        rates = RateCurve(self.data.rates_df, 'interpolate').evaluate(['Diesel', 'Diesel'], [9.0, 4.0])
+        # 2/9 of the way from the 7t row to the 16t row, rounded to the cent
+        self.assertEqual(list(rates['daily_cents']), [8944, 3000])
+        self.assertEqual(list(rates['weekly_long_cents']), [37800, 10500])
+
+    def test_overrides(self):
+        """Test pinning a model to a schedule row"""
+        curve = RateCurve(self.data.rates_df, overrides={'D90s-5': 'Diesel 7t Forklift'})
+        rates = curve.evaluate(['Diesel', 'Diesel'], [9.0, 9.0], ['D90s-5', 'D80s-5'])
+        self.assertEqual(list(rates['daily_cents']), [3500, 28000])
+
+        with self.assertRaises(ValueError):
+            RateCurve(self.data.rates_df, overrides={'D90s-5': 'Diesel 9t Forklift'})
+        with self.assertRaises(ValueError):
+            RateCurve(self.data.rates_df, 'closest')
+
+    def test_schedule_without_forklifts(self):
+        """Test that the default rates apply when nothing prices a forklift"""
+        rates_df = pd.DataFrame({
+            'Equipment Description': ['EXCAVATOR - 3.5T'],
+            'Daily Rate (Inc GST) 0-7 Days': [280.0],
+            'Weekly Rate (Inc GST) 8-28 Days': [1610.0],
+            'Weekly Rate (Inc GST) 28+ Days': [1260.0],
+        })
+        rates = RateCurve(rates_df).evaluate(['Diesel'], [3.0])
+        self.assertFalse(rates['priced'][0])
+        self.assertEqual(rates['daily_cents'][0], 5000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import datetime
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.availability import FleetAvailability
+from src.data_loader import ForkliftData
+from src.features import parse_features
+from src.matcher import ForkliftMatcher
+from src.quote import QuoteGenerator
+from src.ranking import ForkliftRanker
+
+class TestRanking(unittest.TestCase):
+    """Test cases for top-K forklift ranking"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared catalog"""
+        cls.data = ForkliftData()
+
+    def setUp(self):
+        """Set up the test environment"""
+        self.matcher = ForkliftMatcher(self.data)
+
+    def test_candidate_table_cached(self):
+        """Test that the candidate table is built once per catalog"""
+        table = self.data.get_candidate_table()
+        self.assertIs(self.data.get_candidate_table(), table, "Table should be cached")
+        self.assertEqual(list(table.capacity), sorted(table.capacity), "Table should be sorted by capacity")
+
+    def test_rank_forklifts(self):
+        """Test that only adequate models are ranked, best first"""
+        ranked = self.matcher.rank_forklifts({'load_weight': 3.0, 'rental_period': 7}, k=3)
+
+        self.assertEqual(len(ranked), 3, "Should return k candidates")
+        self.assertEqual(ranked[0]['model'], 'D40s-5', "Tightest adequate fit should rank first")
+        self.assertTrue(all(c['capacity_tons'] >= 3.6 for c in ranked), "All candidates should be adequate")
+        scores = [c['score'] for c in ranked]
+        self.assertEqual(scores, sorted(scores), "Candidates should be ordered by score")
+
+    def test_rank_fewer_than_k(self):
+        """Test ranking when fewer than k models are adequate"""
+        ranked = self.matcher.rank_forklifts({'load_weight': 7.0, 'rental_period': 7}, k=5)
+        self.assertEqual([c['model'] for c in ranked], ['D90s-5'])
+        self.assertEqual(self.matcher.rank_forklifts({'load_weight': 20.0}, k=3), [])
+
+    def test_batch_matches_single(self):
+        """Test that batch ranking matches ranking one inquiry at a time"""
+        requirements_list = [
+            {'load_weight': 2.0, 'rental_period': 3, 'indoor_outdoor': 'indoor'},
+            {'load_weight': '4500 kg', 'rental_period': 21, 'indoor_outdoor': 'outdoor'},
+            {'load_weight': 6.0, 'rental_period': 60, 'indoor_outdoor': 'both'},
+        ]
+        batch = self.matcher.rank_forklifts_batch(requirements_list, k=3)
+        single = [self.matcher.rank_forklifts(r, k=3) for r in requirements_list]
+        self.assertEqual(batch, single)
+
+    def test_headroom_with_required_features(self):
+        """Test that feature requirements filter models without changing the headroom maths"""
+        ranker = ForkliftRanker(self.data.get_candidate_table())
+        plain = ranker.rank(3.0, 5, 'outdoor', k=1)[0]
+        side_shift = ranker.rank(3.0, 5, 'outdoor', k=1, required_features=parse_features('side shift'))[0]
+
+        self.assertEqual(side_shift['model'], 'D35s-5')
+        self.assertAlmostEqual(side_shift['headroom'], 0.5 / 3.0)
+        self.assertAlmostEqual(side_shift['score'], 0.5 / 3.0, msg="Cheapest diesel outdoors only pays headroom")
+        self.assertEqual(side_shift, plain)
+
+        # Only the 6t and larger models list a weight scale
+        scale = ranker.rank(3.0, 5, 'outdoor', k=1, required_features=parse_features('weight scale'))[0]
+        self.assertEqual(scale['model'], 'D60s-5')
+        self.assertAlmostEqual(scale['headroom'], 1.0)
+        self.assertAlmostEqual(scale['score'], 1.0)
+
+    def test_availability_excludes_booked_models(self):
+        """Test that booked models are not ranked"""
+        start = datetime.date(2030, 1, 1)
+        fleet = FleetAvailability.from_counts({'D40s-5': 1, 'D45s-5': 1})
+        fleet.book('D40s-5', start, 7)
+        matcher = ForkliftMatcher(self.data, availability=fleet)
+
+        ranked = matcher.rank_forklifts({'load_weight': 3.0, 'rental_period': 7, 'start_date': start}, k=3)
+        self.assertEqual([c['model'] for c in ranked], ['D45s-5'])
+
+    def test_match_includes_alternatives(self):
+        """Test that matches and formatted quotes carry the alternatives"""
+        match = self.matcher.match_forklift({'load_weight': 3.0, 'rental_period': 7})
+        self.assertEqual(len(match['alternatives']), ForkliftMatcher.ALTERNATIVES)
+        self.assertNotIn('D40s-5', [c['model'] for c in match['alternatives']], "Match should not repeat itself")
+
+        quote_generator = QuoteGenerator(self.data)
+        formatted = quote_generator.format_quote_for_display(quote_generator.generate_quote(match))
+        self.assertEqual(len(formatted['formatted_quote']['alternatives']['items']), ForkliftMatcher.ALTERNATIVES)
+
+if __name__ == '__main__':
+    unittest.main()
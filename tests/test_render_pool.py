@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import asyncio
+import json
+from concurrent.futures import Future
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_loader import ForkliftData
+from src.matcher import ForkliftMatcher
+from src.quote import QuoteGenerator
+from src.render_pool import RenderPool, encode_quote
+from src.service import QuoteService
+
+class TestRenderPool(unittest.TestCase):
+    """Test cases for the PDF rendering worker pool"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start one warm pool for all tests"""
+        cls.data = ForkliftData()
+        quote_generator = QuoteGenerator(cls.data)
+        match = ForkliftMatcher(cls.data).match_forklift({'load_weight': 3.0, 'rental_period': 14})
+        cls.formatted_quote = quote_generator.format_quote_for_display(quote_generator.generate_quote(match))
+        cls.pool = RenderPool(workers=1, bulk_workers=1)
+        cls.pool.warm_up(timeout=60)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the worker processes"""
+        cls.pool.shutdown()
+
+    def test_encode_quote_is_compact(self):
+        """Test that job payloads are compact JSON"""
+        payload = encode_quote(self.formatted_quote)
+        self.assertNotIn(b', ', payload[:200], "Payload should not contain separator whitespace")
+        self.assertEqual(json.loads(payload), self.formatted_quote, "Payload should round-trip")
+
+    def test_render_pdf(self):
+        """Test rendering a PDF in a worker process"""
+        document = self.pool.render(self.formatted_quote, 'pdf', timeout=30)
+        self.assertTrue(document.startswith(b'%PDF'), "Should return PDF bytes")
+
+    def test_render_html_bulk(self):
+        """Test rendering HTML on the bulk lane"""
+        futures = [self.pool.submit(self.formatted_quote, 'html', bulk=True) for _ in range(3)]
+        documents = [future.result(timeout=30) for future in futures]
+        self.assertTrue(all(b'<html>' in document for document in documents))
+
+    def test_stats(self):
+        """Test queue depth and render time reporting"""
+        self.pool.render(self.formatted_quote, 'pdf', timeout=30)
+        stats = self.pool.stats()
+
+        self.assertTrue(stats['warm'], "Pool should report as warm")
+        self.assertEqual(stats['queue_depth'], {'interactive': 0, 'bulk': 0}, "Queues should be drained")
+        self.assertGreater(stats['render_time']['pdf']['count'], 0, "PDF render times should be recorded")
+
+    def test_failures_and_cancellation(self):
+        """Test that failed and cancelled jobs are counted apart from completed ones"""
+        before = self.pool.stats()
+        with self.assertRaises(KeyError):
+            self.pool.render({'success': True, 'formatted_quote': {}}, 'html', timeout=30)
+
+        # The single worker is busy, so the last job is still queued when cancelled
+        futures = [self.pool.submit(self.formatted_quote, 'pdf') for _ in range(6)]
+        self.assertTrue(futures[-1].cancel())
+        for future in futures[:-1]:
+            self.assertTrue(future.result(timeout=30).startswith(b'%PDF'))
+
+        stats = self.pool.stats()
+        self.assertEqual(stats['failed']['interactive'], before['failed']['interactive'] + 1)
+        self.assertEqual(stats['cancelled']['interactive'], before['cancelled']['interactive'] + 1)
+        self.assertEqual(stats['completed']['interactive'], before['completed']['interactive'] + 5)
+        self.assertEqual(stats['queue_depth'], {'interactive': 0, 'bulk': 0})
+
+    def test_caller_gave_up(self):
+        """Test that a job finishing after its caller cancelled (e.g. a timeout) is still counted"""
+        before = self.pool.stats()['completed']['bulk']
+        job, result = Future(), Future()
+        result.cancel()
+        job.set_result((b'<html></html>', 0.01))
+        with self.pool._lock:
+            self.pool._queued['bulk'] += 1
+
+        self.pool._finish('bulk', 'html', job, result)
+        self.assertTrue(result.cancelled())
+        self.assertEqual(self.pool.stats()['completed']['bulk'], before + 1)
+
+    def test_service_uses_pool(self):
+        """Test that QuoteService can render through the pool"""
+        service = QuoteService(self.data, render_pool=self.pool)
+        try:
+            result = asyncio.run(service.quote({'load_weight': 3.0, 'rental_period': 7}, render='html'))
+        finally:
+            service.close()
+        self.assertIn('<html>', result['document'], "HTML documents should be decoded to text")
+
+if __name__ == '__main__':
+    unittest.main()
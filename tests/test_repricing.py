@@ -0,0 +1,127 @@
+import unittest
+import sys
+import copy
+import os
+import shutil
+import tempfile
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_loader import ForkliftData
+from src.repricing import OpenQuoteBook, changed_model_tiers, rate_key
+
+RATES_FILE = "Schedule of Rates Example - Sheet1.csv"
+
+class TestRepricing(unittest.TestCase):
+    """Test cases for rate schedule diffing and open quote re-pricing"""
+
+    def setUp(self):
+        """Copy the data directory so the rates CSV can be edited"""
+        self.tmp = tempfile.mkdtemp()
+        source = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        shutil.copy(os.path.join(source, RATES_FILE), self.tmp)
+        self.rates_path = os.path.join(self.tmp, RATES_FILE)
+        self.data = ForkliftData(self.tmp)
+
+    def tearDown(self):
+        """Remove the copied data"""
+        shutil.rmtree(self.tmp)
+
+    def edit_rate(self, description, old, new):
+        """Replace a rate on one row of the CSV"""
+        with open(self.rates_path) as f:
+            lines = f.readlines()
+        for i, line in enumerate(lines):
+            if line.startswith(description):
+                lines[i] = line.replace(old, new, 1)
+        with open(self.rates_path, 'w') as f:
+            f.writelines(lines)
+
+    def requirements(self, load_weight, days):
+        """Build a simple inquiry"""
+        return {'load_weight': load_weight, 'rental_period': days, 'indoor_outdoor': 'both',
+                'special_requirements': 'none', 'start_date': '2030-01-07'}
+
+    def test_rate_key(self):
+        """Test normalizing descriptions and tonnage"""
+        self.assertEqual(rate_key("Diesel 2.5t  Forklift "), ('diesel 2.5t forklift', 2.5))
+        self.assertEqual(rate_key("Concrete Mixer"), ('concrete mixer', None))
+
+    def test_unchanged_reload(self):
+        """Test that reloading an unchanged schedule reports nothing"""
+        diff = self.data.reload_rates()
+        self.assertEqual(diff['changed'], [])
+        self.assertEqual(diff['models'], {})
+
+    def test_diff_and_reprice_only_impacted(self):
+        """Test that only quotes on the changed model and tier are re-priced"""
+        book = OpenQuoteBook(self.data)
+        daily = book.open(self.requirements(2.5, 3))
+        weekly = book.open(self.requirements(2.5, 14))
+        other = book.open(self.requirements(6, 3))
+        model = daily['quote']['forklift']['model']
+        self.assertEqual(len(book), 3)
+
+        weekly_before = book.get(weekly['quote_id'])
+
+        # D35s-5 rounds up to the 4t row; change only its daily rate
+        self.edit_rate("Diesel 4t Forklift", "30.00", "40.00")
+        diff = self.data.reload_rates()
+        self.assertEqual([row['key'] for row in diff['changed']], [('diesel 4t forklift', 4.0)])
+        self.assertEqual(diff['changed'][0]['tiers'], ['daily'])
+        self.assertIn('daily', diff['models'][model])
+
+        report = book.reprice(diff)
+        self.assertEqual([d['quote_id'] for d in report['deltas']], [daily['quote_id']])
+        self.assertAlmostEqual(report['deltas'][0]['delta'], 30.0)
+        self.assertAlmostEqual(book.get(daily['quote_id'])['quote']['pricing']['total_rental_cost'],
+                               daily['quote']['pricing']['total_rental_cost'] + 30.0)
+        self.assertIs(book.get(weekly['quote_id']), weekly_before)
+        self.assertIsNotNone(book.get(other['quote_id']))
+
+    def test_reprice_keeps_model_and_dates(self):
+        """Test that re-pricing keeps the quoted model and dates instead of matching again"""
+        book = OpenQuoteBook(self.data)
+        requirements = self.requirements(2.5, 3)
+        del requirements['start_date']
+        quote = book.open(requirements)
+        model = quote['quote']['forklift']['model']
+
+        def no_match(requirements):
+            raise AssertionError("Open quotes should not be matched again")
+
+        book.matcher.match_forklift = no_match
+        self.edit_rate("Diesel 4t Forklift", "30.00", "900.00")
+        diff = self.data.reload_rates()
+
+        report = book.reprice(diff)
+        repriced = book.get(quote['quote_id'])['quote']
+        self.assertEqual(report['deltas'][0]['model'], model)
+        self.assertEqual(repriced['forklift']['model'], model)
+        self.assertEqual(repriced['rental_period'], quote['quote']['rental_period'])
+        self.assertAlmostEqual(report['deltas'][0]['delta'], 3 * 870.0)
+
+    def test_changed_tiers_with_missing_models(self):
+        """Test that models on only one side of a reload count as changed"""
+        old_table = self.data.get_candidate_table()
+        new_table = copy.copy(old_table)
+        keep = [i for i, model in enumerate(old_table.models) if model != 'D35s-5']
+        for column in ('models', 'daily', 'weekly_short', 'weekly_long'):
+            setattr(new_table, column, getattr(old_table, column)[keep])
+        new_table._index = {model: i for i, model in enumerate(new_table.models)}
+
+        self.assertEqual(changed_model_tiers(old_table, new_table), {'D35s-5': ['daily', 'weekly_short', 'weekly_long']})
+        self.assertEqual(changed_model_tiers(new_table, old_table), {'D35s-5': ['daily', 'weekly_short', 'weekly_long']})
+        self.assertEqual(changed_model_tiers(old_table, old_table), {})
+
+    def test_closed_quotes_not_repriced(self):
+        """Test that closed quotes drop out of the index"""
+        book = OpenQuoteBook(self.data)
+        quote = book.open(self.requirements(2.5, 3))
+        self.assertTrue(book.close(quote['quote_id']))
+        self.edit_rate("Diesel 4t Forklift", "30.00", "40.00")
+        self.assertEqual(book.reprice(self.data.reload_rates())['repriced'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
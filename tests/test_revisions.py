@@ -0,0 +1,158 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.availability import FleetAvailability
+from src.data_loader import ForkliftData
+from src.html_pdf_generator import PDFGenerator as HTMLGenerator
+from src.matcher import ForkliftMatcher
+from src.quote import QuoteGenerator
+from src.revisions import QuoteReviser
+
+class TestRevisions(unittest.TestCase):
+    """Test cases for quote revisions"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Share the catalog across tests"""
+        cls.data = ForkliftData()
+
+    def setUp(self):
+        """Open a quote to revise"""
+        self.reviser = QuoteReviser(self.data)
+        self.requirements = {
+            'load_weight': 2.5,
+            'rental_period': 5,
+            'indoor_outdoor': 'indoor',
+            'lift_height': 4.0,
+            'special_requirements': 'none'
+        }
+        self.first = self.reviser.open(self.requirements)
+        self.quote_id = self.first['quote_id']
+
+    def full_quote(self, requirements):
+        """Quote requirements from scratch"""
+        matcher = ForkliftMatcher(self.data)
+        return QuoteGenerator(self.data).generate_quote(matcher.match_forklift(requirements))['quote']
+
+    def test_open_renders_every_section(self):
+        """Test that revision 0 renders the whole document"""
+        self.assertTrue(self.first['success'])
+        self.assertEqual(self.first['revision'], 0)
+        self.assertIsNone(self.first['parent'])
+        self.assertIn('pricing_info', self.first['changed_sections'])
+        self.assertIn('brochure', self.first['changed_sections'])
+
+    def test_rental_period_reprices_without_rematch(self):
+        """Test that a new duration re-prices the same model"""
+        revision = self.reviser.revise(self.quote_id, {'rental_period': 14})
+
+        self.assertEqual(revision['revision'], 1)
+        self.assertEqual(revision['parent'], 0)
+        self.assertNotIn('model', revision['stages'])
+        self.assertIn('pricing', revision['stages'])
+        self.assertIn('pricing_info', revision['changed_sections'])
+        self.assertIn('rental_info', revision['changed_sections'])
+        self.assertNotIn('brochure', revision['changed_sections'])
+        self.assertNotIn('terms', revision['changed_sections'])
+
+        quote = revision['quote_result']['quote']
+        expected = self.full_quote(dict(self.requirements, rental_period=14))
+        self.assertEqual(quote['forklift']['model'], expected['forklift']['model'])
+        self.assertEqual(quote['pricing']['total_rental_cost_cents'], expected['pricing']['total_rental_cost_cents'])
+        self.assertTrue(quote['quote_number'].endswith('-R1'))
+
+    def test_load_weight_rematches(self):
+        """Test that a heavier load selects a new model"""
+        revision = self.reviser.revise(self.quote_id, {'load_weight': 4.0})
+
+        self.assertEqual(revision['stages'], ['model'])
+        expected = self.full_quote(dict(self.requirements, load_weight=4.0))
+        self.assertEqual(revision['quote_result']['quote']['forklift']['model'], expected['forklift']['model'])
+        self.assertIn('model_info', revision['changed_sections'])
+
+    def test_indoor_outdoor_updates_recommendations_only(self):
+        """Test that a new environment re-renders the recommendations"""
+        revision = self.reviser.revise(self.quote_id, {'indoor_outdoor': 'outdoor'})
+
+        self.assertEqual(revision['stages'], ['alternatives', 'recommend'])
+        self.assertIn('recommendations', revision['changed_sections'])
+        self.assertNotIn('pricing_info', revision['changed_sections'])
+
+    def test_unread_field_recomputes_nothing(self):
+        """Test that a field the matcher ignores only updates the header"""
+        revision = self.reviser.revise(self.quote_id, {'lift_height': 6.0})
+
+        self.assertEqual(revision['stages'], [])
+        self.assertEqual(revision['changed_sections'], ['header'])
+        self.assertEqual(revision['requirements']['lift_height'], 6.0)
+
+    def test_revision_chain(self):
+        """Test that revisions chain and keep earlier documents"""
+        self.reviser.revise(self.quote_id, {'rental_period': 14})
+        self.reviser.revise(self.quote_id, {'rental_period': 30})
+
+        history = self.reviser.history(self.quote_id)
+        self.assertEqual([r['revision'] for r in history], [0, 1, 2])
+        self.assertEqual([r['parent'] for r in history], [None, 0, 1])
+        self.assertEqual(history[1]['changes'], {'rental_period': 14})
+        self.assertIs(self.reviser.latest(self.quote_id), history[-1])
+
+        # Earlier revisions still assemble their own document
+        self.assertIn('5 days', self.reviser.get_html(self.quote_id, 0))
+        self.assertIn('30 days', self.reviser.get_html(self.quote_id))
+
+    def test_fragments_match_full_render(self):
+        """Test that a revised document equals a fresh render"""
+        self.reviser.revise(self.quote_id, {'rental_period': 14})
+        latest = self.reviser.latest(self.quote_id)
+
+        fresh = HTMLGenerator({'success': True, 'formatted_quote': latest['formatted_quote']}).get_html_string()
+        self.assertEqual(self.reviser.get_html(self.quote_id), fresh)
+
+    def test_availability_dates_rematch(self):
+        """Test that dates re-run the match when a fleet calendar is used"""
+        matcher = ForkliftMatcher(self.data, FleetAvailability.from_counts({model: 2 for model in self.data.specs_df['model']}))
+        reviser = QuoteReviser(self.data, matcher)
+        revision = reviser.revise(reviser.open(self.requirements)['quote_id'], {'rental_period': 14})
+        self.assertEqual(revision['stages'], ['model'])
+
+    def test_rental_period_replaces_fleet_order(self):
+        """Test that a new single period drops a fleet order's per-unit periods, and back"""
+        fleet = dict(self.requirements, rental_period=90,
+                     unit_periods=[{'quantity': 3, 'days': 14}, {'quantity': 2, 'days': 90}])
+        quote_id = self.reviser.open(fleet)['quote_id']
+
+        revision = self.reviser.revise(quote_id, {'rental_period': 10})
+        self.assertNotIn('unit_periods', revision['requirements'])
+        self.assertEqual(revision['changes'], {'rental_period': 10, 'unit_periods': None})
+        quote = revision['quote_result']['quote']
+        self.assertEqual(quote['forklift']['quantity'], 1)
+        self.assertEqual(quote['pricing'], self.full_quote(dict(self.requirements, rental_period=10))['pricing'])
+
+        revision = self.reviser.revise(quote_id, {'unit_periods': [{'quantity': 2, 'days': 21}]})
+        self.assertEqual(revision['requirements']['rental_period'], 21)
+        self.assertEqual(revision['quote_result']['quote']['forklift']['quantity'], 2)
+
+    def test_update_from_edited_requirements(self):
+        """Test that updating with full requirements revises only what differs"""
+        requirements = dict(self.requirements, lift_height=6.0, indoor_outdoor='outdoor')
+        revision = self.reviser.update(self.quote_id, requirements)
+
+        self.assertEqual(revision['changes'], {'indoor_outdoor': 'outdoor', 'lift_height': 6.0})
+        self.assertEqual(revision['stages'], ['alternatives', 'recommend'])
+        self.assertEqual(revision['requirements'], requirements)
+
+    def test_failed_revision_keeps_chain(self):
+        """Test that an unmatched change is reported and not recorded"""
+        result = self.reviser.revise(self.quote_id, {'load_weight': 500})
+
+        self.assertFalse(result['success'])
+        self.assertEqual(len(self.reviser.history(self.quote_id)), 1)
+        self.assertFalse(self.reviser.revise(999, {'rental_period': 3})['success'])
+
+if __name__ == '__main__':
+    unittest.main()
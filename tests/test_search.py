@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+import time
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api import QuoteAPI
+from src.data_loader import ForkliftData
+from src.matcher import ForkliftMatcher
+from src.search import SearchIndex, analyze
+
+class TestFullTextSearch(unittest.TestCase):
+    """Test cases for BM25 search over the catalog"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared catalog"""
+        cls.data = ForkliftData()
+
+    def test_analyze_units(self):
+        """Test unit-normalized terms"""
+        terms = analyze("Lift height: up to 6,050 mm, 3,500 kg, oil-cooled")
+        self.assertIn('6m', terms)
+        self.assertIn('3500kg', terms)
+        self.assertIn('oil', terms)
+        self.assertIn('cooled', terms)
+
+    def test_brochure_query(self):
+        """Test that brochure features rank the right models"""
+        results = ForkliftMatcher(self.data).search_forklifts("oil-cooled brakes 6m lift weight scale", k=4)
+        self.assertEqual(len(results), 4)
+        # Only the D60-D90 brochure mentions a weight scale
+        self.assertEqual({r['model'] for r in results}, {'D60s-5', 'D70s-5', 'D80s-5', 'D90s-5'})
+        self.assertGreaterEqual(results[0]['score'], results[-1]['score'])
+
+    def test_equipment_query(self):
+        """Test searching rate descriptions"""
+        hits = self.data.search_index.search("excavator 3.5t", k=1, kind='equipment')
+        self.assertEqual(hits[0]['description'], 'EXCAVATOR - 3.5T')
+
+    def test_incremental_updates(self):
+        """Test adding, replacing and removing documents"""
+        index = SearchIndex()
+        index.add('a', "electric pallet jack", {'kind': 'model'})
+        index.add('b', "diesel forklift", {'kind': 'model'})
+        self.assertEqual(index.search("electric")[0]['id'], 'a')
+
+        index.add('a', "lpg forklift", {'kind': 'model'})
+        self.assertEqual(index.search("electric"), [])
+        self.assertEqual({hit['id'] for hit in index.search("forklift")}, {'a', 'b'})
+
+        self.assertTrue(index.remove('b'))
+        self.assertEqual([hit['id'] for hit in index.search("forklift")], ['a'])
+        index.add('c', "electric reach truck", {'kind': 'model'})
+        self.assertEqual(len(index), 2)
+
+    def test_api_route(self):
+        """Test the search endpoint"""
+        api = QuoteAPI(self.data)
+        status, response = api.handle('GET', '/search', {'q': 'weight scale', 'k': '2'})
+        self.assertEqual(status, 200)
+        self.assertEqual(len(response['results']), 2)
+        self.assertEqual(api.handle('GET', '/search', {})[0], 400)
+
+    def test_query_latency(self):
+        """Test sub-millisecond queries over thousands of models"""
+        index = SearchIndex()
+        brochures = [self.data.get_brochure_content('D35s-5'), self.data.get_brochure_content('D60s-5')]
+        for i in range(5000):
+            index.add(f"model:M{i}", f"M{i} {i % 9 + 1}t diesel forklift\n{brochures[i % 2]}", {'kind': 'model'})
+        index.search("warm up")
+
+        query = "oil-cooled brakes 6m lift weight scale"
+        index.search(query, k=5)
+        start = time.perf_counter()
+        for _ in range(50):
+            index.search(query, k=5)
+        self.assertLess((time.perf_counter() - start) / 50, 0.005)
+
+if __name__ == '__main__':
+    unittest.main()
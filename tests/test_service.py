@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_loader import ForkliftData
+from src.service import QuoteService
+
+class TestQuoteService(unittest.TestCase):
+    """Test cases for the asyncio quote service"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared catalog"""
+        cls.data = ForkliftData()
+        cls.requirements = {'load_weight': 3.0, 'rental_period': 7, 'indoor_outdoor': 'outdoor'}
+
+    def setUp(self):
+        """Set up the test environment"""
+        self.service = QuoteService(self.data, render_workers=2)
+
+    def tearDown(self):
+        """Shut down the render executor"""
+        self.service.close()
+
+    def test_quote_with_html(self):
+        """Test quoting and rendering HTML"""
+        result = asyncio.run(self.service.quote(self.requirements, render='html'))
+
+        self.assertTrue(result['success'], "Quote should succeed")
+        self.assertIn('D40s-5', result['formatted_quote']['title'])
+        self.assertIn('<html>', result['document'], "Should include the rendered HTML")
+
+    def test_quote_with_pdf(self):
+        """Test quoting and rendering a PDF in memory"""
+        result = asyncio.run(self.service.quote(self.requirements, render='pdf'))
+
+        self.assertTrue(result['success'], "Quote should succeed")
+        self.assertTrue(result['document'].startswith(b'%PDF'), "Should include PDF bytes")
+
+    def test_failed_match_is_not_rendered(self):
+        """Test that unsuccessful quotes skip rendering"""
+        result = asyncio.run(self.service.quote({'load_weight': 50, 'rental_period': 7}, render='html'))
+
+        self.assertFalse(result['success'])
+        self.assertNotIn('document', result)
+
+    def test_backpressure(self):
+        """Test that requests beyond max_pending are rejected"""
+        service = QuoteService(self.data, max_pending=0)
+        try:
+            result = asyncio.run(service.quote(self.requirements))
+        finally:
+            service.close()
+
+        self.assertFalse(result['success'], "Request should be rejected")
+        self.assertTrue(result['retry'], "Rejection should be retryable")
+
+    def test_timeout_and_no_head_of_line_blocking(self):
+        """Test that a stuck render times out without delaying other inquiries"""
+        release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(release.wait)  # Occupy the only render worker
+        service = QuoteService(self.data, render_executor=executor, timeout=0.2)
+
+        async def scenario():
+            slow = asyncio.ensure_future(service.quote(self.requirements, render='pdf'))
+            start = time.perf_counter()
+            fast = await service.quote(self.requirements)
+            fast_elapsed = time.perf_counter() - start
+            return await slow, fast, fast_elapsed
+
+        try:
+            slow, fast, fast_elapsed = asyncio.run(scenario())
+        finally:
+            release.set()
+            executor.shutdown()
+
+        self.assertFalse(slow['success'], "Stuck render should time out")
+        self.assertIn('timed out', slow['message'])
+        self.assertTrue(fast['success'], "Unrendered quote should still succeed")
+        self.assertLess(fast_elapsed, 0.2, "Inline quote should not wait for the render queue")
+        self.assertEqual(service.pending, 0, "Pending count should be released")
+
+    def test_cancellation(self):
+        """Test that cancelling a request releases its slot"""
+        release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(release.wait)
+        service = QuoteService(self.data, render_executor=executor)
+
+        async def scenario():
+            task = asyncio.ensure_future(service.quote(self.requirements, render='html'))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            release.set()
+            executor.shutdown()
+
+        self.assertEqual(service.pending, 0, "Cancelled request should release its slot")
+
+if __name__ == '__main__':
+    unittest.main()
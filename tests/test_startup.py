@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import socket
+import subprocess
+
+# Add the parent directory to the path to import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import startup
+
+class TestStartup(unittest.TestCase):
+    """Test cases for the startup warm-up and import budget"""
+
+    def test_profile_imports(self):
+        """Test that import times are parsed from a fresh interpreter"""
+        report = startup.profile_imports(['json', 'src.money'])
+
+        self.assertGreater(report['total_ms'], 0)
+        self.assertEqual([e['module'] for e in report['requested']], ['json', 'src.money'])
+        self.assertGreater(report['requested'][1]['cumulative_ms'], 0, "src.money imports numpy")
+        self.assertTrue(report['slowest'])
+
+    def test_import_budget(self):
+        """Test that the application imports within budget (FORKLIFT_IMPORT_BUDGET_MS)"""
+        report = startup.check_import_budget()
+        self.assertTrue(
+            report['ok'],
+            f"Imports took {report['total_ms']:.0f} ms, over the {report['budget_ms']:.0f} ms budget"
+        )
+
+    def test_extraction_dependency_not_imported(self):
+        """Test that app processes do not import the PDF extraction library"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run(
+            [sys.executable, '-c', "import sys, src.data_loader; print('pypdf' in sys.modules)"],
+            capture_output=True, text=True, cwd=root, check=True
+        ).stdout.strip()
+        self.assertEqual(output, 'False')
+
+    def test_warm_up(self):
+        """Test that warm-up builds the tables and quotes a sample inquiry"""
+        state = startup.warm_up()
+
+        self.assertEqual(list(state['timings']), ['catalog', 'rate_index', 'candidate_table', 'sample_quote'])
+        built = state['forklift_data'].indexes_built()
+        self.assertTrue(built['candidate_table'])
+        self.assertTrue(built['rate_index'])
+        self.assertIs(state['matcher'].data, state['forklift_data'])
+
+    def test_readiness_report(self):
+        """Test that readiness reflects warm-up, indexes and cache fill"""
+        self.assertFalse(startup.readiness_report(None)['ready'], "Not ready while warming")
+
+        state = startup.warm_up()
+        report = startup.readiness_report(state)
+
+        self.assertTrue(report['ready'])
+        self.assertEqual(report['catalog_version'], state['forklift_data'].catalog_version)
+        self.assertTrue(all(report['indexes'].values()))
+        self.assertIsNone(report['render_pool'])
+        self.assertEqual(report['cache']['entries'], 1, "The sample quote should be cached")
+
+    def test_ready_waits_for_app_server(self):
+        """Test that readiness waits until the app server accepts connections"""
+        state = startup.warm_up()
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        address = listener.getsockname()
+
+        self.assertFalse(startup.readiness_report(state, address)['ready'], "Not ready before the app listens")
+        listener.listen()
+        try:
+            report = startup.readiness_report(state, address)
+        finally:
+            listener.close()
+        self.assertTrue(report['ready'])
+        self.assertTrue(report['app_listening'])
+
+        self.assertEqual(startup.streamlit_address(['--server.port=8501', '--server.address=0.0.0.0']),
+                         ('127.0.0.1', 8501))
+        self.assertEqual(startup.streamlit_address(['--server.port', '9000']), ('127.0.0.1', 9000))
+
+    def test_shared_state_built_once(self):
+        """Test that sessions share one warmed state"""
+        self.assertIs(startup.shared_state(), startup.shared_state())
+
+if __name__ == '__main__':
+    unittest.main()